@@ -0,0 +1,279 @@
+"""Unix-socket daemon answering cache.sh lookups from a long-lived CacheDB.
+
+Each lookup in ``workers/shared/cache.sh`` otherwise starts a Python
+interpreter and opens the database. The daemon keeps one ``CacheDB`` open,
+so lookups share its connection and its LRU of recent hits and misses, and
+answers a one-line request per connection:
+
+    PASS <cache_key> [<git_sha>|-] [<max_age_hours>]   ->  HIT | MISS
+    LOAD <cache_key>                                   ->  <last_duration_ms>
+    PING                                               ->  PONG
+    STATS                                              ->  <json>
+
+Malformed requests get ``ERR <reason>``. Because every request is a single
+line answered by a single line, ``socat - UNIX-CONNECT:<socket>`` or
+``nc -U <socket>`` is all the shell needs.
+
+Between requests the daemon also applies the cache config's retention
+policy in small slices (see ``CacheDB.evict``).
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from .cache_db import DEFAULT_LOOKUP_CACHE_SIZE, CacheDB, RetentionPolicy
+
+DEFAULT_SOCKET = Path("artifacts/rollflow_cache/cache.sock")
+
+# Default matches cache.sh's MAX_CACHE_AGE_HOURS fallback
+DEFAULT_MAX_AGE_HOURS = 168.0
+
+# A client that stalls is dropped rather than blocking other lookups
+CLIENT_TIMEOUT_S = 1.0
+
+# Retention runs this often once caught up; while behind, it runs a few
+# DELETE batches on every poll (about twice a second) between requests
+EVICT_INTERVAL_S = 60.0
+EVICT_BATCHES_PER_TICK = 4
+
+
+def is_pass_fresh(
+    row: Optional[dict],
+    git_sha: Optional[str] = None,
+    max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+    now: Optional[datetime] = None,
+) -> bool:
+    """Apply cache.sh's hit rules to a pass_cache row.
+
+    A row is a hit when it exists, is no older than ``max_age_hours`` and,
+    if ``git_sha`` is given, was not recorded for a different git SHA.
+
+    Args:
+        row: pass_cache row as returned by ``CacheDB.lookup_pass``
+        git_sha: Current git SHA, or None to skip the staleness check
+        max_age_hours: TTL for cached passes
+        now: Current UTC time (naive), for tests
+
+    Returns:
+        True for a cache hit
+    """
+    if row is None:
+        return False
+    try:
+        cache_time = datetime.fromisoformat(row["last_pass_ts"].replace("Z", "+00:00"))
+        if now is None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+        age_hours = (now - cache_time.replace(tzinfo=None)).total_seconds() / 3600
+        if age_hours > max_age_hours:
+            return False
+        if git_sha:
+            meta = json.loads(row["meta_json"]) if row["meta_json"] else {}
+            cached_sha = meta.get("git_sha", "")
+            if cached_sha and cached_sha != git_sha:
+                return False
+    except (ValueError, TypeError, AttributeError):
+        return False
+    return True
+
+
+class CacheLookup:
+    """Answers protocol requests from a CacheDB."""
+
+    def __init__(self, db: CacheDB):
+        self.db = db
+
+    def handle(self, request: str) -> str:
+        """Answer one protocol line (without the trailing newline)."""
+        parts = request.split()
+        if not parts:
+            return "ERR empty request"
+        command, args = parts[0].upper(), parts[1:]
+
+        if command == "PING":
+            return "PONG"
+        if command == "STATS":
+            return json.dumps(self.db.get_stats())
+        if command == "PASS" and 1 <= len(args) <= 3:
+            git_sha = args[1] if len(args) > 1 and args[1] != "-" else None
+            try:
+                max_age = float(args[2]) if len(args) > 2 else DEFAULT_MAX_AGE_HOURS
+            except ValueError:
+                return "ERR max_age_hours must be a number"
+            hit = is_pass_fresh(self.db.lookup_pass(args[0]), git_sha, max_age)
+            return "HIT" if hit else "MISS"
+        if command == "LOAD" and len(args) == 1:
+            row = self.db.lookup_pass(args[0])
+            return str((row and row["last_duration_ms"]) or 0)
+        return f"ERR bad request: {command}"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = CLIENT_TIMEOUT_S
+
+    def handle(self) -> None:
+        try:
+            line = self.rfile.readline(4096).decode("utf-8", "replace").strip()
+        except OSError:
+            return
+        reply = self.server.lookup.handle(line)
+        self.wfile.write(reply.encode() + b"\n")
+
+
+class CacheDaemonServer(socketserver.UnixStreamServer):
+    """Single-threaded Unix-socket server over a CacheLookup.
+
+    Requests are one indexed SQLite read at most, so they are answered in
+    turn on one thread. With a ``retention`` policy, the same thread trims
+    the database between requests, a few bounded DELETE batches at a time.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        lookup: CacheLookup,
+        retention: Optional[RetentionPolicy] = None,
+    ):
+        self.socket_path = Path(socket_path)
+        self.lookup = lookup
+        self.retention = retention
+        self._next_evict = 0.0
+        _remove_stale_socket(self.socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.socket_path), _Handler)
+
+    def service_actions(self) -> None:
+        """Run a slice of retention work when it is due (called each poll)."""
+        if self.retention is None or time.monotonic() < self._next_evict:
+            return
+        deleted = self.lookup.db.evict(
+            self.retention, max_batches=EVICT_BATCHES_PER_TICK
+        )
+        # Full batches mean there is more to do, so come back next poll
+        caught_up = sum(deleted.values()) < (
+            EVICT_BATCHES_PER_TICK * self.retention.batch_size
+        )
+        self._next_evict = time.monotonic() + (EVICT_INTERVAL_S if caught_up else 0)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Unlink a socket file left by a daemon that died.
+
+    Raises:
+        RuntimeError: If a daemon is still answering on the socket
+    """
+    if not path.exists():
+        return
+    try:
+        query(path, "PING")
+    except OSError:
+        path.unlink()
+        return
+    raise RuntimeError(f"cache daemon already running on {path}")
+
+
+def query(socket_path: Path, request: str, timeout: float = CLIENT_TIMEOUT_S) -> str:
+    """Send one request line to a running daemon and return its reply.
+
+    Raises:
+        OSError: If no daemon is listening on the socket
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(request.encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while chunk := sock.recv(4096):
+            reply += chunk
+    return reply.decode().strip()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the daemon (default) or send it one request."""
+    parser = argparse.ArgumentParser(
+        prog="rollflow_cache_daemon",
+        description="Serve cache.sh pass-cache lookups over a Unix socket.",
+    )
+    parser.add_argument(
+        "--cache-db",
+        type=Path,
+        default=Path(
+            os.environ.get("CACHE_DB", "artifacts/rollflow_cache/cache.sqlite")
+        ),
+        help="Path to SQLite cache database (default: $CACHE_DB or artifacts/rollflow_cache/cache.sqlite)",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=Path(os.environ.get("CACHE_DAEMON_SOCKET", DEFAULT_SOCKET)),
+        help=f"Unix socket path (default: $CACHE_DAEMON_SOCKET or {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--cache-config",
+        type=Path,
+        default=Path(
+            os.environ.get("CACHE_CONFIG", "artifacts/rollflow_cache/config.yml")
+        ),
+        help="Cache config whose 'retention' section is applied in the background",
+    )
+    parser.add_argument(
+        "--lru-size",
+        type=int,
+        default=DEFAULT_LOOKUP_CACHE_SIZE,
+        help=f"Lookups kept in memory (default: {DEFAULT_LOOKUP_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--query",
+        metavar="REQUEST",
+        help="Send one request (e.g. 'PASS <key>') to a running daemon and print the reply",
+    )
+    args = parser.parse_args(argv)
+
+    if args.query:
+        try:
+            print(query(args.socket, args.query))
+        except OSError as e:
+            print(f"Error: no cache daemon on {args.socket}: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    try:
+        server = CacheDaemonServer(
+            args.socket,
+            CacheLookup(CacheDB(args.cache_db, lookup_cache_size=args.lru_size)),
+            retention=RetentionPolicy.from_config(args.cache_config),
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Serving {args.cache_db} on {args.socket}", file=sys.stderr)
+    # Stop on SIGTERM as on Ctrl-C, so the socket file is removed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.lookup.db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,260 @@
 """Cache database interface for RollFlow analysis."""
 
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
-from datetime import datetime
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional
 
+import yaml
+
+from .fingerprint import error_fingerprint
 from .models import ToolCall, ToolStatus
 
+# How long a connection waits on a locked database before raising
+BUSY_TIMEOUT_S = 5.0
+
+# Memory-map up to this much of the database file for reads
+MMAP_SIZE = 256 * 1024 * 1024
+
+# WAL lets readers (cache.sh lookups, other loops) run alongside a writer
+# instead of queueing on the database lock; with WAL, NORMAL sync is still
+# crash-safe and skips an fsync per commit
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+)
+
+# Cache keys whose lookup_pass result (hit or miss) is kept in memory
+DEFAULT_LOOKUP_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+# Per-tool row counts kept by triggers, so stats and size caps never need a
+# full-table COUNT(*). A REPLACE removes the old row without firing DELETE
+# triggers, so BEFORE INSERT takes the old row's count back instead.
+# Other writers (verifier.sh, the shell tests) get the same bookkeeping.
+_ROW_COUNT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS row_counts (
+    table_name TEXT NOT NULL,
+    tool_name TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (table_name, tool_name)
+);
+
+CREATE TRIGGER IF NOT EXISTS pass_cache_count_replace
+BEFORE INSERT ON pass_cache BEGIN
+    UPDATE row_counts SET n = n - 1
+    WHERE table_name = 'pass_cache' AND tool_name =
+        (SELECT tool_name FROM pass_cache WHERE cache_key = NEW.cache_key);
+END;
+
+CREATE TRIGGER IF NOT EXISTS pass_cache_count_insert
+AFTER INSERT ON pass_cache BEGIN
+    INSERT INTO row_counts VALUES ('pass_cache', NEW.tool_name, 1)
+    ON CONFLICT (table_name, tool_name) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS pass_cache_count_delete
+AFTER DELETE ON pass_cache BEGIN
+    UPDATE row_counts SET n = n - 1
+    WHERE table_name = 'pass_cache' AND tool_name = OLD.tool_name;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fail_log_count_insert
+AFTER INSERT ON fail_log BEGIN
+    INSERT INTO row_counts VALUES ('fail_log', NEW.tool_name, 1)
+    ON CONFLICT (table_name, tool_name) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fail_log_count_delete
+AFTER DELETE ON fail_log BEGIN
+    UPDATE row_counts SET n = n - 1
+    WHERE table_name = 'fail_log' AND tool_name = OLD.tool_name;
+END;
+"""
+
+# One row per (tool, error fingerprint) holding the occurrence count and a
+# single excerpt, so fail_log rows don't each repeat the error text. Inserts
+# are folded in by log_fail_many; deleting fail_log rows (retention) takes
+# them back out here.
+_FAIL_SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fail_summary (
+    tool_name TEXT NOT NULL,
+    err_hash TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    first_ts TEXT NOT NULL,
+    last_ts TEXT NOT NULL,
+    last_exit_code INTEGER,
+    last_cache_key TEXT,
+    err_excerpt TEXT,
+    PRIMARY KEY (tool_name, err_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_fail_summary_count ON fail_summary(count);
+CREATE INDEX IF NOT EXISTS idx_fail_log_hash ON fail_log(tool_name, err_hash);
+
+CREATE TRIGGER IF NOT EXISTS fail_log_summary_delete
+AFTER DELETE ON fail_log WHEN OLD.err_hash IS NOT NULL BEGIN
+    UPDATE fail_summary SET count = count - 1
+    WHERE tool_name = OLD.tool_name AND err_hash = OLD.err_hash;
+    DELETE FROM fail_summary
+    WHERE tool_name = OLD.tool_name AND err_hash = OLD.err_hash AND count <= 0;
+END;
+"""
+
+# Adds a batch's per-fingerprint totals; the latest occurrence supplies the
+# exit code, cache key and excerpt
+_FAIL_SUMMARY_UPSERT = """
+INSERT INTO fail_summary
+(tool_name, err_hash, count, first_ts, last_ts, last_exit_code, last_cache_key,
+ err_excerpt)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tool_name, err_hash) DO UPDATE SET
+    count = count + excluded.count,
+    first_ts = min(first_ts, excluded.first_ts),
+    last_exit_code = CASE WHEN excluded.last_ts >= last_ts
+        THEN excluded.last_exit_code ELSE last_exit_code END,
+    last_cache_key = CASE WHEN excluded.last_ts >= last_ts
+        THEN excluded.last_cache_key ELSE last_cache_key END,
+    err_excerpt = CASE WHEN excluded.last_ts >= last_ts
+        THEN excluded.err_excerpt ELSE err_excerpt END,
+    last_ts = max(last_ts, excluded.last_ts)
+"""
+
+
+@dataclass
+class RetentionPolicy:
+    """How much of pass_cache and fail_log to keep; None means no limit.
+
+    Per-tool caps drop the oldest rows first: least recently passed
+    (``last_pass_ts``) for pass_cache, earliest logged for fail_log.
+    """
+
+    max_pass_age_hours: Optional[float] = None
+    max_fail_age_hours: Optional[float] = None
+    max_pass_rows_per_tool: Optional[int] = None
+    max_fail_rows_per_tool: Optional[int] = None
+    # Rows per DELETE; each batch is its own short write transaction
+    batch_size: int = 500
+
+    @classmethod
+    def from_config(cls, config_path: Path) -> "RetentionPolicy":
+        """Read the ``retention`` section of the cache config YAML.
+
+        A missing file or section means no limits.
+
+        Raises:
+            ValueError: If the section is not a mapping or has unknown keys
+        """
+        if not config_path.exists():
+            return cls()
+        try:
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+        except Exception as e:
+            raise ValueError(f"Failed to load config from {config_path}: {e}") from e
+
+        section = config.get("retention") or {}
+        if not isinstance(section, dict):
+            raise ValueError("retention must be a mapping")
+        known = {f.name for f in fields(cls)}
+        unknown = set(section) - known
+        if unknown:
+            raise ValueError(
+                f"Unknown retention setting(s): {', '.join(sorted(unknown))}"
+            )
+        return cls(**section)
+
+
+def _pass_row(tool_call: ToolCall) -> tuple:
+    """pass_cache row for a PASS call."""
+    if tool_call.status != ToolStatus.PASS:
+        raise ValueError("Can only cache PASS results")
+    if not tool_call.cache_key:
+        raise ValueError("Tool call must have cache_key")
+    return (
+        tool_call.cache_key,
+        tool_call.tool_name,
+        (tool_call.end_ts or datetime.now()).isoformat(),
+        tool_call.duration_ms,
+        None,  # TODO: Add metadata support
+    )
+
+
+def _fail_row(tool_call: ToolCall) -> tuple:
+    """fail_log row for a FAIL call."""
+    if tool_call.status != ToolStatus.FAIL:
+        raise ValueError("Can only log FAIL results")
+    return (
+        # Calls without a cache key are still logged (the column is NOT NULL)
+        tool_call.cache_key or "",
+        tool_call.tool_name,
+        (tool_call.end_ts or datetime.now()).isoformat(),
+        tool_call.exit_code,
+        error_fingerprint(tool_call.error_excerpt, tool_call.exit_code),
+        tool_call.error_excerpt,
+    )
+
 
 class CacheDB:
-    """SQLite-based cache for tool call results."""
+    """SQLite-based cache for tool call results.
+
+    Each instance keeps one long-lived connection per process (reopened
+    after a fork) and serializes its use across threads. Call ``close``, or
+    use the instance as a context manager, to release it early.
+
+    ``lookup_pass`` results, misses included, are kept in an LRU. Entries
+    are dropped when this instance upserts their key, and the whole LRU is
+    dropped when another connection commits (SQLite's ``data_version``).
+    """
 
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        busy_timeout: float = BUSY_TIMEOUT_S,
+        lookup_cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE,
+    ):
         """Initialize cache database.
 
         Args:
             db_path: Path to SQLite database file
+            busy_timeout: Seconds to wait for a lock held by another
+                connection before raising
+            lookup_cache_size: Keys whose lookup result is kept in memory
+                (0 disables the LRU)
         """
         self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.lookup_cache_size = lookup_cache_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._lookups: OrderedDict[str, Optional[dict]] = OrderedDict()
+        self._lookups_version: Optional[int] = None
+        self._lookup_hits = 0
+        self._lookup_misses = 0
+        self._lookup_evictions = 0
         self._ensure_schema()
 
+    def __enter__(self) -> "CacheDB":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection; the next query opens a new one."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
     def _ensure_schema(self) -> None:
         """Create tables if they don't exist."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -48,19 +282,75 @@ class CacheDB:
 
                 CREATE INDEX IF NOT EXISTS idx_fail_log_key ON fail_log(cache_key);
                 CREATE INDEX IF NOT EXISTS idx_fail_log_tool ON fail_log(tool_name);
+                CREATE INDEX IF NOT EXISTS idx_fail_log_ts ON fail_log(ts);
+                CREATE INDEX IF NOT EXISTS idx_pass_cache_ts ON pass_cache(last_pass_ts);
+                CREATE INDEX IF NOT EXISTS idx_pass_cache_tool_ts
+                    ON pass_cache(tool_name, last_pass_ts);
                 """
             )
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'row_counts'"
+            ).fetchone():
+                # Databases from before the counters: count once, then
+                # let the triggers keep it up to date
+                conn.executescript(
+                    "BEGIN IMMEDIATE;"
+                    + _ROW_COUNT_SCHEMA
+                    + """
+                    INSERT OR IGNORE INTO row_counts
+                    SELECT 'pass_cache', tool_name, COUNT(*)
+                    FROM pass_cache GROUP BY tool_name;
+                    INSERT OR IGNORE INTO row_counts
+                    SELECT 'fail_log', tool_name, COUNT(*)
+                    FROM fail_log GROUP BY tool_name;
+                    COMMIT;
+                    """
+                )
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'fail_summary'"
+            ).fetchone():
+                # Fingerprint and summarize failures logged before err_hash
+                # was filled in (their excerpts are left in place)
+                conn.create_function("error_fingerprint", 2, error_fingerprint)
+                conn.executescript(
+                    "BEGIN IMMEDIATE;"
+                    + _FAIL_SUMMARY_SCHEMA
+                    + """
+                    UPDATE fail_log
+                    SET err_hash = error_fingerprint(err_excerpt, exit_code)
+                    WHERE err_hash IS NULL;
+                    INSERT OR IGNORE INTO fail_summary
+                    SELECT tool_name, err_hash, COUNT(*), MIN(ts), MAX(ts),
+                           exit_code, cache_key, err_excerpt
+                    FROM fail_log GROUP BY tool_name, err_hash;
+                    COMMIT;
+                    """
+                )
+
+    def _connection(self) -> sqlite3.Connection:
+        """The process's connection, opened and tuned on first use."""
+        # A connection inherited across fork must not be used by the child
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.busy_timeout, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
 
     @contextmanager
     def _connect(self) -> Iterator[sqlite3.Connection]:
-        """Context manager for database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        """Use the shared connection; commit on success, roll back on error."""
+        with self._lock:
+            conn = self._connection()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
 
     def upsert_pass(self, tool_call: ToolCall) -> None:
         """Record a passing tool call in cache.
@@ -68,26 +358,43 @@ class CacheDB:
         Args:
             tool_call: Tool call with PASS status
         """
-        if tool_call.status != ToolStatus.PASS:
-            raise ValueError("Can only cache PASS results")
-        if not tool_call.cache_key:
-            raise ValueError("Tool call must have cache_key")
+        self.upsert_pass_many([tool_call])
+
+    def upsert_pass_many(self, tool_calls: Iterable[ToolCall]) -> int:
+        """Record many passing tool calls in one transaction.
+
+        Uses a single connection and ``executemany``, so the cost is one
+        commit however many calls there are. Later calls for the same cache
+        key win, as with repeated ``upsert_pass``. Nothing is written if any
+        call is invalid.
+
+        Args:
+            tool_calls: Tool calls with PASS status and a cache_key
+
+        Returns:
+            Number of calls recorded
+        """
+        keys: list[str] = []
+
+        def rows() -> Iterator[tuple]:
+            for tool_call in tool_calls:
+                row = _pass_row(tool_call)
+                keys.append(row[0])
+                yield row
 
         with self._connect() as conn:
-            conn.execute(
+            cursor = conn.executemany(
                 """
                 INSERT OR REPLACE INTO pass_cache
                 (cache_key, tool_name, last_pass_ts, last_duration_ms, meta_json)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (
-                    tool_call.cache_key,
-                    tool_call.tool_name,
-                    (tool_call.end_ts or datetime.now()).isoformat(),
-                    tool_call.duration_ms,
-                    None,  # TODO: Add metadata support
-                ),
+                rows(),
             )
+            # Our own writes don't change data_version, so drop these keys
+            for key in keys:
+                self._lookups.pop(key, None)
+            return cursor.rowcount
 
     def log_fail(self, tool_call: ToolCall) -> None:
         """Log a failing tool call (does NOT cache).
@@ -95,29 +402,85 @@ class CacheDB:
         Args:
             tool_call: Tool call with FAIL status
         """
-        if tool_call.status != ToolStatus.FAIL:
-            raise ValueError("Can only log FAIL results")
+        self.log_fail_many([tool_call])
+
+    def log_fail_many(self, tool_calls: Iterable[ToolCall]) -> int:
+        """Log many failing tool calls in one transaction (see upsert_pass_many).
+
+        Each call is fingerprinted (``fingerprint.error_fingerprint``) and
+        logged with its ``err_hash``; the error excerpt goes to
+        ``fail_summary`` once per (tool, fingerprint) along with the count.
+
+        Args:
+            tool_calls: Tool calls with FAIL status
+
+        Returns:
+            Number of calls logged
+        """
+        # (tool, err_hash) -> [count, first_ts, last_ts, exit_code, key, excerpt]
+        summary: dict[tuple[str, str], list] = {}
+
+        def rows() -> Iterator[tuple]:
+            for tool_call in tool_calls:
+                row = _fail_row(tool_call)
+                cache_key, tool_name, ts, exit_code, err_hash, excerpt = row
+                entry = summary.get((tool_name, err_hash))
+                if entry is None:
+                    entry = [1, ts, ts, exit_code, cache_key, excerpt]
+                    summary[tool_name, err_hash] = entry
+                else:
+                    entry[0] += 1
+                    entry[1] = min(entry[1], ts)
+                    if ts >= entry[2]:
+                        entry[2:] = [ts, exit_code, cache_key, excerpt]
+                yield cache_key, tool_name, ts, exit_code, err_hash
 
         with self._connect() as conn:
-            conn.execute(
+            cursor = conn.executemany(
                 """
-                INSERT INTO fail_log
-                (cache_key, tool_name, ts, exit_code, err_hash, err_excerpt)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO fail_log (cache_key, tool_name, ts, exit_code, err_hash)
+                VALUES (?, ?, ?, ?, ?)
                 """,
-                (
-                    tool_call.cache_key,
-                    tool_call.tool_name,
-                    (tool_call.end_ts or datetime.now()).isoformat(),
-                    tool_call.exit_code,
-                    None,  # TODO: Compute error hash
-                    tool_call.error_excerpt,
-                ),
+                rows(),
+            )
+            logged = cursor.rowcount
+            conn.executemany(
+                _FAIL_SUMMARY_UPSERT,
+                ((*key, *entry) for key, entry in summary.items()),
             )
+            return logged
+
+    def top_failures(
+        self, limit: int = 10, tool_name: Optional[str] = None
+    ) -> list[dict]:
+        """Most frequent failures by (tool, error fingerprint).
+
+        Reads ``fail_summary``, so this is an index scan rather than a
+        GROUP BY over fail_log.
+
+        Args:
+            limit: Maximum number of rows
+            tool_name: Only this tool's failures
+
+        Returns:
+            Dicts with tool_name, err_hash, count, first_ts, last_ts,
+            last_exit_code, last_cache_key and err_excerpt, most frequent first
+        """
+        where, params = ("WHERE tool_name = ?", (tool_name,)) if tool_name else ("", ())
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM fail_summary {where} "
+                "ORDER BY count DESC, last_ts DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+            return [dict(row) for row in rows]
 
     def lookup_pass(self, cache_key: str) -> Optional[dict]:
         """Check if a cache key has a passing result.
 
+        Repeated lookups, including misses, are answered from the LRU
+        until the key is upserted or another connection writes.
+
         Args:
             cache_key: The cache key to look up
 
@@ -125,25 +488,135 @@ class CacheDB:
             Dict with cache entry if found, None otherwise
         """
         with self._connect() as conn:
+            if self.lookup_cache_size > 0:
+                version = conn.execute("PRAGMA data_version").fetchone()[0]
+                if version != self._lookups_version:
+                    self._lookups.clear()
+                    self._lookups_version = version
+                entry = self._lookups.get(cache_key, _MISSING)
+                if entry is not _MISSING:
+                    self._lookup_hits += 1
+                    self._lookups.move_to_end(cache_key)
+                    return None if entry is None else dict(entry)
+                self._lookup_misses += 1
+
             row = conn.execute(
                 "SELECT * FROM pass_cache WHERE cache_key = ?", (cache_key,)
             ).fetchone()
+            entry = dict(row) if row else None
+
+            if self.lookup_cache_size > 0:
+                self._lookups[cache_key] = entry
+                if len(self._lookups) > self.lookup_cache_size:
+                    self._lookups.popitem(last=False)
+                    self._lookup_evictions += 1
+            return None if entry is None else dict(entry)
 
-            if row:
-                return dict(row)
-            return None
+    def evict(
+        self,
+        policy: RetentionPolicy,
+        max_batches: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> dict[str, int]:
+        """Delete rows the retention policy no longer keeps.
+
+        Works in DELETEs of at most ``policy.batch_size`` rows, each
+        committed on its own, so writers in this and other processes get
+        the lock between batches. Pass ``max_batches`` to do a bounded slice
+        of the work and call again later.
+
+        Args:
+            policy: Limits to enforce
+            max_batches: Stop after this many DELETEs (None = until done)
+            now: Current UTC time (naive), for tests
+
+        Returns:
+            Rows deleted per table, e.g. ``{"pass_cache": 12, "fail_log": 0}``
+        """
+        if now is None:
+            # Same clock as cache.sh's TTL check
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+        deleted = {"pass_cache": 0, "fail_log": 0}
+        batches = 0
+
+        for table, select, params, limit in self._eviction_steps(policy, now):
+            while max_batches is None or batches < max_batches:
+                size = (
+                    policy.batch_size
+                    if limit is None
+                    else min(limit, policy.batch_size)
+                )
+                if size <= 0:
+                    break
+                with self._connect() as conn:
+                    n = conn.execute(
+                        f"DELETE FROM {table} WHERE rowid IN ({select} LIMIT ?)",
+                        (*params, size),
+                    ).rowcount
+                    if table == "pass_cache" and n:
+                        # Our own deletes don't change data_version
+                        self._lookups.clear()
+                batches += 1
+                deleted[table] += n
+                if limit is not None:
+                    limit -= n
+                if n < size:
+                    break
+        return deleted
+
+    def _eviction_steps(
+        self, policy: RetentionPolicy, now: datetime
+    ) -> Iterator[tuple[str, str, tuple, Optional[int]]]:
+        """(table, rowid SELECT, params, row limit) for each rule to apply."""
+        for table, ts_column, max_age in (
+            ("pass_cache", "last_pass_ts", policy.max_pass_age_hours),
+            ("fail_log", "ts", policy.max_fail_age_hours),
+        ):
+            if max_age is not None:
+                cutoff = (now - timedelta(hours=max_age)).isoformat()
+                select = f"SELECT rowid FROM {table} WHERE {ts_column} < ?"
+                yield table, select, (cutoff,), None
+
+        for table, order, cap in (
+            ("pass_cache", "last_pass_ts", policy.max_pass_rows_per_tool),
+            ("fail_log", "id", policy.max_fail_rows_per_tool),
+        ):
+            if cap is None:
+                continue
+            # Counts are read after the age rules ran, so they're current
+            with self._connect() as conn:
+                over = conn.execute(
+                    "SELECT tool_name, n FROM row_counts "
+                    "WHERE table_name = ? AND n > ?",
+                    (table, cap),
+                ).fetchall()
+            for tool_name, n in over:
+                select = (
+                    f"SELECT rowid FROM {table} WHERE tool_name = ? ORDER BY {order}"
+                )
+                yield table, select, (tool_name,), n - cap
 
     def get_stats(self) -> dict:
         """Get cache statistics.
 
+        Row counts come from the trigger-maintained ``row_counts`` table
+        rather than COUNT(*) over the tables.
+
         Returns:
             Dict with cache stats (pass_count, fail_count, etc.)
         """
         with self._connect() as conn:
-            pass_count = conn.execute("SELECT COUNT(*) FROM pass_cache").fetchone()[0]
-            fail_count = conn.execute("SELECT COUNT(*) FROM fail_log").fetchone()[0]
+            counts = dict(
+                conn.execute(
+                    "SELECT table_name, SUM(n) FROM row_counts GROUP BY table_name"
+                ).fetchall()
+            )
 
             return {
-                "pass_cache_entries": pass_count,
-                "fail_log_entries": fail_count,
+                "pass_cache_entries": counts.get("pass_cache", 0),
+                "fail_log_entries": counts.get("fail_log", 0),
+                "lookup_cache_entries": len(self._lookups),
+                "lookup_cache_hits": self._lookup_hits,
+                "lookup_cache_misses": self._lookup_misses,
+                "lookup_cache_evictions": self._lookup_evictions,
             }
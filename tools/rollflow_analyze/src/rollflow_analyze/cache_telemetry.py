@@ -0,0 +1,71 @@
+"""Measured cache hit rates from CACHE_* markers.
+
+``CacheAdvice`` estimates what a cache could save from repeated PASS calls.
+This module reports what the cache actually did, from the events
+``MarkerParser`` collects:
+
+* each :::CACHE_HIT::: / :::CACHE_MISS::: is one lookup, credited to its
+  tool and to the CACHE_SCOPE of the latest :::CACHE_CONFIG::: before it
+  (stamped on the event by ``MarkerParser``, else taken from the config
+  events in ``events``)
+* a hit saved the duration of the cached PASS (``saved_ms`` on the marker)
+* a :::CACHE_GUARD::: with ``allowed=0`` is a lookup that was never made
+"""
+
+from typing import Iterable, Optional
+
+from .models import CacheEvent, CacheHitRate, CacheTelemetry
+
+
+def build_cache_telemetry(events: Iterable[CacheEvent]) -> Optional[CacheTelemetry]:
+    """Aggregate cache events, in log order, into measured hit rates.
+
+    Returns:
+        CacheTelemetry, or None if there were no lookup or guard events
+    """
+    telemetry = CacheTelemetry()
+    rows: dict[tuple[str, Optional[str]], CacheHitRate] = {}
+    scope: Optional[str] = None
+    seen = False
+    for event in events:
+        if event.kind == "config":
+            scope = event.scope
+            continue
+        seen = True
+        if event.kind == "guard":
+            telemetry.guard_checks += 1
+            if not event.allowed:
+                telemetry.guard_blocked += 1
+                key = f"{event.phase or '?'}/{event.reason or '?'}"
+                blocked = telemetry.guard_blocked_by_reason
+                blocked[key] = blocked.get(key, 0) + 1
+            continue
+
+        tool = event.tool_name or "unknown"
+        event_scope = event.scope if event.scope is not None else scope
+        row = rows.get((tool, event_scope))
+        if row is None:
+            row = rows[(tool, event_scope)] = CacheHitRate(
+                tool_name=tool, scope=event_scope
+            )
+        row.lookups += 1
+        if event.kind == "hit":
+            row.hits += 1
+            row.time_saved_ms += event.saved_ms or 0
+        else:
+            row.misses += 1
+
+    if not seen:
+        return None
+    for row in rows.values():
+        row.hit_rate = row.hits / row.lookups
+        telemetry.lookups += row.lookups
+        telemetry.hits += row.hits
+        telemetry.misses += row.misses
+        telemetry.time_saved_ms += row.time_saved_ms
+    if telemetry.lookups:
+        telemetry.hit_rate = telemetry.hits / telemetry.lookups
+    telemetry.by_tool_scope = sorted(
+        rows.values(), key=lambda r: (r.lookups, r.hits), reverse=True
+    )
+    return telemetry
@@ -0,0 +1,561 @@
+"""Per-file ingestion checkpoints for incremental RollFlow analysis."""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from .models import CacheEvent, Iteration, Phase, ToolCall, ToolSource, ToolStatus
+
+# ToolCall fields stored as plain columns (line_range is split in two)
+_CALL_COLUMNS = (
+    "id",
+    "tool_name",
+    "status",
+    "source",
+    "exit_code",
+    "start_ts",
+    "end_ts",
+    "duration_ms",
+    "cache_key",
+    "args_excerpt",
+    "args_raw",
+    "error_excerpt",
+    "log_file",
+    "line_start",
+    "line_end",
+    "run_id",
+    "iter_id",
+)
+
+
+def tool_call_to_row(tc: ToolCall) -> dict[str, Any]:
+    """Flatten a ToolCall into SQLite/JSON-friendly values.
+
+    Lazily kept RovoDev args stay undecoded in ``args_raw``, so storing a
+    call never pays for the args JSON decode.
+    """
+    return {
+        "id": tc.id,
+        "tool_name": tc.tool_name,
+        "status": tc.status.value,
+        "source": tc.source.value,
+        "exit_code": tc.exit_code,
+        "start_ts": tc.start_ts.isoformat() if tc.start_ts else None,
+        "end_ts": tc.end_ts.isoformat() if tc.end_ts else None,
+        "duration_ms": tc.duration_ms,
+        "cache_key": tc.cache_key,
+        "args_excerpt": tc.args_excerpt,
+        "args_raw": tc.args_raw,
+        "error_excerpt": tc.error_excerpt,
+        "log_file": tc.log_file,
+        "line_start": tc.line_range[0] if tc.line_range else None,
+        "line_end": tc.line_range[1] if tc.line_range else None,
+        "run_id": tc.run_id,
+        "iter_id": tc.iter_id,
+    }
+
+
+def _epoch_ms(ts: Optional[datetime]) -> Optional[int]:
+    """UTC milliseconds since the epoch (naive datetimes are local time).
+
+    Marker timestamps are aware and RovoDev ones naive local, so their ISO
+    strings don't sort together; ``--since`` filters on this instead.
+    """
+    return round(ts.timestamp() * 1000) if ts else None
+
+
+def tool_call_from_row(row: Any) -> ToolCall:
+    """Rebuild a ToolCall from ``tool_call_to_row`` output or a sqlite3.Row."""
+    line_start, line_end = row["line_start"], row["line_end"]
+    return ToolCall(
+        id=row["id"],
+        tool_name=row["tool_name"],
+        status=ToolStatus(row["status"]),
+        source=ToolSource(row["source"]),
+        exit_code=row["exit_code"],
+        start_ts=datetime.fromisoformat(row["start_ts"]) if row["start_ts"] else None,
+        end_ts=datetime.fromisoformat(row["end_ts"]) if row["end_ts"] else None,
+        duration_ms=row["duration_ms"],
+        cache_key=row["cache_key"],
+        args_excerpt=row["args_excerpt"],
+        # Absent from rows written before args_raw was stored
+        args_raw=row["args_raw"] if "args_raw" in row.keys() else None,
+        error_excerpt=row["error_excerpt"],
+        log_file=row["log_file"],
+        line_range=(line_start, line_end) if line_start is not None else None,
+        run_id=row["run_id"],
+        iter_id=row["iter_id"],
+    )
+
+
+def _iso(ts: Optional[datetime]) -> Optional[str]:
+    return ts.isoformat() if ts else None
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def iteration_mark_to_json(mark: Iteration) -> str:
+    """Serialize an ITER/PHASE mark (boundaries and phases, no calls)."""
+    phases = []
+    for phase in mark.phases:
+        row = asdict(phase)
+        row["start_ts"], row["end_ts"] = _iso(phase.start_ts), _iso(phase.end_ts)
+        phases.append(row)
+    return json.dumps(
+        {
+            "iter_num": mark.iter_num,
+            "run_id": mark.run_id,
+            "iter_id": mark.iter_id,
+            "phase": mark.phase,
+            "start_ts": _iso(mark.start_ts),
+            "end_ts": _iso(mark.end_ts),
+            "duration_ms": mark.duration_ms,
+            "task_id": mark.task_id,
+            "commit_sha": mark.commit_sha,
+            "phases": phases,
+        }
+    )
+
+
+def iteration_mark_from_json(text: str) -> Iteration:
+    """Rebuild a mark from ``iteration_mark_to_json`` output."""
+    row = json.loads(text)
+    phases = []
+    for p in row.pop("phases"):
+        p["start_ts"], p["end_ts"] = _from_iso(p["start_ts"]), _from_iso(p["end_ts"])
+        phases.append(Phase(**p))
+    row["start_ts"], row["end_ts"] = (
+        _from_iso(row["start_ts"]),
+        _from_iso(row["end_ts"]),
+    )
+    return Iteration(**row, phases=phases)
+
+
+# CacheEvent fields, all stored as plain columns
+_EVENT_COLUMNS = tuple(f.name for f in fields(CacheEvent))
+
+
+def cache_event_to_row(event: CacheEvent) -> tuple:
+    """Flatten a CacheEvent into values for ``_EVENT_COLUMNS``."""
+    row = asdict(event)
+    row["ts"] = _iso(event.ts)
+    return tuple(row[c] for c in _EVENT_COLUMNS)
+
+
+def cache_event_from_row(row: Any) -> CacheEvent:
+    """Rebuild a CacheEvent from a sqlite3.Row."""
+    values = {c: row[c] for c in _EVENT_COLUMNS}
+    values["ts"] = _from_iso(values["ts"])
+    if values["allowed"] is not None:
+        values["allowed"] = bool(values["allowed"])
+    return CacheEvent(**values)
+
+
+@dataclass
+class Checkpoint:
+    """How far a log file has been parsed.
+
+    The (inode, size, mtime) triple identifies the file version the offset
+    belongs to. ``state`` holds whatever the parser needs to resume (open
+    START markers, run/iter context, rolling error tail).
+    """
+
+    path: str
+    parser: str
+    inode: int
+    size: int
+    mtime: float
+    offset: int = 0
+    line_no: int = 0
+    state: dict = field(default_factory=dict)
+
+
+class CheckpointStore:
+    """SQLite store of per-file offsets and the ToolCalls already parsed."""
+
+    def __init__(self, db_path: Path):
+        """Initialize checkpoint store.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create tables if they don't exist and migrate older stores."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS file_checkpoint (
+                    path TEXT PRIMARY KEY,
+                    parser TEXT NOT NULL,
+                    inode INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    byte_offset INTEGER NOT NULL,
+                    line_no INTEGER NOT NULL,
+                    state_json TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS tool_calls (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    tool_name TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    exit_code INTEGER,
+                    start_ts TEXT,
+                    end_ts TEXT,
+                    duration_ms INTEGER,
+                    cache_key TEXT,
+                    args_excerpt TEXT,
+                    args_raw TEXT,
+                    error_excerpt TEXT,
+                    log_file TEXT NOT NULL,
+                    line_start INTEGER,
+                    line_end INTEGER,
+                    run_id TEXT,
+                    iter_id TEXT,
+                    start_ms INTEGER
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_tool_calls_file ON tool_calls(log_file);
+                CREATE INDEX IF NOT EXISTS idx_tool_calls_tool ON tool_calls(tool_name);
+                CREATE INDEX IF NOT EXISTS idx_tool_calls_run ON tool_calls(run_id);
+                CREATE INDEX IF NOT EXISTS idx_tool_calls_iter ON tool_calls(iter_id);
+
+                -- ITER/PHASE marks, one row per iteration part seen in a chunk
+                CREATE TABLE IF NOT EXISTS iteration_marks (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    log_file TEXT NOT NULL,
+                    mark_json TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_iteration_marks_file
+                    ON iteration_marks(log_file);
+
+                CREATE TABLE IF NOT EXISTS cache_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    ts TEXT,
+                    cache_key TEXT,
+                    tool_name TEXT,
+                    mode TEXT,
+                    scope TEXT,
+                    saved_ms INTEGER,
+                    allowed INTEGER,
+                    reason TEXT,
+                    phase TEXT,
+                    run_id TEXT,
+                    iter_id TEXT,
+                    log_file TEXT
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_cache_events_file
+                    ON cache_events(log_file);
+                """
+            )
+            self._migrate_tool_calls(conn)
+            conn.executescript(
+                """
+                DROP INDEX IF EXISTS idx_tool_calls_start;
+                CREATE INDEX IF NOT EXISTS idx_tool_calls_start_ms
+                    ON tool_calls(start_ms);
+                """
+            )
+
+    @staticmethod
+    def _migrate_tool_calls(conn: sqlite3.Connection) -> None:
+        """Add columns missing from stores written by older versions."""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(tool_calls)")}
+        if "args_raw" not in columns:
+            conn.execute("ALTER TABLE tool_calls ADD COLUMN args_raw TEXT")
+        if "start_ms" in columns:
+            return
+        # start_ms is derived from start_ts, so backfill it
+        conn.execute("ALTER TABLE tool_calls ADD COLUMN start_ms INTEGER")
+        rows = conn.execute(
+            "SELECT seq, start_ts FROM tool_calls WHERE start_ts IS NOT NULL"
+        ).fetchall()
+        conn.executemany(
+            "UPDATE tool_calls SET start_ms = ? WHERE seq = ?",
+            (
+                (_epoch_ms(datetime.fromisoformat(row["start_ts"])), row["seq"])
+                for row in rows
+            ),
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Context manager for database connection."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, path: str) -> Optional[Checkpoint]:
+        """Look up the checkpoint for a log file.
+
+        Args:
+            path: Log file path as recorded on its ToolCalls
+
+        Returns:
+            Checkpoint if the file was parsed before, None otherwise
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM file_checkpoint WHERE path = ?", (path,)
+            ).fetchone()
+
+        if not row:
+            return None
+        return Checkpoint(
+            path=row["path"],
+            parser=row["parser"],
+            inode=row["inode"],
+            size=row["size"],
+            mtime=row["mtime"],
+            offset=row["byte_offset"],
+            line_no=row["line_no"],
+            state=json.loads(row["state_json"]) if row["state_json"] else {},
+        )
+
+    def load_calls(self, path: str) -> list[ToolCall]:
+        """Load finished ToolCalls stored for a log file, in parse order."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM tool_calls WHERE log_file = ? ORDER BY seq", (path,)
+            ).fetchall()
+        return [tool_call_from_row(row) for row in rows]
+
+    def load_marks(self, path: str) -> list[Iteration]:
+        """Load ITER/PHASE marks stored for a log file, in parse order.
+
+        An iteration that spans checkpoints has one part per chunk;
+        ``timeline.build_iterations`` joins them.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT mark_json FROM iteration_marks WHERE log_file = ? ORDER BY seq",
+                (path,),
+            ).fetchall()
+        return [iteration_mark_from_json(row["mark_json"]) for row in rows]
+
+    def load_cache_events(self, path: str) -> list[CacheEvent]:
+        """Load CACHE_* marker events stored for a log file, in log order."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM cache_events WHERE log_file = ? ORDER BY seq", (path,)
+            ).fetchall()
+        return [cache_event_from_row(row) for row in rows]
+
+    def save(
+        self,
+        checkpoint: Checkpoint,
+        new_calls: Iterable[ToolCall],
+        reset: bool,
+        new_marks: Iterable[Iteration] = (),
+        new_events: Iterable[CacheEvent] = (),
+    ) -> None:
+        """Append newly parsed calls and advance a file's checkpoint atomically.
+
+        Args:
+            checkpoint: New checkpoint for the file
+            new_calls: Finished calls parsed since the previous checkpoint
+            reset: Drop previously stored calls, marks and cache events first
+                (file was replaced, truncated or rewritten)
+            new_marks: ITER/PHASE marks parsed since the previous checkpoint
+            new_events: CACHE_* events parsed since the previous checkpoint
+        """
+        columns = _CALL_COLUMNS + ("start_ms",)
+        with self._connect() as conn:
+            if reset:
+                for table in ("tool_calls", "iteration_marks", "cache_events"):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE log_file = ?", (checkpoint.path,)
+                    )
+            conn.executemany(
+                "INSERT INTO iteration_marks (log_file, mark_json) VALUES (?, ?)",
+                ((checkpoint.path, iteration_mark_to_json(m)) for m in new_marks),
+            )
+            conn.executemany(
+                f"INSERT INTO cache_events ({', '.join(_EVENT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _EVENT_COLUMNS)})",
+                (cache_event_to_row(e) for e in new_events),
+            )
+            conn.executemany(
+                f"INSERT INTO tool_calls ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                (
+                    tuple(tool_call_to_row(tc)[c] for c in _CALL_COLUMNS)
+                    + (_epoch_ms(tc.start_ts),)
+                    for tc in new_calls
+                ),
+            )
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO file_checkpoint
+                (path, parser, inode, size, mtime, byte_offset, line_no, state_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    checkpoint.path,
+                    checkpoint.parser,
+                    checkpoint.inode,
+                    checkpoint.size,
+                    checkpoint.mtime,
+                    checkpoint.offset,
+                    checkpoint.line_no,
+                    json.dumps(checkpoint.state),
+                ),
+            )
+
+    def summarize(self, since: Optional[datetime] = None) -> dict[str, list[dict]]:
+        """Aggregate stored ToolCalls with SQL instead of loading them.
+
+        Rows come back in the order ``report.build_report`` would produce
+        them for the same calls listed in store order (ties broken by first
+        appearance).
+
+        Args:
+            since: Only include calls that started at or after this time
+                (calls without a start timestamp are excluded)
+
+        Returns:
+            Dict with "status" (status/source counts), "tools" (per-tool
+            stats), "slowest" (top 10 durations) and "cache_keys" (PASS
+            calls grouped by cache_key)
+        """
+        where, params = "", ()
+        if since is not None:
+            where, params = "WHERE start_ms >= ?", (_epoch_ms(since),)
+        and_since = where.replace("WHERE", "AND")
+
+        queries = {
+            "status": f"""
+                SELECT status, source, COUNT(*) AS n
+                FROM tool_calls {where}
+                GROUP BY status, source
+            """,
+            "tools": f"""
+                SELECT tool_name,
+                       COUNT(*) AS total_calls,
+                       COALESCE(SUM(duration_ms), 0) AS total_duration_ms,
+                       COALESCE(AVG(duration_ms), 0.0) AS avg_duration_ms,
+                       MIN(duration_ms) AS min_duration_ms,
+                       MAX(duration_ms) AS max_duration_ms,
+                       SUM(status = 'PASS') AS pass_count,
+                       SUM(status = 'FAIL') AS fail_count,
+                       MIN(seq) AS first_seq,
+                       MIN(CASE WHEN status = 'FAIL' THEN seq END) AS first_fail_seq
+                FROM tool_calls {where}
+                GROUP BY tool_name
+                ORDER BY total_calls DESC, first_seq
+            """,
+            "slowest": f"""
+                SELECT tool_name, duration_ms
+                FROM tool_calls
+                WHERE duration_ms IS NOT NULL {and_since}
+                ORDER BY duration_ms DESC, seq
+                LIMIT 10
+            """,
+            # Every PASS after the first for a key could have been skipped
+            "cache_keys": f"""
+                SELECT cache_key,
+                       COUNT(*) AS n,
+                       COALESCE(SUM(CASE WHEN rn > 1 THEN duration_ms END), 0)
+                           AS skippable_ms
+                FROM (
+                    SELECT cache_key, duration_ms, seq,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY cache_key ORDER BY seq
+                           ) AS rn
+                    FROM tool_calls
+                    WHERE status = 'PASS' AND cache_key != '' {and_since}
+                )
+                GROUP BY cache_key
+                ORDER BY MIN(seq)
+            """,
+        }
+
+        with self._connect() as conn:
+            return {
+                name: [dict(row) for row in conn.execute(sql, params)]
+                for name, sql in queries.items()
+            }
+
+    def iter_calls(self, since: Optional[datetime] = None) -> Iterator[ToolCall]:
+        """Stream every stored ToolCall in store order.
+
+        Args:
+            since: Only include calls that started at or after this time
+        """
+        sql = "SELECT * FROM tool_calls"
+        params: tuple = ()
+        if since is not None:
+            sql += " WHERE start_ms >= ?"
+            params = (_epoch_ms(since),)
+        with self._connect() as conn:
+            for row in conn.execute(sql + " ORDER BY seq", params):
+                yield tool_call_from_row(row)
+
+    def iter_outcomes(
+        self, since: Optional[datetime] = None
+    ) -> Iterator[tuple[str, str, str]]:
+        """Stream ``(tool_name, cache_key, status)`` of keyed PASS/FAIL calls.
+
+        Rows come in start time order, then calls without a start; store
+        order breaks ties. This is the order the flip rates in ``flakiness``
+        need, and the one ``report.ReportAccumulator`` replays in. Files are
+        not always ingested in the order their calls ran.
+
+        Args:
+            since: Only include calls that started at or after this time
+        """
+        sql = (
+            "SELECT tool_name, cache_key, status FROM tool_calls "
+            "WHERE cache_key != '' AND status IN ('PASS', 'FAIL')"
+        )
+        params: tuple = ()
+        if since is not None:
+            sql += " AND start_ms >= ?"
+            params = (_epoch_ms(since),)
+        with self._connect() as conn:
+            for row in conn.execute(
+                sql + " ORDER BY start_ms IS NULL, start_ms, seq", params
+            ):
+                yield row["tool_name"], row["cache_key"], row["status"]
+
+    def iter_durations(
+        self, since: Optional[datetime] = None
+    ) -> Iterator[tuple[str, int]]:
+        """Stream ``(tool_name, duration_ms)`` for stored calls with a duration.
+
+        Used to build per-tool percentile sketches, which SQL can't aggregate.
+
+        Args:
+            since: Only include calls that started at or after this time
+        """
+        sql = (
+            "SELECT tool_name, duration_ms FROM tool_calls "
+            "WHERE duration_ms IS NOT NULL"
+        )
+        params: tuple = ()
+        if since is not None:
+            sql += " AND start_ms >= ?"
+            params = (_epoch_ms(since),)
+        with self._connect() as conn:
+            for row in conn.execute(sql, params):
+                yield row["tool_name"], row["duration_ms"]
@@ -11,12 +11,12 @@ def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="rollflow_analyze",
         description="Analyze RollFlow/Ralph loop logs for tool call metrics and cache advice.",
+        epilog="Run 'rollflow_analyze simulate --help' to replay stored tool calls against cache policies.",
     )
     parser.add_argument(
         "--log-dir",
         type=Path,
-        required=True,
-        help="Directory containing log files to analyze",
+        help="Directory containing log files to analyze (required unless --from-store)",
     )
     parser.add_argument(
         "--out",
@@ -24,12 +24,24 @@ def create_parser() -> argparse.ArgumentParser:
         default=Path("artifacts/analysis/latest.json"),
         help="Output path for JSON report (default: artifacts/analysis/latest.json)",
     )
+    parser.add_argument(
+        "--json-format",
+        choices=["pretty", "compact", "ndjson"],
+        default="pretty",
+        help="JSON report layout: pretty (indented), compact, or ndjson (one tool call per line, report summary last)",
+    )
     parser.add_argument(
         "--cache-db",
         type=Path,
         default=Path("artifacts/rollflow_cache/cache.sqlite"),
         help="Path to SQLite cache database (default: artifacts/rollflow_cache/cache.sqlite)",
     )
+    parser.add_argument(
+        "--cache-config",
+        type=Path,
+        default=Path("artifacts/rollflow_cache/config.yml"),
+        help="Cache config whose 'retention' section limits the cache DB (default: artifacts/rollflow_cache/config.yml)",
+    )
     parser.add_argument(
         "--parser",
         choices=["marker", "heuristic", "auto"],
@@ -49,7 +61,57 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--since",
         type=str,
-        help="Only analyze logs from the last N hours (e.g., '24h', '1h', '48h')",
+        help="Only analyze logs from the last N hours or days (e.g., '24h', '48h', '30d')",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Parse log files in N worker processes (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only parse bytes appended since the last run (marker and RovoDev logs)",
+    )
+    parser.add_argument(
+        "--checkpoint-db",
+        type=Path,
+        default=Path("artifacts/rollflow_cache/ingest.sqlite"),
+        help="Checkpoint store for --incremental (default: artifacts/rollflow_cache/ingest.sqlite)",
+    )
+    parser.add_argument(
+        "--from-store",
+        action="store_true",
+        help="Report on ToolCalls already in --checkpoint-db (filled by --incremental) without reading logs",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Hold tool calls in a columnar table (much less memory for very large log sets)",
+    )
+    parser.add_argument(
+        "--flaky-window",
+        type=int,
+        default=20,
+        help="Most recent calls per cache key that flip rates are computed over (default: 20)",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Tail the active Ralph log and newest RovoDev log, writing 1m/15m/1h rolling metrics until interrupted",
+    )
+    parser.add_argument(
+        "--follow-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between --follow snapshots (default: 5)",
+    )
+    parser.add_argument(
+        "--follow-out",
+        type=Path,
+        help="Write --follow snapshots to this JSON file (replaced each time) instead of stdout",
     )
     parser.add_argument(
         "--markdown",
@@ -88,14 +150,121 @@ def parse_since(since_str: str) -> datetime:
         return datetime.fromisoformat(since_str)
 
 
+def review_pack_path(out: Path) -> Path:
+    """Review pack path for a JSON report path.
+
+    artifacts/analysis/iter_001.json -> artifacts/review_packs/iter_001.md
+    """
+    # Extract iteration number from JSON output path (e.g., iter_001.json -> 001)
+    iter_match = out.stem
+    if iter_match.startswith("iter_"):
+        iter_num = iter_match.replace("iter_", "")
+    else:
+        iter_num = "latest"
+    return out.parent.parent / "review_packs" / f"iter_{iter_num}.md"
+
+
+def report_from_store(args: argparse.Namespace, since_dt: datetime | None) -> int:
+    """Write JSON/markdown reports from the checkpoint store alone."""
+    from .checkpoint import CheckpointStore
+    from .report import (
+        build_report_from_store,
+        write_json_report,
+        write_markdown_summary,
+    )
+
+    if not args.checkpoint_db.exists():
+        print(
+            f"Error: Checkpoint store not found: {args.checkpoint_db} "
+            "(run with --incremental first)",
+            file=sys.stderr,
+        )
+        return 1
+
+    report = build_report_from_store(
+        CheckpointStore(args.checkpoint_db),
+        since=since_dt,
+        flaky_window=args.flaky_window,
+    )
+
+    if args.verbose:
+        print(f"Report generated from store with {report.aggregates.total_calls} calls")
+    if report.aggregates.total_calls == 0:
+        print("Warning: No stored tool calls in the selected window", file=sys.stderr)
+
+    try:
+        write_json_report(report, args.out, json_format=args.json_format)
+        if args.verbose:
+            print(f"JSON report written to: {args.out}")
+        if args.markdown:
+            md_path = args.out.with_suffix(".md")
+            write_markdown_summary(report, md_path)
+            if args.verbose:
+                print(f"Markdown summary written to: {md_path}")
+        if args.review_pack:
+            # No calls are loaded, so recurring failures come from the cache DB
+            from .cache_db import CacheDB
+            from .review_pack import write_review_pack
+
+            cache_db = CacheDB(args.cache_db) if args.cache_db.exists() else None
+            pack_path = review_pack_path(args.out)
+            write_review_pack(report, pack_path, cache_db)
+            if args.verbose:
+                print(f"Review pack written to: {pack_path}")
+    except Exception as e:
+        print(f"Error writing report: {e}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def follow_logs(args: argparse.Namespace, rovodev_logs_dir: Path | None) -> int:
+    """Run --follow until interrupted."""
+    from .follow import Follower, write_snapshot
+
+    if args.parser == "heuristic":
+        print("Note: --follow reads Ralph logs with the marker parser", file=sys.stderr)
+    follower = Follower(args.log_dir, rovodev_logs_dir)
+    if args.verbose:
+        where = args.follow_out or "stdout"
+        print(
+            f"Following {args.log_dir} and {rovodev_logs_dir or 'no RovoDev logs'}, "
+            f"snapshot every {args.follow_interval}s to {where}",
+            file=sys.stderr,
+        )
+    try:
+        follower.run(
+            lambda snapshot: write_snapshot(snapshot, args.follow_out),
+            interval=args.follow_interval,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     """Main entry point for CLI."""
-    from .parsers.marker_parser import MarkerParser
-    from .parsers.heuristic_parser import HeuristicParser
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["simulate"]:
+        from .simulate import main as simulate_main
+
+        return simulate_main(argv[1:])
+
+    from .ingest import (
+        ingest_log_files,
+        ingest_rovodev_files,
+        parse_log_files,
+        parse_rovodev_files,
+        resolve_jobs,
+    )
     from .parsers.rovodev_parser import RovoDevParser, get_rovodev_logs_dir
     from .report import build_report, write_json_report, write_markdown_summary
     from .review_pack import write_review_pack
-    from .models import ToolStatus, ToolSource
+    from .cache_telemetry import build_cache_telemetry
+    from .models import CacheEvent, Iteration, ToolStatus, ToolSource
+    from .table import ToolCallTable
+    from .timeline import build_iterations
 
     parser = create_parser()
     args = parser.parse_args(argv)
@@ -111,6 +280,16 @@ def main(argv: list[str] | None = None) -> int:
             print(f"Error: Invalid --since format: {e}", file=sys.stderr)
             return 1
 
+    if args.flaky_window < 2:
+        parser.error("--flaky-window must be at least 2")
+
+    # Aggregate from the checkpoint store; no logs are parsed
+    if args.from_store:
+        return report_from_store(args, since_dt)
+
+    if args.log_dir is None:
+        parser.error("--log-dir is required unless --from-store is given")
+
     # Validate log directory exists
     if not args.log_dir.exists():
         print(f"Error: Log directory not found: {args.log_dir}", file=sys.stderr)
@@ -120,27 +299,58 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Error: Not a directory: {args.log_dir}", file=sys.stderr)
         return 1
 
+    if args.follow:
+        if args.follow_interval <= 0:
+            parser.error("--follow-interval must be positive")
+        follow_dir = args.rovodev_logs
+        if follow_dir is None:
+            follow_dir = get_rovodev_logs_dir()
+        elif str(follow_dir).lower() == "none":
+            follow_dir = None
+        return follow_logs(args, follow_dir)
+
+    jobs = resolve_jobs(args.jobs)
+
     if args.verbose:
         print(f"Analyzing logs in: {args.log_dir}")
+        if jobs > 1:
+            print(f"Parsing with {jobs} worker processes")
 
     # Step 1: Select parser based on mode
     if args.parser == "marker":
-        log_parser = MarkerParser()
+        parser_kind = "marker"
         if args.verbose:
             print("Using marker parser (explicit START/END markers)")
     elif args.parser == "heuristic":
-        log_parser = HeuristicParser(config_path=args.config)
+        parser_kind = "heuristic"
         if args.verbose:
             print("Using heuristic parser (regex patterns)")
     else:  # auto mode
         # Try marker first, fallback to heuristic if no markers found
-        log_parser = MarkerParser()
+        parser_kind = "marker"
         if args.verbose:
             print("Using auto mode (marker parser, will fallback if needed)")
 
+    # Incremental mode resumes marker/RovoDev logs from stored checkpoints
+    checkpoint_store = None
+    if args.incremental:
+        from .checkpoint import CheckpointStore
+
+        checkpoint_store = CheckpointStore(args.checkpoint_db)
+        if args.verbose:
+            print(f"Incremental mode, checkpoints in: {args.checkpoint_db}")
+        if parser_kind == "heuristic":
+            print(
+                "Note: heuristic parser has no checkpoints, parsing in full",
+                file=sys.stderr,
+            )
+
     # Step 2: Stream through log files and collect tool calls
-    tool_calls = []
+    tool_calls = ToolCallTable() if args.compact else []
     shell_marker_count = 0
+    # Iteration boundaries and phases from ITER/PHASE markers
+    iteration_marks: list[Iteration] = []
+    cache_events: list[CacheEvent] = []
     log_files = sorted(args.log_dir.rglob("*.log"))
 
     if not log_files:
@@ -161,19 +371,28 @@ def main(argv: list[str] | None = None) -> int:
         if args.verbose:
             print(f"Found {len(log_files)} Ralph log file(s) to process")
 
-        for log_file in log_files:
+        # Results come back in file order; marker context is carried across files
+        if checkpoint_store and parser_kind == "marker":
+            results = ingest_log_files(log_files, checkpoint_store, jobs=jobs)
+        else:
+            results = parse_log_files(
+                log_files, parser_kind, config_path=args.config, jobs=jobs
+            )
+        for result in results:
             if args.verbose:
-                print(f"  Processing: {log_file.name}")
-
-            try:
-                # Stream parse file (generator-based, memory efficient)
-                for tool_call in log_parser.parse_file(log_file):
-                    tool_call.source = ToolSource.SHELL_MARKER
-                    tool_calls.append(tool_call)
-                    shell_marker_count += 1
-            except Exception as e:
-                print(f"Warning: Failed to parse {log_file}: {e}", file=sys.stderr)
-                continue
+                print(f"  Processing: {result.path.name}")
+
+            for tool_call in result.tool_calls:
+                tool_call.source = ToolSource.SHELL_MARKER
+                tool_calls.append(tool_call)
+                shell_marker_count += 1
+            iteration_marks.extend(result.iterations)
+            cache_events.extend(result.cache_events)
+            if result.error:
+                print(
+                    f"Warning: Failed to parse {result.path}: {result.error}",
+                    file=sys.stderr,
+                )
 
     if args.verbose:
         print(f"Extracted {shell_marker_count} shell marker tool call(s)")
@@ -183,19 +402,21 @@ def main(argv: list[str] | None = None) -> int:
         if args.verbose:
             print("No markers found, falling back to heuristic parser")
 
-        log_parser = HeuristicParser(config_path=args.config)
-        tool_calls = []
+        tool_calls = ToolCallTable() if args.compact else []
 
-        for log_file in log_files:
+        for result in parse_log_files(
+            log_files, "heuristic", config_path=args.config, jobs=jobs
+        ):
             if args.verbose:
-                print(f"  Re-processing: {log_file.name}")
-            try:
-                for tool_call in log_parser.parse_file(log_file):
-                    tool_call.source = ToolSource.HEURISTIC
-                    tool_calls.append(tool_call)
-            except Exception as e:
-                print(f"Warning: Failed to parse {log_file}: {e}", file=sys.stderr)
-                continue
+                print(f"  Re-processing: {result.path.name}")
+            for tool_call in result.tool_calls:
+                tool_call.source = ToolSource.HEURISTIC
+                tool_calls.append(tool_call)
+            if result.error:
+                print(
+                    f"Warning: Failed to parse {result.path}: {result.error}",
+                    file=sys.stderr,
+                )
 
     # Step 2b: Parse RovoDev logs for full tool call visibility
     rovodev_count = 0
@@ -211,13 +432,21 @@ def main(argv: list[str] | None = None) -> int:
         if args.verbose:
             print(f"\nParsing RovoDev logs from: {rovodev_logs_dir}")
 
-        rovodev_parser = RovoDevParser(verbose=args.verbose)
-        for tool_call in rovodev_parser.parse_directory(
+        rovodev_files = RovoDevParser(verbose=args.verbose).find_log_files(
             rovodev_logs_dir, since=since_dt
-        ):
-            tool_call.source = ToolSource.ROVODEV
-            tool_calls.append(tool_call)
-            rovodev_count += 1
+        )
+        # Workers don't print; per-file progress only makes sense in-process
+        if checkpoint_store:
+            results = ingest_rovodev_files(rovodev_files, checkpoint_store, jobs=jobs)
+        else:
+            results = parse_rovodev_files(
+                rovodev_files, jobs=jobs, verbose=args.verbose and jobs <= 1
+            )
+        for result in results:
+            for tool_call in result.tool_calls:
+                tool_call.source = ToolSource.ROVODEV
+                tool_calls.append(tool_call)
+                rovodev_count += 1
 
         if args.verbose:
             print(f"Extracted {rovodev_count} RovoDev tool call(s)")
@@ -228,14 +457,25 @@ def main(argv: list[str] | None = None) -> int:
         print("Warning: No tool calls found in logs", file=sys.stderr)
 
     # Step 3: Build report with aggregates and cache advice
-    report = build_report(tool_calls, run_id=None)
+    report = build_report(tool_calls, run_id=None, flaky_window=args.flaky_window)
+    report.iterations = build_iterations(
+        tool_calls, iteration_marks, keep_calls=not args.compact
+    )
+    report.cache_telemetry = build_cache_telemetry(cache_events)
 
     if args.verbose:
         print(f"Report generated with {report.aggregates.total_calls} calls")
+        print(f"  Iterations: {len(report.iterations)}")
+        if report.cache_telemetry:
+            ct = report.cache_telemetry
+            print(
+                f"  Cache lookups: {ct.lookups} ({ct.hit_rate:.1%} hit), "
+                f"{ct.guard_blocked} blocked by guards"
+            )
 
     # Step 4: Write JSON output
     try:
-        write_json_report(report, args.out)
+        write_json_report(report, args.out, json_format=args.json_format)
         if args.verbose:
             print(f"JSON report written to: {args.out}")
     except Exception as e:
@@ -253,52 +493,33 @@ def main(argv: list[str] | None = None) -> int:
             print(f"Error writing markdown summary: {e}", file=sys.stderr)
             return 1
 
-    # Step 5b: Optionally generate review pack
-    if args.review_pack:
-        # Extract iteration number from JSON output path (e.g., iter_001.json -> 001)
-        iter_match = args.out.stem
-        if iter_match.startswith("iter_"):
-            iter_num = iter_match.replace("iter_", "")
-        else:
-            iter_num = "latest"
-
-        # Derive review pack path relative to JSON output (same parent structure)
-        # artifacts/analysis/iter_001.json -> artifacts/review_packs/iter_001.md
-        review_pack_path = (
-            args.out.parent.parent / "review_packs" / f"iter_{iter_num}.md"
-        )
-        try:
-            write_review_pack(report, review_pack_path)
-            if args.verbose:
-                print(f"Review pack written to: {review_pack_path}")
-        except Exception as e:
-            print(f"Error writing review pack: {e}", file=sys.stderr)
-            return 1
-
     # Step 6: Update cache DB with PASS/FAIL results
+    cache_db = None
     if args.cache_db:
         try:
-            from .cache_db import CacheDB
+            from .cache_db import CacheDB, RetentionPolicy
 
             cache_db = CacheDB(args.cache_db)
             if args.verbose:
                 print(f"Updating cache database: {args.cache_db}")
 
-            # Update cache with PASS results
-            pass_count = 0
-            fail_count = 0
-            for tool_call in tool_calls:
-                if tool_call.status == ToolStatus.PASS and tool_call.cache_key:
-                    cache_db.upsert_pass(tool_call)
-                    pass_count += 1
-                elif tool_call.status == ToolStatus.FAIL:
-                    cache_db.log_fail(tool_call)
-                    fail_count += 1
+            # One transaction each for PASS upserts and FAIL log entries
+            pass_count = cache_db.upsert_pass_many(
+                tc for tc in tool_calls if tc.status == ToolStatus.PASS and tc.cache_key
+            )
+            fail_count = cache_db.log_fail_many(
+                tc for tc in tool_calls if tc.status == ToolStatus.FAIL
+            )
+            evicted = cache_db.evict(RetentionPolicy.from_config(args.cache_config))
 
             if args.verbose:
                 print(
                     f"  Cached {pass_count} PASS result(s), logged {fail_count} FAIL(s)"
                 )
+                print(
+                    f"  Retention removed {evicted['pass_cache']} cached PASS(es), "
+                    f"{evicted['fail_log']} FAIL log entries"
+                )
                 stats = cache_db.get_stats()
                 print(
                     f"  Cache DB stats: {stats['pass_cache_entries']} entries, {stats['fail_log_entries']} failures"
@@ -306,6 +527,19 @@ def main(argv: list[str] | None = None) -> int:
         except Exception as e:
             print(f"Warning: Failed to update cache DB: {e}", file=sys.stderr)
             # Don't fail the entire run if cache update fails
+            cache_db = None
+
+    # Step 7: Optionally generate review pack. Written after the cache DB
+    # update, so its recurring failures include this run's.
+    if args.review_pack:
+        pack_path = review_pack_path(args.out)
+        try:
+            write_review_pack(report, pack_path, cache_db)
+            if args.verbose:
+                print(f"Review pack written to: {pack_path}")
+        except Exception as e:
+            print(f"Error writing review pack: {e}", file=sys.stderr)
+            return 1
 
     return 0
 
@@ -0,0 +1,67 @@
+"""Normalized fingerprints for grouping identical failures."""
+
+import hashlib
+import re
+from typing import Optional
+
+# Applied in order; each strips one kind of run-to-run noise
+_NORMALIZERS = [
+    # ANSI colour and OSC sequences
+    (re.compile(r"\x1b\[[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07"), ""),
+    # ISO dates and timestamps, then bare clock times
+    (
+        re.compile(
+            r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?"
+            r"(?:Z|[+-]\d{2}:?\d{2})?)?"
+        ),
+        "<ts>",
+    ),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<ts>"),
+    # UUIDs, 0x addresses, and hex ids such as git SHAs (7+ chars, a digit)
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I
+        ),
+        "<id>",
+    ),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.I), "<hex>"),
+    (re.compile(r"\b(?=[0-9a-f]*\d)[0-9a-f]{7,}\b", re.I), "<id>"),
+    # Paths keep only their file name (URLs are left alone)
+    (
+        re.compile(r"(?<![\w.~:/\\-])(?:[A-Za-z]:)?(?:[\w.~-]*[/\\])+(?=[\w.-])"),
+        "",
+    ),
+    # Line (and column) numbers
+    (re.compile(r"\b(line|lineno|ln)(\s*[= ]\s*)\d+", re.I), r"\1\2<n>"),
+    (re.compile(r"(\.\w+):\d+(?::\d+)?"), r"\1:<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_error(text: str) -> str:
+    """Strip timestamps, ids, directories and line numbers from error text.
+
+    Two failures with the same cause but from different runs, checkouts or
+    edits normalize to the same string.
+
+    Example:
+        ``/home/a/src/app.py:42: 2026-01-25T12:00:01Z KeyError 'x'`` becomes
+        ``app.py:<n>: <ts> KeyError 'x'``.
+    """
+    for pattern, replacement in _NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def error_fingerprint(
+    error_text: Optional[str], exit_code: Optional[int] = None
+) -> str:
+    """16-hex-digit fingerprint of a failure's normalized error text.
+
+    Failures without error text are grouped by exit code instead.
+    """
+    if error_text and error_text.strip():
+        key = normalize_error(error_text)
+    else:
+        key = f"<no error text> exit={exit_code}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,141 @@
+"""Sliding-window flip rates and flakiness scores per (tool, cache_key).
+
+A cache key names a tool's inputs, so the same key going PASS -> FAIL or
+FAIL -> PASS is the tool giving different answers for the same inputs. Each
+key keeps its last ``window`` outcomes as bits of an int (1 = FAIL); the
+flips in the window are the set bits of ``bits ^ (bits >> 1)``, so adding a
+call and reading a rate are O(1) however long the history, and old flips
+drop out as newer calls arrive. A tool that failed while broken and passed
+once fixed had a different cache key before and after, and is not flaky.
+
+Calls without a cache key, or whose status is neither PASS nor FAIL, are not
+counted. Calls must be added in time order.
+"""
+
+from typing import Optional
+
+from .models import FlakyKey, ToolStatus
+
+# Outcomes per key the flip rate is computed over
+DEFAULT_FLAKY_WINDOW = 20
+
+# Transitions added to every score's denominator, so one flip in two calls
+# does not outrank a key flipping steadily over a full window
+SCORE_PRIOR_TRANSITIONS = 4
+
+FLAKY_KEYS_LIMIT = 10
+
+
+class _KeyState:
+    """Outcome history of one (tool, cache_key)."""
+
+    __slots__ = ("calls", "bits", "first_fail", "last_fail", "total_flips")
+
+    def __init__(self, failed: bool) -> None:
+        self.calls = 1
+        self.bits = int(failed)
+        self.first_fail = failed
+        self.last_fail = failed
+        self.total_flips = 0
+
+
+class FlakinessTracker:
+    """Incremental flip-rate statistics over time-ordered calls.
+
+    Trackers built over consecutive slices of the calls ``merge`` into the
+    tracker of the whole sequence.
+    """
+
+    def __init__(self, window: int = DEFAULT_FLAKY_WINDOW):
+        if window < 2:
+            raise ValueError("flakiness window must be at least 2 calls")
+        self.window = window
+        self._mask = (1 << window) - 1
+        # Insertion order is first appearance, which breaks ties in ranking
+        self._keys: dict[tuple[str, str], _KeyState] = {}
+
+    def add(self, tool_name: str, cache_key: Optional[str], status: ToolStatus) -> None:
+        """Count one call's outcome."""
+        if not cache_key or status not in (ToolStatus.PASS, ToolStatus.FAIL):
+            return
+        failed = status == ToolStatus.FAIL
+        state = self._keys.get((tool_name, cache_key))
+        if state is None:
+            self._keys[(tool_name, cache_key)] = _KeyState(failed)
+            return
+        state.calls += 1
+        state.bits = ((state.bits << 1) | failed) & self._mask
+        if failed != state.last_fail:
+            state.total_flips += 1
+        state.last_fail = failed
+
+    def merge(self, other: "FlakinessTracker") -> None:
+        """Fold in a tracker built over the calls that follow ours."""
+        if other.window != self.window:
+            raise ValueError("cannot merge trackers with different windows")
+        for key, theirs in other._keys.items():
+            ours = self._keys.get(key)
+            if ours is None:
+                state = self._keys[key] = _KeyState(theirs.first_fail)
+                state.calls = theirs.calls
+                state.bits = theirs.bits
+                state.last_fail = theirs.last_fail
+                state.total_flips = theirs.total_flips
+                continue
+            shift = min(theirs.calls, self.window)
+            ours.bits = ((ours.bits << shift) | theirs.bits) & self._mask
+            ours.total_flips += theirs.total_flips + (
+                ours.last_fail != theirs.first_fail
+            )
+            ours.calls += theirs.calls
+            ours.last_fail = theirs.last_fail
+
+    def _window_counts(self, state: _KeyState) -> tuple[int, int]:
+        """(flips, transitions) among the key's last ``window`` outcomes."""
+        transitions = min(state.calls, self.window) - 1
+        changed = (state.bits ^ (state.bits >> 1)) & ((1 << transitions) - 1)
+        flips = bin(changed).count("1")  # int.bit_count() needs 3.10
+        return flips, transitions
+
+    def flaky_keys(self, limit: Optional[int] = FLAKY_KEYS_LIMIT) -> list[FlakyKey]:
+        """Keys that flipped within their window, highest score first."""
+        ranked: list[FlakyKey] = []
+        for (tool_name, cache_key), state in self._keys.items():
+            flips, transitions = self._window_counts(state)
+            if not flips:
+                continue
+            ranked.append(
+                FlakyKey(
+                    tool_name=tool_name,
+                    cache_key=cache_key,
+                    calls=state.calls,
+                    window_calls=transitions + 1,
+                    flips=flips,
+                    flip_rate=round(flips / transitions, 4),
+                    score=round(flips / (transitions + SCORE_PRIOR_TRANSITIONS), 4),
+                    total_flips=state.total_flips,
+                    last_status=(
+                        ToolStatus.FAIL if state.last_fail else ToolStatus.PASS
+                    ),
+                )
+            )
+        ranked.sort(key=lambda k: k.score, reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+    def tool_scores(self) -> dict[str, float]:
+        """Per-tool score over all its keys' windows, highest first.
+
+        Only tools with a flip in some window are listed.
+        """
+        counts: dict[str, list[int]] = {}
+        for (tool_name, _), state in self._keys.items():
+            flips, transitions = self._window_counts(state)
+            totals = counts.setdefault(tool_name, [0, 0])
+            totals[0] += flips
+            totals[1] += transitions
+        scores = {
+            name: round(flips / (transitions + SCORE_PRIOR_TRANSITIONS), 4)
+            for name, (flips, transitions) in counts.items()
+            if flips
+        }
+        return dict(sorted(scores.items(), key=lambda x: x[1], reverse=True))
@@ -0,0 +1,445 @@
+"""Live follow mode: tail the active logs and keep rolling-window metrics.
+
+``--follow`` tails two files as they grow:
+
+* the active Ralph log (the most recently modified ``*.log`` under
+  ``--log-dir``), parsed with the marker parser
+* the newest ``rovodev*.log`` in the RovoDev logs directory
+
+Appended lines go through the same parsers as a batch run, one complete line
+at a time, with their state kept between reads (calls still running stay
+open until their END arrives). Finished calls are folded into 1m/15m/1h
+rolling windows, and a JSON snapshot of the windows is written at a fixed
+cadence.
+
+Each window is a ring of fixed time slots holding per-tool counters and a
+duration sketch, so memory does not grow with the number of calls seen.
+New data is noticed through inotify where it is available (Linux) and by
+polling otherwise.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO
+
+from .ingest import _AppendedLines
+from .models import ToolCall, ToolSource
+from .parsers.marker_parser import MarkerFileState, MarkerParser
+from .parsers.rovodev_parser import RovoDevParser
+from .report import _ToolStats
+
+# (label, span in seconds) of the rolling windows
+WINDOWS = (("1m", 60), ("15m", 15 * 60), ("1h", 60 * 60))
+
+# Slots per window: each window is accurate to 1/60 of its span
+WINDOW_SLOTS = 60
+
+DEFAULT_INTERVAL_S = 5.0
+
+# Wake-up period when inotify is unavailable
+POLL_INTERVAL_S = 0.5
+
+# inotify(7) event masks
+_IN_MODIFY = 0x002
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_WATCH_MASK = _IN_MODIFY | _IN_CREATE | _IN_MOVED_TO
+
+
+class RollingWindow:
+    """Per-tool aggregates over the last ``span_s`` seconds.
+
+    The span is split into ``slots`` fixed slots kept in a ring. A call is
+    counted in the slot covering the time it was seen; a slot is cleared when
+    the ring comes back round to it, so old calls drop out a slot at a time.
+    """
+
+    def __init__(self, span_s: float, slots: int = WINDOW_SLOTS):
+        self.span_s = span_s
+        self.slots = slots
+        self._width = span_s / slots
+        # Slot number (time // width) each ring entry currently holds
+        self._epochs = [-1] * slots
+        self._tools: list[dict[str, _ToolStats]] = [{} for _ in range(slots)]
+
+    def add(self, tc: ToolCall, now: float) -> None:
+        """Count a call seen at ``now`` (epoch seconds)."""
+        epoch = int(now // self._width)
+        i = epoch % self.slots
+        if self._epochs[i] != epoch:
+            self._epochs[i] = epoch
+            self._tools[i] = {}
+        tools = self._tools[i]
+        stats = tools.get(tc.tool_name)
+        if stats is None:
+            stats = tools[tc.tool_name] = _ToolStats()
+        stats.add(tc)
+
+    def merged(self, now: float) -> dict[str, _ToolStats]:
+        """Per-tool totals of the slots still inside the window at ``now``."""
+        epoch = int(now // self._width)
+        merged: dict[str, _ToolStats] = {}
+        for slot_epoch, tools in zip(self._epochs, self._tools):
+            if not epoch - self.slots < slot_epoch <= epoch:
+                continue
+            for name, stats in tools.items():
+                if name not in merged:
+                    merged[name] = _ToolStats()
+                merged[name].merge(stats)
+        return merged
+
+    def snapshot(self, now: float) -> dict:
+        """JSON-ready totals and per-tool metrics for the window."""
+        tools = self.merged(now)
+        total = sum(s.total_calls for s in tools.values())
+        passed = sum(s.pass_count for s in tools.values())
+        failed = sum(s.fail_count for s in tools.values())
+        ordered = sorted(tools.items(), key=lambda x: x[1].total_calls, reverse=True)
+        return {
+            "window_s": self.span_s,
+            "total_calls": total,
+            "pass_count": passed,
+            "fail_count": failed,
+            "fail_rate": round(failed / total, 4) if total else 0.0,
+            "calls_per_min": round(total * 60 / self.span_s, 2),
+            "tools": {name: _tool_metrics(stats) for name, stats in ordered},
+        }
+
+
+def _tool_metrics(stats: _ToolStats) -> dict:
+    metrics = {
+        "calls": stats.total_calls,
+        "pass": stats.pass_count,
+        "fail": stats.fail_count,
+        "avg_duration_ms": (
+            round(stats.total_duration_ms / stats.duration_count, 1)
+            if stats.duration_count
+            else None
+        ),
+        "max_duration_ms": stats.max_duration_ms,
+    }
+    for pct in (50, 90, 99):
+        value = stats.sketch.quantile(pct / 100)
+        metrics[f"p{pct}_duration_ms"] = (
+            None if value is None else round(float(value), 1)
+        )
+    return metrics
+
+
+class LiveAggregates:
+    """The 1m/15m/1h windows, fed together."""
+
+    def __init__(self, windows=WINDOWS, slots: int = WINDOW_SLOTS):
+        self.windows = {label: RollingWindow(span, slots) for label, span in windows}
+
+    def add(self, tc: ToolCall, now: float) -> None:
+        for window in self.windows.values():
+            window.add(tc, now)
+
+    def snapshot(self, now: float) -> dict:
+        return {label: w.snapshot(now) for label, w in self.windows.items()}
+
+
+class _Tail(ABC):
+    """Incrementally parse one growing log file.
+
+    Starts at the end of the file unless ``from_start``. When the file is
+    replaced (new inode) or truncated, parsing restarts from its first byte
+    with fresh parser state.
+    """
+
+    source = ToolSource.HEURISTIC
+
+    def __init__(self, path: Path, from_start: bool = False):
+        self.path = path
+        st = path.stat()
+        self._inode = st.st_ino
+        self.offset = 0 if from_start else st.st_size
+        self._reset()
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Start over with fresh parser state."""
+
+    @abstractmethod
+    def _parse(self, lines: _AppendedLines) -> Iterator[ToolCall]:
+        """Finished calls in ``lines``, keeping parser state between reads."""
+
+    def read(self) -> list[ToolCall]:
+        """Calls finished in the lines appended since the last read."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return []
+        if st.st_ino != self._inode or st.st_size < self.offset:
+            self._inode = st.st_ino
+            self.offset = 0
+            self._reset()
+        if st.st_size == self.offset:
+            return []
+        lines = _AppendedLines(self.path, self.offset)
+        calls = list(self._parse(lines))
+        self.offset = lines.offset
+        for tc in calls:
+            tc.source = self.source
+        return calls
+
+
+class _MarkerTail(_Tail):
+    source = ToolSource.SHELL_MARKER
+
+    def _reset(self) -> None:
+        self._parser = MarkerParser()
+        self._state = MarkerFileState(str(self.path))
+
+    def _parse(self, lines: _AppendedLines) -> Iterator[ToolCall]:
+        # Cache events and iteration marks are not part of the windows;
+        # don't let them pile up
+        self._parser.cache_events.clear()
+        self._parser._iterations.clear()
+        return self._parser.parse_lines(
+            lines, self.path, state=self._state, finalize=False
+        )
+
+
+class _RovoDevTail(_Tail):
+    source = ToolSource.ROVODEV
+
+    def _reset(self) -> None:
+        # Args are never shown in the windows, so leave them undecoded
+        self._parser = RovoDevParser(lazy_args=True)
+
+    def _parse(self, lines: _AppendedLines) -> Iterator[ToolCall]:
+        return self._parser.parse_lines(lines, self.path, resume=True, finalize=False)
+
+
+def newest_file(paths: Iterator[Path]) -> Optional[Path]:
+    """Most recently modified of ``paths`` (None if there are none)."""
+    newest, newest_mtime = None, -1.0
+    for path in paths:
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if path.is_file() and mtime > newest_mtime:
+            newest, newest_mtime = path, mtime
+    return newest
+
+
+class _Inotify:
+    """Wake on writes to files in a set of directories (Linux only).
+
+    Raises:
+        OSError: If inotify is unavailable or a directory cannot be watched
+    """
+
+    def __init__(self, dirs: list[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc = libc
+        self.fd = fd
+        self._watches: dict[Path, int] = {}
+        try:
+            self.watch(dirs)
+        except OSError:
+            self.close()
+            raise
+
+    def watch(self, dirs: list[Path]) -> None:
+        """Watch exactly ``dirs``, dropping watches on any others.
+
+        inotify is not recursive, so the directories are those of the files
+        being tailed, not just the roots they were found under.
+        """
+        for d in [d for d in self._watches if d not in dirs]:
+            self._libc.inotify_rm_watch(self.fd, self._watches.pop(d))
+        for d in dirs:
+            if d in self._watches:
+                continue
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(d), _WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"cannot watch {d}")
+            self._watches[d] = wd
+
+    def wait(self, timeout: float) -> None:
+        """Block until something changed or ``timeout`` seconds passed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            # Drain the events; the tails work out what changed themselves
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """Fallback watcher: wake every ``interval`` seconds."""
+
+    def __init__(self, interval: float = POLL_INTERVAL_S):
+        self.interval = interval
+
+    def watch(self, dirs: list[Path]) -> None:
+        pass
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(min(timeout, self.interval))
+
+    def close(self) -> None:
+        pass
+
+
+class Follower:
+    """Tail the active Ralph and RovoDev logs into live aggregates.
+
+    The active files are re-selected at each refresh, so a new Ralph log or
+    a new RovoDev session is picked up (and read from its start) within one
+    interval.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        rovodev_dir: Optional[Path] = None,
+        aggregates: Optional[LiveAggregates] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.log_dir = log_dir
+        self.rovodev_dir = rovodev_dir
+        self.aggregates = aggregates or LiveAggregates()
+        self.clock = clock
+        self.ralph: Optional[_MarkerTail] = None
+        self.rovodev: Optional[_RovoDevTail] = None
+        self._started = False
+
+    def select_files(self) -> None:
+        """Switch to the newest Ralph/RovoDev logs if they changed.
+
+        Files present when following starts are read from their end; files
+        that appear later are read in full.
+        """
+        from_start = self._started
+        self._started = True
+        ralph = newest_file(self.log_dir.rglob("*.log"))
+        if ralph is not None and (self.ralph is None or ralph != self.ralph.path):
+            self.ralph = _MarkerTail(ralph, from_start=from_start)
+        if self.rovodev_dir is not None and self.rovodev_dir.is_dir():
+            rovodev = newest_file(self.rovodev_dir.glob("rovodev*.log"))
+            if rovodev is not None and (
+                self.rovodev is None or rovodev != self.rovodev.path
+            ):
+                self.rovodev = _RovoDevTail(rovodev, from_start=from_start)
+
+    def poll(self) -> int:
+        """Read whatever was appended and count it. Returns calls added."""
+        now = self.clock()
+        added = 0
+        for tail in (self.ralph, self.rovodev):
+            if tail is None:
+                continue
+            for tc in tail.read():
+                self.aggregates.add(tc, now)
+                added += 1
+        return added
+
+    def snapshot(self) -> dict:
+        now = self.clock()
+        return {
+            "generated_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "files": {
+                "ralph": str(self.ralph.path) if self.ralph else None,
+                "rovodev": str(self.rovodev.path) if self.rovodev else None,
+            },
+            "windows": self.aggregates.snapshot(now),
+        }
+
+    def watch_dirs(self) -> list[Path]:
+        """Directories the watcher covers.
+
+        The roots new logs appear under, plus the directory of the active
+        Ralph log, which may be below ``--log-dir`` (it is searched
+        recursively and inotify is not).
+        """
+        dirs = [self.log_dir]
+        if self.ralph is not None and self.ralph.path.parent not in dirs:
+            dirs.append(self.ralph.path.parent)
+        if self.rovodev_dir is not None and self.rovodev_dir.is_dir():
+            dirs.append(self.rovodev_dir)
+        return dirs
+
+    def run(
+        self,
+        emit: Callable[[dict], None],
+        interval: float = DEFAULT_INTERVAL_S,
+        max_refreshes: Optional[int] = None,
+    ) -> None:
+        """Follow until interrupted (or ``max_refreshes`` snapshots).
+
+        Args:
+            emit: Called with each snapshot
+            interval: Seconds between snapshots
+            max_refreshes: Stop after this many snapshots (for tests)
+        """
+        self.select_files()
+        watcher = _make_watcher(self.watch_dirs())
+        refreshes = 0
+        next_refresh = time.monotonic() + interval
+        try:
+            while True:
+                self.poll()
+                now = time.monotonic()
+                if now >= next_refresh:
+                    emit(self.snapshot())
+                    refreshes += 1
+                    if max_refreshes is not None and refreshes >= max_refreshes:
+                        return
+                    next_refresh += interval
+                    if next_refresh <= now:
+                        # Fell behind (e.g. a huge append); don't burst snapshots
+                        next_refresh = now + interval
+                    self.select_files()
+                    # The active log may have moved to another directory. If
+                    # it can't be watched, the refresh timeout still wakes us.
+                    try:
+                        watcher.watch(self.watch_dirs())
+                    except OSError:
+                        pass
+                    continue
+                watcher.wait(next_refresh - now)
+        finally:
+            watcher.close()
+
+
+def _make_watcher(dirs: list[Path]):
+    """inotify watcher over ``dirs``, or a poller where that fails."""
+    try:
+        return _Inotify(dirs)
+    except (OSError, AttributeError, TypeError):
+        return _Poller()
+
+
+def write_snapshot(snapshot: dict, out: Optional[Path], stream: TextIO = sys.stdout):
+    """Write a snapshot to ``out`` (atomically replaced) or one line to stdout."""
+    if out is None:
+        stream.write(json.dumps(snapshot) + "\n")
+        stream.flush()
+        return
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_text(json.dumps(snapshot, indent=2) + "\n")
+    os.replace(tmp, out)
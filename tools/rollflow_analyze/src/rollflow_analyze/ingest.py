@@ -0,0 +1,462 @@
+"""Log ingestion: per-file parse tasks with optional process-pool fan-out.
+
+Each file is parsed by a fresh parser so files can be handed to worker
+processes independently. The only state that crosses file boundaries is the
+MarkerParser run/iteration context; it is made explicit here and re-applied
+in file order when results are merged, so ``jobs=N`` produces exactly the
+same ToolCalls, in the same order, as a single parser walking the files.
+
+``ingest_log_files`` / ``ingest_rovodev_files`` add incremental mode on top:
+a CheckpointStore remembers how far each file was read, so a re-run only
+parses bytes appended since the last run and reuses the stored ToolCalls.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .checkpoint import (
+    Checkpoint,
+    CheckpointStore,
+    tool_call_from_row,
+    tool_call_to_row,
+)
+from .models import CacheEvent, Iteration, ToolCall, ToolSource
+from .parsers.heuristic_parser import HeuristicParser
+from .parsers.marker_parser import MarkerFileState, MarkerParser
+from .parsers.rovodev_parser import RovoDevParser
+
+
+@dataclass
+class FileResult:
+    """Tool calls parsed from one log file."""
+
+    path: Path
+    tool_calls: list[ToolCall] = field(default_factory=list)
+    # Marker context at end of file (None = file never set it)
+    run_id: Optional[str] = None
+    iter_id: Optional[str] = None
+    cache_scope: Optional[str] = None
+    # Iterations from ITER/PHASE markers (possibly partial at file edges)
+    iterations: list[Iteration] = field(default_factory=list)
+    # CACHE_* marker events, in log order
+    cache_events: list[CacheEvent] = field(default_factory=list)
+    # Set when parsing stopped early; tool_calls holds what was read before
+    error: Optional[str] = None
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Map a --jobs value to a worker count (0 = one per CPU)."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+@lru_cache(maxsize=None)
+def _heuristic_parser(config_path: Optional[Path]) -> HeuristicParser:
+    """HeuristicParser is stateless across files, so build it once per process."""
+    return HeuristicParser(config_path=config_path)
+
+
+def parse_log_file(
+    path: Path, parser_kind: str, config_path: Optional[Path] = None
+) -> FileResult:
+    """Parse one Ralph log with a fresh parser.
+
+    Runs unchanged in a worker process. A MarkerParser starts with an empty
+    context, so any call whose run_id/iter_id is still None was emitted before
+    the file set its own context and inherits it from the previous file (see
+    ``_carry_context``).
+
+    Args:
+        path: Log file to parse
+        parser_kind: "marker" or "heuristic"
+        config_path: Patterns config for the heuristic parser
+    """
+    if parser_kind == "heuristic":
+        log_parser = _heuristic_parser(config_path)
+    else:
+        log_parser = MarkerParser()
+
+    result = FileResult(path=path)
+    try:
+        for tool_call in log_parser.parse_file(path):
+            result.tool_calls.append(tool_call)
+    except Exception as e:
+        result.error = str(e)
+
+    if isinstance(log_parser, MarkerParser):
+        result.run_id, result.iter_id = log_parser.context
+        result.cache_scope = log_parser.cache_scope
+        result.iterations = log_parser.iterations
+        result.cache_events = log_parser.cache_events
+    return result
+
+
+def parse_rovodev_file(path: Path, verbose: bool = False) -> FileResult:
+    """Parse one RovoDev log (plain or .gz). Pending calls never span files.
+
+    Args are left undecoded (``lazy_args``); the report writer decodes the
+    excerpts of the calls it writes out.
+    """
+    rovodev_parser = RovoDevParser(verbose=verbose, lazy_args=True)
+    return FileResult(path=path, tool_calls=list(rovodev_parser.parse_file(path)))
+
+
+def _carry_context(results: Iterable[FileResult]) -> Iterator[FileResult]:
+    """Re-apply marker context across files in order.
+
+    Context fields only ever move from None to a value within a file, so a
+    None on a call, iteration mark or cache event means "whatever the
+    previous file left behind". Cache events likewise inherit the previous
+    file's CACHE_SCOPE until the file's own :::CACHE_CONFIG:::.
+    """
+    run_id: Optional[str] = None
+    iter_id: Optional[str] = None
+    cache_scope: Optional[str] = None
+    for result in results:
+        if run_id is not None or iter_id is not None:
+            for tc in result.tool_calls:
+                if tc.run_id is None:
+                    tc.run_id = run_id
+                if tc.iter_id is None:
+                    tc.iter_id = iter_id
+            for mark in result.iterations:
+                if mark.run_id is None:
+                    mark.run_id = run_id
+                if mark.iter_id is None and iter_id is not None:
+                    mark.iter_id = iter_id
+                    mark.iter_num = int(iter_id) if iter_id.isdigit() else 0
+            for event in result.cache_events:
+                if event.run_id is None:
+                    event.run_id = run_id
+                if event.iter_id is None:
+                    event.iter_id = iter_id
+        if cache_scope is not None:
+            for event in result.cache_events:
+                if event.scope is None:
+                    event.scope = cache_scope
+        if result.run_id is not None:
+            run_id = result.run_id
+        if result.iter_id is not None:
+            iter_id = result.iter_id
+        if result.cache_scope is not None:
+            cache_scope = result.cache_scope
+        result.run_id, result.iter_id = run_id, iter_id
+        result.cache_scope = cache_scope
+        yield result
+
+
+def parse_log_files(
+    paths: list[Path],
+    parser_kind: str,
+    config_path: Optional[Path] = None,
+    jobs: int = 1,
+) -> Iterator[FileResult]:
+    """Parse Ralph logs in order, fanning out to a process pool if jobs > 1.
+
+    Args:
+        paths: Log files, in the order their calls should be reported
+        parser_kind: "marker" or "heuristic"
+        config_path: Patterns config for the heuristic parser
+        jobs: Worker processes (1 = parse in-process)
+
+    Yields:
+        One FileResult per path, in input order, with context carried over
+    """
+    if jobs <= 1 or len(paths) <= 1:
+        results = (parse_log_file(p, parser_kind, config_path) for p in paths)
+        yield from _carry_context(results)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(
+            parse_log_file, paths, repeat(parser_kind), repeat(config_path)
+        )
+        yield from _carry_context(results)
+
+
+def parse_rovodev_files(
+    paths: list[Path], jobs: int = 1, verbose: bool = False
+) -> Iterator[FileResult]:
+    """Parse RovoDev logs in order, fanning out to a process pool if jobs > 1."""
+    if jobs <= 1 or len(paths) <= 1:
+        for p in paths:
+            yield parse_rovodev_file(p, verbose=verbose)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(parse_rovodev_file, paths)
+
+
+class _AppendedLines:
+    """Iterate complete lines written to a file after a byte offset.
+
+    ``offset`` advances past each complete line as it is yielded. A trailing
+    line without a newline is still being written and is left for next time,
+    unless ``final`` is set (see ``_settled_tail``). Decoding and newline
+    handling match the text-mode readers in the parsers.
+    """
+
+    def __init__(self, path: Path, offset: int, final: bool = False):
+        self.path = path
+        self.offset = offset
+        self.final = final
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for raw in f:
+                if not raw.endswith(b"\n") and not self.final:
+                    break
+                self.offset += len(raw)
+                text = raw.decode("utf-8", errors="replace")
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+                yield from text.splitlines(keepends=True)
+
+
+@dataclass
+class _IngestOutcome:
+    """What a worker learned about one file in incremental mode."""
+
+    result: FileResult
+    # Finished calls parsed in this run (appended to the store)
+    new_calls: list[ToolCall] = field(default_factory=list)
+    # Calls still open at EOF, reported as UNKNOWN but not stored
+    open_calls: list[ToolCall] = field(default_factory=list)
+    # ITER/PHASE marks parsed in this run (appended to the store)
+    new_marks: list[Iteration] = field(default_factory=list)
+    # CACHE_* events parsed in this run (appended to the store)
+    new_events: list[CacheEvent] = field(default_factory=list)
+    # None = nothing to save (unchanged file, or parse error)
+    checkpoint: Optional[Checkpoint] = None
+    # Stored calls for this file are stale and must be dropped
+    reset: bool = False
+
+
+def _can_resume(
+    st: os.stat_result, checkpoint: Optional[Checkpoint], parser: str
+) -> str:
+    """Classify a file against its checkpoint: 'unchanged', 'append' or 'full'."""
+    if checkpoint is None or checkpoint.parser != parser:
+        return "full"
+    if st.st_ino != checkpoint.inode:
+        return "full"  # rotated or replaced
+    if st.st_size == checkpoint.size and st.st_mtime == checkpoint.mtime:
+        return "unchanged"
+    if st.st_size > checkpoint.size:
+        return "append"
+    return "full"  # truncated or rewritten in place
+
+
+def _settled_tail(
+    st: os.stat_result, checkpoint: Optional[Checkpoint], mode: str
+) -> bool:
+    """Whether an unterminated last line has stopped changing.
+
+    The line was held back last run; if the file's size and mtime have not
+    moved since, its writer is done (or died) and the line is parsed as it
+    is. Should the writer resume after all, the rest of the line is read as
+    a line of its own.
+    """
+    return mode == "unchanged" and checkpoint.offset < st.st_size
+
+
+def _new_checkpoint(
+    path: Path, parser: str, st: os.stat_result, offset: int, line_no: int, state: dict
+) -> Checkpoint:
+    return Checkpoint(
+        path=str(path),
+        parser=parser,
+        inode=st.st_ino,
+        size=st.st_size,
+        mtime=st.st_mtime,
+        offset=offset,
+        line_no=line_no,
+        state=state,
+    )
+
+
+def _tag_source(outcome: _IngestOutcome, source: ToolSource) -> None:
+    """Stamp the data source on calls before they are stored."""
+    for tc in outcome.new_calls + outcome.open_calls:
+        tc.source = source
+
+
+def _ingest_marker_file(path: Path, checkpoint: Optional[Checkpoint]) -> _IngestOutcome:
+    """Parse the unread tail of a Ralph log, resuming MarkerParser state."""
+    st = path.stat()
+    mode = _can_resume(st, checkpoint, "marker")
+
+    if mode == "full":
+        log_parser = MarkerParser()
+        fstate = MarkerFileState(str(path))
+        offset = 0
+    else:
+        saved = checkpoint.state
+        log_parser = MarkerParser(
+            run_id=saved.get("run_id"),
+            iter_id=saved.get("iter_id"),
+            cache_scope=saved.get("cache_scope"),
+        )
+        fstate = MarkerFileState(
+            str(path),
+            line_no=checkpoint.line_no,
+            active={
+                row["id"]: tool_call_from_row(row) for row in saved.get("active", [])
+            },
+            rolling_tail=saved.get("rolling_tail", []),
+        )
+        offset = checkpoint.offset
+
+    outcome = _IngestOutcome(result=FileResult(path=path), reset=mode == "full")
+    final = _settled_tail(st, checkpoint, mode)
+    if mode != "unchanged" or final:
+        lines = _AppendedLines(path, offset, final=final)
+        try:
+            outcome.new_calls = list(
+                log_parser.parse_lines(lines, path, state=fstate, finalize=False)
+            )
+        except Exception as e:
+            outcome.result.error = str(e)
+            return outcome
+        outcome.new_marks = log_parser.iterations
+        outcome.new_events = log_parser.cache_events
+        run_id, iter_id = log_parser.context
+        outcome.checkpoint = _new_checkpoint(
+            path,
+            "marker",
+            st,
+            lines.offset,
+            fstate.line_no,
+            {
+                "run_id": run_id,
+                "iter_id": iter_id,
+                "cache_scope": log_parser.cache_scope,
+                "active": [tool_call_to_row(tc) for tc in fstate.active.values()],
+                "rolling_tail": list(fstate.rolling_tail),
+            },
+        )
+
+    outcome.open_calls = list(log_parser.flush_active(fstate))
+    outcome.result.run_id, outcome.result.iter_id = log_parser.context
+    outcome.result.cache_scope = log_parser.cache_scope
+    _tag_source(outcome, ToolSource.SHELL_MARKER)
+    return outcome
+
+
+def _ingest_rovodev_file(
+    path: Path, checkpoint: Optional[Checkpoint]
+) -> _IngestOutcome:
+    """Parse the unread tail of a RovoDev log. Archives are parsed whole."""
+    st = path.stat()
+    mode = _can_resume(st, checkpoint, "rovodev")
+    # Undecoded args are stored as they are (see tool_call_to_row)
+    rovodev_parser = RovoDevParser(lazy_args=True)
+    outcome = _IngestOutcome(result=FileResult(path=path), reset=mode == "full")
+
+    if path.suffix == ".gz":
+        # Rotated archives never grow: parse once, keep everything
+        if mode != "unchanged":
+            outcome.new_calls = list(rovodev_parser.parse_file(path))
+            outcome.checkpoint = _new_checkpoint(path, "rovodev", st, st.st_size, 0, {})
+        _tag_source(outcome, ToolSource.ROVODEV)
+        return outcome
+
+    if mode != "full":
+        rovodev_parser.import_pending(checkpoint.state)
+    offset = checkpoint.offset if mode != "full" else 0
+
+    final = _settled_tail(st, checkpoint, mode)
+    if mode != "unchanged" or final:
+        lines = _AppendedLines(path, offset, final=final)
+        try:
+            outcome.new_calls = list(
+                rovodev_parser.parse_lines(
+                    lines, path, resume=mode != "full", finalize=False
+                )
+            )
+        except Exception as e:
+            outcome.result.error = str(e)
+            return outcome
+        state = rovodev_parser.export_pending()
+        outcome.checkpoint = _new_checkpoint(
+            path, "rovodev", st, lines.offset, state["line_num"], state
+        )
+
+    outcome.open_calls = list(rovodev_parser.flush_pending(path))
+    _tag_source(outcome, ToolSource.ROVODEV)
+    return outcome
+
+
+def _ingest(
+    paths: list[Path],
+    store: CheckpointStore,
+    worker,
+    jobs: int,
+) -> Iterator[FileResult]:
+    """Run an incremental worker over files and merge with stored calls."""
+    checkpoints = [store.get(str(p)) for p in paths]
+
+    if jobs <= 1 or len(paths) <= 1:
+        outcomes: Iterable[_IngestOutcome] = map(worker, paths, checkpoints)
+        yield from _merge_outcomes(outcomes, store)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from _merge_outcomes(pool.map(worker, paths, checkpoints), store)
+
+
+def _merge_outcomes(
+    outcomes: Iterable[_IngestOutcome], store: CheckpointStore
+) -> Iterator[FileResult]:
+    for outcome in outcomes:
+        result = outcome.result
+        path = str(result.path)
+        stored = [] if outcome.reset else store.load_calls(path)
+        stored_marks = [] if outcome.reset else store.load_marks(path)
+        stored_events = [] if outcome.reset else store.load_cache_events(path)
+        if outcome.checkpoint is not None:
+            store.save(
+                outcome.checkpoint,
+                outcome.new_calls,
+                reset=outcome.reset,
+                new_marks=outcome.new_marks,
+                new_events=outcome.new_events,
+            )
+        result.tool_calls = stored + outcome.new_calls + outcome.open_calls
+        result.iterations = stored_marks + outcome.new_marks
+        result.cache_events = stored_events + outcome.new_events
+        yield result
+
+
+def ingest_log_files(
+    paths: list[Path], store: CheckpointStore, jobs: int = 1
+) -> Iterator[FileResult]:
+    """Incrementally parse Ralph logs with the marker parser.
+
+    Only bytes appended since the last checkpoint are parsed; earlier calls,
+    ITER/PHASE marks and CACHE_* events come from the store. Results match
+    ``parse_log_files(paths, "marker")`` except that a marker wrapped across
+    a checkpoint boundary is not rejoined, and a last line without a newline
+    is only parsed once the file has stayed unchanged for a run.
+
+    Args:
+        paths: Log files, in the order their calls should be reported
+        store: Checkpoint store (written as files are consumed)
+        jobs: Worker processes (1 = parse in-process)
+    """
+    yield from _carry_context(_ingest(paths, store, _ingest_marker_file, jobs))
+
+
+def ingest_rovodev_files(
+    paths: list[Path], store: CheckpointStore, jobs: int = 1
+) -> Iterator[FileResult]:
+    """Incrementally parse RovoDev logs (see ``ingest_log_files``)."""
+    yield from _ingest(paths, store, _ingest_rovodev_file, jobs)
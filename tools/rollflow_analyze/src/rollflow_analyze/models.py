@@ -1,9 +1,12 @@
 """Data models for RollFlow log analysis."""
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Optional, Sequence
+
+from .sketch import DurationSketch
 
 
 class ToolStatus(Enum):
@@ -22,9 +25,24 @@ class ToolSource(Enum):
     HEURISTIC = "heuristic"  # Inferred from log patterns
 
 
-@dataclass
+# __slots__ drops the per-instance __dict__ (dataclass slots need 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class ToolCall:
-    """Represents a single tool call extracted from logs."""
+    """Represents a single tool call extracted from logs.
+
+    Slotted to keep large reports small; see ``table.ToolCallTable`` for a
+    columnar container when even that is too much.
+
+    Records are mutable and finished in place: MarkerParser's
+    ``_on_tool_end`` / ``_on_tool_call_end`` pop the instance opened at START
+    and set its status, end time and duration, ingest stamps ``source``,
+    and ``resolve_args_excerpt`` fills ``args_excerpt``. Do not key caches
+    on a call's fields or hash, and do not share one instance between
+    results; copy it (``dataclasses.replace``) instead.
+    """
 
     id: str
     tool_name: str
@@ -41,6 +59,57 @@ class ToolCall:
     line_range: Optional[tuple[int, int]] = None
     run_id: Optional[str] = None
     iter_id: Optional[str] = None
+    # Undecoded RovoDev args JSON (lazy-args mode); args_excerpt is derived from
+    # it on demand. Never serialized.
+    args_raw: Optional[str] = field(
+        default=None, repr=False, metadata={"serialize": False}
+    )
+
+
+@dataclass
+class Phase:
+    """One :::PHASE_START:::/:::PHASE_END::: span within an iteration."""
+
+    name: str  # "plan", "build" or "custom"
+    start_ts: Optional[datetime] = None
+    end_ts: Optional[datetime] = None
+    duration_ms: Optional[int] = None
+    status: Optional[str] = None  # "ok" or "fail" from PHASE_END
+    exit_code: Optional[int] = None
+
+
+@dataclass
+class TimelineGap:
+    """A stretch of an iteration with no tool call running."""
+
+    start_ts: datetime
+    duration_ms: int
+
+
+@dataclass
+class IterationTimeline:
+    """Where an iteration's wall time went (see ``timeline.analyze_timeline``).
+
+    ``idle_ms`` is wall time with no tool call running: LLM thinking, loop
+    overhead and anything not wrapped in markers. ``overlap_ms`` is tool time
+    that ran concurrently with other tool time. The critical path is the
+    longest chain of calls that ran one after another, i.e. the part of the
+    iteration that parallelizing the rest would not shorten.
+    """
+
+    wall_ms: int = 0
+    tool_ms: int = 0
+    busy_ms: int = 0
+    idle_ms: int = 0
+    overlap_ms: int = 0
+    max_concurrency: int = 0
+    overlapping_calls: int = 0
+    timed_calls: int = 0
+    untimed_calls: int = 0
+    tool_ms_by_tool: dict[str, int] = field(default_factory=dict)
+    longest_gaps: list[TimelineGap] = field(default_factory=list)
+    critical_path_ms: int = 0
+    critical_path: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -49,13 +118,20 @@ class Iteration:
 
     iter_num: int
     run_id: Optional[str] = None
+    # Iteration id as written in the markers (None = not known in this file)
+    iter_id: Optional[str] = field(default=None, metadata={"serialize": False})
     phase: Optional[str] = None  # "plan" or "build"
     start_ts: Optional[datetime] = None
     end_ts: Optional[datetime] = None
     duration_ms: Optional[int] = None
-    tool_calls: list[ToolCall] = field(default_factory=list)
+    # Already listed in Report.tool_calls (with iter_id), so never serialized
+    tool_calls: list[ToolCall] = field(
+        default_factory=list, metadata={"serialize": False}
+    )
     task_id: Optional[str] = None
     commit_sha: Optional[str] = None
+    phases: list[Phase] = field(default_factory=list)
+    timeline: Optional[IterationTimeline] = None
 
     @property
     def tool_count(self) -> int:
@@ -70,6 +146,63 @@ class Iteration:
         return counts
 
 
+@dataclass(**_SLOTS)
+class CacheEvent:
+    """One cache marker from a Ralph log.
+
+    ``kind`` is "hit" or "miss" for a pass-cache lookup (:::CACHE_HIT:::,
+    :::CACHE_MISS:::), "guard" for a :::CACHE_GUARD::: decision on whether
+    to look up at all, and "config" for the :::CACHE_CONFIG::: in effect.
+    """
+
+    kind: str
+    ts: Optional[datetime] = None
+    cache_key: Optional[str] = None
+    tool_name: Optional[str] = None
+    # CACHE_MODE (config events) and CACHE_SCOPE (set by the config event,
+    # in effect for the others; None = no config seen yet)
+    mode: Optional[str] = None
+    scope: Optional[str] = None
+    # Duration of the cached PASS that a hit skipped
+    saved_ms: Optional[int] = None
+    # Guard events
+    allowed: Optional[bool] = None
+    reason: Optional[str] = None
+    phase: Optional[str] = None
+    run_id: Optional[str] = None
+    iter_id: Optional[str] = None
+    log_file: Optional[str] = None
+
+
+@dataclass
+class CacheHitRate:
+    """Measured lookups for one tool under one CACHE_SCOPE."""
+
+    tool_name: str
+    scope: Optional[str] = None
+    lookups: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    time_saved_ms: int = 0
+
+
+@dataclass
+class CacheTelemetry:
+    """Cache behaviour measured from CACHE_* markers (cf. CacheAdvice)."""
+
+    lookups: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    time_saved_ms: int = 0
+    guard_checks: int = 0
+    guard_blocked: int = 0
+    # "<PHASE>/<reason>" -> lookups the guard skipped
+    guard_blocked_by_reason: dict[str, int] = field(default_factory=dict)
+    by_tool_scope: list[CacheHitRate] = field(default_factory=list)
+
+
 @dataclass
 class CacheAdvice:
     """Cache optimization recommendations."""
@@ -80,6 +213,23 @@ class CacheAdvice:
     duplicate_keys: list[str] = field(default_factory=list)
 
 
+@dataclass
+class FlakyKey:
+    """Flip-rate statistics of one (tool, cache_key) over its recent calls."""
+
+    tool_name: str
+    cache_key: str
+    calls: int = 0
+    # Calls in the sliding window the flips are counted over
+    window_calls: int = 0
+    flips: int = 0
+    flip_rate: float = 0.0
+    # Flip rate shrunk towards 0 for short windows; used for ranking
+    score: float = 0.0
+    total_flips: int = 0
+    last_status: ToolStatus = ToolStatus.UNKNOWN
+
+
 @dataclass
 class Aggregates:
     """Aggregate statistics for tool calls."""
@@ -92,7 +242,10 @@ class Aggregates:
     fail_rate: float = 0.0
     top_failures_by_tool: dict[str, int] = field(default_factory=dict)
     slowest_tools: list[tuple[str, int]] = field(default_factory=list)
+    # Tools whose results flipped for the same cache key, most flaky first
     flakiest_tools: list[str] = field(default_factory=list)
+    flaky_keys: list[FlakyKey] = field(default_factory=list)
+    flakiness_window: int = 0
 
 
 @dataclass
@@ -105,8 +258,15 @@ class ToolBreakdown:
     avg_duration_ms: float = 0.0
     min_duration_ms: Optional[int] = None
     max_duration_ms: Optional[int] = None
+    p50_duration_ms: Optional[float] = None
+    p90_duration_ms: Optional[float] = None
+    p99_duration_ms: Optional[float] = None
     pass_count: int = 0
     fail_count: int = 0
+    # Mergeable sketch the percentiles were read from. Never serialized.
+    duration_sketch: Optional[DurationSketch] = field(
+        default=None, repr=False, compare=False, metadata={"serialize": False}
+    )
 
 
 @dataclass
@@ -115,7 +275,8 @@ class Report:
 
     generated_at: datetime = field(default_factory=datetime.now)
     run_id: Optional[str] = None
-    tool_calls: list[ToolCall] = field(default_factory=list)
+    # A list, or a table.ToolCallTable for very large reports
+    tool_calls: Sequence[ToolCall] = field(default_factory=list)
     iterations: list[Iteration] = field(default_factory=list)
     aggregates: Aggregates = field(default_factory=Aggregates)
     cache_advice: CacheAdvice = field(default_factory=CacheAdvice)
@@ -124,3 +285,7 @@ class Report:
     # RovoDev-specific stats
     rovodev_tool_calls: int = 0
     shell_marker_calls: int = 0
+
+    # Measured from CACHE_* markers; None when the logs had none. Last, so
+    # the JSON keys of older reports keep their order.
+    cache_telemetry: Optional[CacheTelemetry] = None
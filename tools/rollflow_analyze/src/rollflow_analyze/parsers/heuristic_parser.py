@@ -1,12 +1,18 @@
 """Heuristic parser for logs without explicit markers."""
 
+import gzip
 import re
 import uuid
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 
 import yaml
 
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_parse
+
 from ..models import ToolCall, ToolStatus
 
 # Default patterns for common log formats
@@ -46,6 +52,127 @@ DEFAULT_PATTERNS = {
 }
 
 
+# Group syntax that names a group; renamed per alternative when combining
+RE_GROUP_REF = re.compile(r"(\(\?P<|\(\?P=|\(\?\()([A-Za-z_]\w*)")
+
+# Numbered backreferences/conditionals would shift when patterns are combined
+RE_NUMBERED_REF = re.compile(r"\\[1-9]|\(\?\(\d")
+
+
+def _combine(patterns: list[re.Pattern]) -> re.Pattern | None:
+    """Compile patterns into one alternation, one wrapper group per pattern.
+
+    Returns None when the patterns can't be combined safely (numbered
+    backreferences, misplaced inline flags, ...); callers then fall back to
+    trying each pattern in turn.
+    """
+    parts = []
+    for i, pattern in enumerate(patterns):
+        if RE_NUMBERED_REF.search(pattern.pattern):
+            return None
+        # Same group name in several patterns is an error in one regex
+        body = RE_GROUP_REF.sub(rf"\1_{i}_\2", pattern.pattern)
+        parts.append(f"(?P<_alt{i}>{body})")
+    try:
+        return re.compile("|".join(parts), re.IGNORECASE)
+    except re.error:
+        return None
+
+
+def _required_literals(items) -> frozenset[str] | None:
+    """Lower-cased strings, one of which every match must contain.
+
+    Walks a parsed regex sequence and picks the best-constrained candidate:
+    a run of literal characters, or an alternation whose every branch has
+    one. Returns None when nothing is guaranteed.
+    """
+    best: frozenset[str] | None = None
+    best_len = 0
+
+    def consider(candidates: frozenset[str] | None) -> None:
+        nonlocal best, best_len
+        if not candidates:
+            return
+        shortest = min(len(c) for c in candidates)
+        # Cased non-ASCII text can match other characters under IGNORECASE
+        if shortest > best_len and all(
+            c.isascii() or c.lower() == c.upper() for c in "".join(candidates)
+        ):
+            best, best_len = candidates, shortest
+
+    run: list[str] = []
+    for op, av in list(items) + [(None, None)]:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            consider(frozenset(["".join(run).lower()]))
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op is sre_parse.BRANCH:
+            branches = [_required_literals(b) for b in av[1]]
+            if all(branches):
+                consider(frozenset().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            consider(_required_literals(av[2]))
+    return best
+
+
+def _prefilter_literals(patterns: list[re.Pattern]) -> frozenset[str] | None:
+    """Literals at least one of which any match of any pattern contains."""
+    literals: set[str] = set()
+    for pattern in patterns:
+        try:
+            required = _required_literals(
+                sre_parse.parse(pattern.pattern, pattern.flags)
+            )
+        except re.error:
+            required = None
+        if required is None:
+            return None
+        literals |= required
+    return frozenset(literals)
+
+
+class _CategoryMatcher:
+    """One pattern category, searched with a single combined regex.
+
+    ``search`` returns exactly what trying each pattern in list order would:
+    the first pattern (in config order) that matches anywhere in the line.
+    """
+
+    def __init__(self, patterns: list[re.Pattern]):
+        self.patterns = patterns
+        self.combined = _combine(patterns) if len(patterns) > 1 else None
+
+    def search(self, line: str) -> re.Match | None:
+        """Match of the first pattern that matches the line, or None."""
+        if self.combined is None:
+            for pattern in self.patterns:
+                if match := pattern.search(line):
+                    return match
+            return None
+
+        match = self.combined.search(line)
+        if match is None:
+            return None
+        # Leftmost match overall; patterns listed before it can only match
+        # further right, but still take priority
+        pos = match.start()
+        index = int(match.lastgroup[4:])
+        for pattern in self.patterns[:index]:
+            if earlier := pattern.search(line, pos + 1):
+                return earlier
+        return self.patterns[index].match(line, pos)
+
+    def matches(self, line: str) -> bool:
+        """Whether any pattern matches the line."""
+        if self.combined is None:
+            return any(p.search(line) for p in self.patterns)
+        return self.combined.search(line) is not None
+
+
 class HeuristicParser:
     """Parse logs using regex heuristics when markers aren't available."""
 
@@ -67,6 +194,13 @@ class HeuristicParser:
             self.patterns = self._auto_load_config()
 
         self._compiled = self._compile_patterns()
+        self._matchers = {
+            category: _CategoryMatcher(patterns)
+            for category, patterns in self._compiled.items()
+        }
+        self._prefilter = _prefilter_literals(
+            [p for patterns in self._compiled.values() for p in patterns]
+        )
 
     def _auto_load_config(self) -> dict:
         """Auto-discover patterns.yaml in config directory, fallback to defaults."""
@@ -152,19 +286,44 @@ class HeuristicParser:
     def parse_file(self, log_path: Path) -> Iterator[ToolCall]:
         """Parse a log file using heuristic patterns.
 
+        The file is streamed line by line, so memory use stays bounded
+        regardless of log size. ``.gz`` files are decompressed on the fly.
+
         Args:
             log_path: Path to log file
 
+        Yields:
+            ToolCall objects detected heuristically
+        """
+        opener = gzip.open if Path(log_path).suffix == ".gz" else open
+        with opener(log_path, "rt", encoding="utf-8", errors="replace") as f:
+            yield from self.parse_lines(f, log_path)
+
+    def parse_lines(self, lines: Iterable[str], log_path: Path) -> Iterator[ToolCall]:
+        """Parse an iterable of log lines using heuristic patterns.
+
+        Works on any source of text lines (an open file, ``sys.stdin``, a
+        decompressed or followed stream) and holds only the current call.
+
+        Args:
+            lines: Log lines (trailing newlines are optional)
+            log_path: Log file the lines came from, recorded on each ToolCall
+
         Yields:
             ToolCall objects detected heuristically
         """
         current_tool: ToolCall | None = None
         start_line = 0
+        line_num = 0
 
-        with open(log_path, "r", encoding="utf-8", errors="replace") as f:
-            lines = f.readlines()
-
+        prefilter = self._prefilter
         for line_num, line in enumerate(lines, 1):
+            # Skip lines without any literal some pattern requires
+            if prefilter is not None and line.isascii():
+                lowered = line.lower()
+                if not any(lit in lowered for lit in prefilter):
+                    continue
+
             # Look for tool start
             tool_name = self._match_tool_start(line)
             if tool_name:
@@ -201,34 +360,38 @@ class HeuristicParser:
 
         # Yield final tool
         if current_tool:
-            current_tool.line_range = (start_line, len(lines))
+            current_tool.line_range = (start_line, line_num)
             yield current_tool
 
+    def _search(self, category: str, line: str) -> re.Match | None:
+        """First match in a category (see ``_CategoryMatcher.search``)."""
+        matcher = self._matchers.get(category)
+        return matcher.search(line) if matcher else None
+
     def _match_tool_start(self, line: str) -> str | None:
         """Check if line matches tool start pattern."""
-        for pattern in self._compiled.get("tool_start", []):
-            if match := pattern.search(line):
-                return match.group("name")
+        if match := self._search("tool_start", line):
+            return match.group("name")
         return None
 
     def _match_pass(self, line: str) -> bool:
         """Check if line indicates success."""
-        return any(p.search(line) for p in self._compiled.get("tool_pass", []))
+        matcher = self._matchers.get("tool_pass")
+        return matcher is not None and matcher.matches(line)
 
     def _match_fail(self, line: str) -> bool:
         """Check if line indicates failure."""
-        return any(p.search(line) for p in self._compiled.get("tool_fail", []))
+        matcher = self._matchers.get("tool_fail")
+        return matcher is not None and matcher.matches(line)
 
     def _extract_exit_code(self, line: str) -> int | None:
         """Extract exit code from line."""
-        for pattern in self._compiled.get("exit_code", []):
-            if match := pattern.search(line):
-                return int(match.group("code"))
+        if match := self._search("exit_code", line):
+            return int(match.group("code"))
         return None
 
     def _extract_error(self, line: str) -> str | None:
         """Extract error message from line."""
-        for pattern in self._compiled.get("error_msg", []):
-            if match := pattern.search(line):
-                return match.group("msg")
+        if match := self._search("error_msg", line):
+            return match.group("msg")
         return None
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import re
+from collections import deque
 from dataclasses import replace
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 
-from ..models import ToolCall, ToolStatus
+from ..models import CacheEvent, Iteration, Phase, ToolCall, ToolStatus
 
 MARKER_PREFIXES = (
     "::RUN::",
@@ -28,23 +29,18 @@ MARKER_PREFIXES = (
     ":::CACHE_CONFIG:::",
 )
 
-RE_RUN = re.compile(r"^::RUN::\s+(?P<kv>.+)$")
-RE_ITER = re.compile(r"^::ITER::\s+(?P<kv>.+)$")
-RE_START = re.compile(r"^::TOOL_CALL_START::\s+(?P<kv>.+)$")
-RE_END = re.compile(r"^::TOOL_CALL_END::\s+(?P<kv>.+)$")
-
-# New triple-colon markers from loop.sh
-RE_TOOL_START = re.compile(r"^:::TOOL_START:::\s+(?P<kv>.+)$")
-RE_TOOL_END = re.compile(r"^:::TOOL_END:::\s+(?P<kv>.+)$")
-RE_ITER_START = re.compile(r"^:::ITER_START:::\s+(?P<kv>.+)$")
-RE_ITER_END = re.compile(r"^:::ITER_END:::\s+(?P<kv>.+)$")
-RE_PHASE_START = re.compile(r"^:::PHASE_START:::\s+(?P<kv>.+)$")
-RE_PHASE_END = re.compile(r"^:::PHASE_END:::\s+(?P<kv>.+)$")
-RE_CACHE_GUARD = re.compile(r"^:::CACHE_GUARD:::\s+(?P<kv>.+)$")
-RE_VERIFIER_ENV = re.compile(r"^:::VERIFIER_ENV:::\s+(?P<kv>.+)$")
-RE_CACHE_HIT = re.compile(r"^:::CACHE_HIT:::\s+(?P<kv>.+)$")
-RE_CACHE_MISS = re.compile(r"^:::CACHE_MISS:::\s+(?P<kv>.+)$")
-RE_CACHE_CONFIG = re.compile(r"^:::CACHE_CONFIG:::\s+(?P<kv>.+)$")
+# One alternation over every known marker. A single match both recognises a
+# marker line and yields the dispatch key for MarkerParser._handlers.
+RE_MARKER = re.compile("|".join(re.escape(p) for p in MARKER_PREFIXES))
+
+# Payload following a recognised marker (applied at the end of the match)
+RE_MARKER_KV = re.compile(r"\s+(?P<kv>.+)$")
+
+# Upper bound on continuation lines buffered for a single marker block.
+# Wrapped markers only spill a field or two onto the next line, so this keeps
+# the lookahead buffer bounded even when a marker is followed by a long run of
+# non-empty tool output.
+MAX_BLOCK_CONTINUATION_LINES = 64
 
 
 def _parse_kv_blob(kv_blob: str) -> dict[str, str]:
@@ -61,40 +57,77 @@ def _parse_kv_blob(kv_blob: str) -> dict[str, str]:
     return out
 
 
-def _read_marker_block(lines: list[str], i: int) -> tuple[str, int]:
+def _iter_lines(path: Path) -> Iterator[str]:
+    """Yield lines from a log file without loading it into memory.
+
+    Produces the same sequence as ``path.read_text().splitlines(keepends=True)``
+    (universal newlines, plus the extra separators ``str.splitlines`` honours).
+    """
+    with open(path, errors="replace") as f:
+        for raw in f:
+            yield from raw.splitlines(keepends=True)
+
+
+def _read_marker_block(first: str, lookahead: deque[str], lines: Iterator[str]) -> str:
     """Read a marker block that may span multiple lines.
 
     Marker blocks can be split across multiple lines (e.g. ts=... on next line).
     We treat consecutive non-empty lines that do NOT start with another marker
     as part of the same block.
 
-    Returns: (block_text, next_index)
+    Continuation lines are peeked, not consumed: anything pulled from ``lines``
+    is pushed onto ``lookahead`` so the caller still processes it as a regular
+    line afterwards.
+
+    Returns: block_text
     """
-    first = lines[i].rstrip("\n")
-    buf = [first]
-    j = i + 1
-    while j < len(lines):
-        nxt = lines[j].rstrip("\n")
+    buf = [first.rstrip("\n")]
+    j = 0
+    while j < MAX_BLOCK_CONTINUATION_LINES:
+        if j < len(lookahead):
+            nxt = lookahead[j]
+        else:
+            nxt = next(lines, None)
+            if nxt is None:
+                break
+            lookahead.append(nxt)
+        nxt = nxt.rstrip("\n")
         if not nxt:
             break
-        if any(nxt.startswith(p) for p in MARKER_PREFIXES):
+        if nxt.startswith("::") and RE_MARKER.match(nxt):
             break
         # continuation line (like "ts=..." wrapped to next line)
         buf.append(nxt.strip())
         j += 1
-    return " ".join(buf), j
+    return " ".join(buf)
 
 
 def _parse_timestamp(ts_str: str | None) -> datetime | None:
-    """Parse ISO timestamp string."""
+    """Parse an ISO timestamp, or epoch milliseconds as loop.sh writes them.
+
+    ITER/PHASE markers carry ``ts=$(date +%s%N)/1000000``; those are returned
+    as UTC datetimes, like the ``...Z`` timestamps on TOOL markers.
+    """
     if not ts_str:
         return None
+    if ts_str.isdigit():
+        return datetime.fromtimestamp(int(ts_str) / 1000, timezone.utc)
     try:
         return datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
     except (ValueError, AttributeError):
         return None
 
 
+def _duration_ms(start: datetime | None, end: datetime | None) -> int | None:
+    """Milliseconds from start to end, if both are known and comparable."""
+    if start is None or end is None:
+        return None
+    try:
+        return round((end - start).total_seconds() * 1000)
+    except TypeError:  # naive vs aware
+        return None
+
+
 def _safe_int(v: str | None) -> int | None:
     """Safely convert string to int."""
     if v is None:
@@ -114,341 +147,510 @@ def _status_from_str(s: str | None) -> ToolStatus:
     return ToolStatus.UNKNOWN
 
 
+class MarkerFileState:
+    """Per-file parse state shared by the marker handlers.
+
+    Passing the state of a previous ``parse_lines(..., finalize=False)`` call
+    back in resumes parsing where it stopped (see ``ingest.ingest_log_files``).
+    """
+
+    __slots__ = ("log_file", "line_no", "active", "rolling_tail")
+
+    def __init__(
+        self,
+        log_file: str,
+        line_no: int = 0,
+        active: dict[str, ToolCall] | None = None,
+        rolling_tail: Iterable[str] = (),
+    ):
+        self.log_file = log_file
+        # Number of lines consumed so far
+        self.line_no = line_no
+        # Active tool calls by id
+        self.active: dict[str, ToolCall] = active if active is not None else {}
+        # Rolling excerpt buffer for unknown/missing END
+        self.rolling_tail: deque[str] = deque(rolling_tail, maxlen=50)
+
+    def tail_excerpt(self) -> str | None:
+        """Last 10 non-marker lines, or None if nothing was seen yet."""
+        if not self.rolling_tail:
+            return None
+        return "\n".join(list(self.rolling_tail)[-10:])
+
+
 class MarkerParser:
-    """Parse logs containing explicit tool call markers."""
+    """Parse logs containing explicit tool call markers.
+
+    The run/iteration context set by ``::RUN::``, ``::ITER::`` and
+    ``:::ITER_START:::`` carries over from one ``parse_file`` call to the next,
+    so a parser reused across files in order attributes calls at the top of a
+    file to the iteration opened at the end of the previous one.
+
+    ``:::ITER_START:::``/``:::ITER_END:::`` and ``:::PHASE_START:::``/
+    ``:::PHASE_END:::`` markers are collected into ``iterations``. An
+    iteration split across files yields one partial Iteration per parser;
+    ``timeline.build_iterations`` joins them.
+
+    ``:::CACHE_HIT:::``, ``:::CACHE_MISS:::``, ``:::CACHE_GUARD:::`` and
+    ``:::CACHE_CONFIG:::`` markers are appended to ``cache_events`` in log
+    order (see ``cache_telemetry``), each with the CACHE_SCOPE of the latest
+    :::CACHE_CONFIG::: so far.
+    """
 
-    def __init__(self):
-        """Initialize marker parser."""
-        self._current_run_id: str | None = None
-        self._current_iter_id: str | None = None
+    def __init__(
+        self,
+        run_id: str | None = None,
+        iter_id: str | None = None,
+        cache_scope: str | None = None,
+    ):
+        """Initialize marker parser.
+
+        Args:
+            run_id: Run context to start from (e.g. carried from a prior file)
+            iter_id: Iteration context to start from
+            cache_scope: CACHE_SCOPE to start from
+        """
+        self._current_run_id: str | None = run_id
+        self._current_iter_id: str | None = iter_id
+        self.cache_scope: str | None = cache_scope
+        # (run_id, iter) -> Iteration built from ITER/PHASE markers
+        self._iterations: dict[tuple[str | None, str | None], Iteration] = {}
+        self.cache_events: list[CacheEvent] = []
+
+        # Marker -> handler. Informational markers map to None and are skipped
+        # without decoding their payload.
+        self._handlers = {
+            "::RUN::": self._on_run,
+            "::ITER::": self._on_iter,
+            "::TOOL_CALL_START::": self._on_tool_call_start,
+            "::TOOL_CALL_END::": self._on_tool_call_end,
+            ":::TOOL_START:::": self._on_tool_start,
+            ":::TOOL_END:::": self._on_tool_end,
+            ":::ITER_START:::": self._on_iter_start,
+            ":::ITER_END:::": self._on_iter_end,
+            ":::PHASE_START:::": self._on_phase_start,
+            ":::PHASE_END:::": self._on_phase_end,
+            ":::CACHE_GUARD:::": self._on_cache_guard,
+            ":::VERIFIER_ENV:::": None,
+            ":::CACHE_HIT:::": self._on_cache_hit,
+            ":::CACHE_MISS:::": self._on_cache_miss,
+            ":::CACHE_CONFIG:::": self._on_cache_config,
+        }
+
+    @property
+    def context(self) -> tuple[str | None, str | None]:
+        """Current (run_id, iter_id) context."""
+        return self._current_run_id, self._current_iter_id
+
+    @property
+    def iterations(self) -> list[Iteration]:
+        """Iterations seen in ITER/PHASE markers so far, in order of appearance.
+
+        ``tool_calls`` is left empty; calls are matched to iterations by
+        ``timeline.build_iterations``.
+        """
+        return list(self._iterations.values())
 
     def parse_file(self, path: Path) -> Iterator[ToolCall]:
         """Parse a single log file for tool calls.
 
+        The file is streamed line by line, so memory use stays bounded
+        regardless of log size.
+
         Args:
             path: Path to log file
 
         Yields:
             ToolCall objects for each complete START/END pair
         """
-        text = path.read_text(errors="replace")
-        lines = text.splitlines(keepends=True)
-
-        # Active tool calls by id
-        active: dict[str, ToolCall] = {}
+        yield from self.parse_lines(_iter_lines(path), path)
 
-        # Rolling excerpt buffer for unknown/missing END
-        rolling_tail: list[str] = []
+    def parse_lines(
+        self,
+        lines: Iterable[str],
+        path: Path,
+        state: MarkerFileState | None = None,
+        finalize: bool = True,
+    ) -> Iterator[ToolCall]:
+        """Parse an iterable of log lines for tool calls.
 
-        for idx in range(len(lines)):
-            line = lines[idx].rstrip("\n")
+        Args:
+            lines: Log lines (trailing newlines are optional)
+            path: Log file the lines came from, recorded on each ToolCall
+            state: State to resume from; updated in place as lines are read
+            finalize: Emit calls still open at the end as UNKNOWN. Pass False
+                when more lines may be appended later; they stay in
+                ``state.active``.
 
-            # Update rolling tail (for error excerpts)
-            if line and not line.startswith("::"):
-                rolling_tail.append(line)
-                if len(rolling_tail) > 50:
-                    rolling_tail.pop(0)
+        Yields:
+            ToolCall objects for each complete START/END pair
+        """
+        line_iter = iter(lines)
+        if state is None:
+            state = MarkerFileState(str(path))
+        handlers = self._handlers
+
+        # Lines already pulled from line_iter while reading a marker block
+        lookahead: deque[str] = deque()
+
+        idx = state.line_no
+        while True:
+            if lookahead:
+                raw = lookahead.popleft()
+            else:
+                raw = next(line_iter, None)
+                if raw is None:
+                    break
+            idx += 1
+            state.line_no = idx
+            line = raw.rstrip("\n")
 
             if not line.startswith("::"):
+                # Update rolling tail (for error excerpts)
+                if line:
+                    state.rolling_tail.append(line)
                 continue
 
-            # Handle multi-line marker blocks
-            if not any(line.startswith(p) for p in MARKER_PREFIXES):
+            m = RE_MARKER.match(line)
+            if not m:
                 continue
 
-            block, _next_i = _read_marker_block(lines, idx)
-
-            if block.startswith("::RUN::"):
-                m = RE_RUN.match(block)
-                if m:
-                    kv = _parse_kv_blob(m.group("kv"))
-                    self._current_run_id = kv.get("id", self._current_run_id)
+            handler = handlers[m.group()]
+            if handler is None:
                 continue
 
-            if block.startswith("::ITER::"):
-                m = RE_ITER.match(block)
-                if m:
-                    kv = _parse_kv_blob(m.group("kv"))
-                    self._current_iter_id = kv.get("id", self._current_iter_id)
-                    self._current_run_id = kv.get("run_id", self._current_run_id)
-                continue
-
-            # Handle :::ITER_START::: (new triple-colon format)
-            if block.startswith(":::ITER_START:::"):
-                m = RE_ITER_START.match(block)
-                if m:
-                    kv = _parse_kv_blob(m.group("kv"))
-                    self._current_iter_id = kv.get("iter", self._current_iter_id)
-                    self._current_run_id = kv.get("run_id", self._current_run_id)
-                continue
-
-            # Handle :::ITER_END::: (informational, update context if needed)
-            if block.startswith(":::ITER_END:::"):
-                # Just parse for consistency, don't change state
-                continue
-
-            # Handle :::PHASE_START::: (informational, could track phase context)
-            if block.startswith(":::PHASE_START:::"):
-                # Just parse for consistency, could extend to track current phase
-                continue
-
-            # Handle :::PHASE_END::: (informational)
-            if block.startswith(":::PHASE_END:::"):
-                # Just parse for consistency
-                continue
-
-            # Handle :::CACHE_GUARD::: (informational)
-            if block.startswith(":::CACHE_GUARD:::"):
-                # Just parse for consistency, no action needed
-                continue
-
-            # Handle :::VERIFIER_ENV::: (informational)
-            if block.startswith(":::VERIFIER_ENV:::"):
-                # Just parse for consistency
+            # Handle multi-line marker blocks
+            block = _read_marker_block(line, lookahead, line_iter)
+            m = RE_MARKER_KV.match(block, m.end())
+            if not m:
                 continue
 
-            # Handle :::CACHE_HIT::: (informational)
-            if block.startswith(":::CACHE_HIT:::"):
-                # Just parse for consistency
-                continue
+            tc = handler(_parse_kv_blob(m.group("kv")), idx, state)
+            if tc is not None:
+                yield tc
 
-            # Handle :::CACHE_MISS::: (informational)
-            if block.startswith(":::CACHE_MISS:::"):
-                # Just parse for consistency
-                continue
+        if finalize:
+            yield from self.flush_active(state)
 
-            # Handle :::CACHE_CONFIG::: (informational)
-            if block.startswith(":::CACHE_CONFIG:::"):
-                # Just parse for consistency
-                continue
+    def flush_active(self, state: MarkerFileState) -> Iterator[ToolCall]:
+        """Yield calls that never ended as UNKNOWN, with the log tail attached."""
+        for tc in state.active.values():
+            yield replace(
+                tc,
+                status=ToolStatus.UNKNOWN,
+                error_excerpt=state.tail_excerpt(),
+            )
 
-            # Handle :::TOOL_START::: (new triple-colon format)
-            if block.startswith(":::TOOL_START:::"):
-                m = RE_TOOL_START.match(block)
-                if not m:
-                    continue
-                kv = _parse_kv_blob(m.group("kv"))
-
-                call_id = kv.get("id")
-                if not call_id:
-                    continue
-
-                tc = ToolCall(
-                    id=call_id,
-                    tool_name=kv.get("tool", "unknown"),
-                    status=ToolStatus.UNKNOWN,
-                    exit_code=None,
-                    start_ts=_parse_timestamp(kv.get("ts")),
-                    end_ts=None,
-                    duration_ms=None,
-                    cache_key=kv.get("cache_key"),
-                    args_excerpt=None,
-                    error_excerpt=None,
-                    log_file=str(path),
-                    line_range=(idx + 1, idx + 1),  # Will update end on END marker
-                    run_id=self._current_run_id,
-                    iter_id=self._current_iter_id,
-                )
-                active[call_id] = tc
-                continue
+    def _on_run(self, kv: dict[str, str], idx: int, state: MarkerFileState) -> None:
+        """Handle ::RUN:: (sets run context)."""
+        self._current_run_id = kv.get("id", self._current_run_id)
+
+    def _on_iter(self, kv: dict[str, str], idx: int, state: MarkerFileState) -> None:
+        """Handle ::ITER:: (sets iteration context)."""
+        self._current_iter_id = kv.get("id", self._current_iter_id)
+        self._current_run_id = kv.get("run_id", self._current_run_id)
+
+    def _on_iter_start(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::ITER_START::: (new triple-colon format)."""
+        self._current_iter_id = kv.get("iter", self._current_iter_id)
+        self._current_run_id = kv.get("run_id", self._current_run_id)
+        iteration = self._iteration(kv)
+        if iteration.start_ts is None:
+            iteration.start_ts = _parse_timestamp(kv.get("ts"))
+
+    def _on_iter_end(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::ITER_END::: (closes the iteration's wall-clock span)."""
+        iteration = self._iteration(kv)
+        iteration.end_ts = _parse_timestamp(kv.get("ts"))
+        iteration.duration_ms = _duration_ms(iteration.start_ts, iteration.end_ts)
+
+    def _on_phase_start(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::PHASE_START::: (opens a phase within the iteration)."""
+        iteration = self._iteration(kv)
+        name = kv.get("phase", "unknown")
+        iteration.phases.append(
+            Phase(name=name, start_ts=_parse_timestamp(kv.get("ts")))
+        )
+        iteration.phase = name
+
+    def _on_phase_end(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::PHASE_END::: (closes the latest open phase of that name)."""
+        iteration = self._iteration(kv)
+        name = kv.get("phase", "unknown")
+        phase = next(
+            (
+                p
+                for p in reversed(iteration.phases)
+                if p.name == name and p.end_ts is None
+            ),
+            None,
+        )
+        if phase is None:
+            # Started before this file (or log) began
+            phase = Phase(name=name)
+            iteration.phases.append(phase)
+            iteration.phase = name
+        phase.end_ts = _parse_timestamp(kv.get("ts"))
+        phase.duration_ms = _duration_ms(phase.start_ts, phase.end_ts)
+        phase.status = kv.get("status")
+        phase.exit_code = _safe_int(kv.get("code"))
+
+    def _on_cache_hit(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::CACHE_HIT::: (a lookup that skipped the tool)."""
+        self._add_cache_event("hit", kv, state, saved_ms=_safe_int(kv.get("saved_ms")))
+
+    def _on_cache_miss(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::CACHE_MISS::: (a lookup that found nothing usable)."""
+        self._add_cache_event("miss", kv, state)
+
+    def _on_cache_guard(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::CACHE_GUARD::: (allowed=0 means the lookup was skipped)."""
+        self._add_cache_event(
+            "guard",
+            kv,
+            state,
+            allowed=kv.get("allowed") != "0",
+            reason=kv.get("reason"),
+            phase=kv.get("phase"),
+        )
+
+    def _on_cache_config(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::CACHE_CONFIG::: (CACHE_MODE/CACHE_SCOPE for the iteration)."""
+        self.cache_scope = kv.get("scope", self.cache_scope)
+        self._add_cache_event("config", kv, state, mode=kv.get("mode"))
+
+    def _add_cache_event(
+        self, kind: str, kv: dict[str, str], state: MarkerFileState, **fields
+    ) -> None:
+        self.cache_events.append(
+            CacheEvent(
+                kind=kind,
+                ts=_parse_timestamp(kv.get("ts")),
+                cache_key=kv.get("cache_key"),
+                tool_name=kv.get("tool"),
+                run_id=kv.get("run_id", self._current_run_id),
+                iter_id=kv.get("iter", self._current_iter_id),
+                log_file=state.log_file,
+                scope=self.cache_scope,
+                **fields,
+            )
+        )
+
+    def _iteration(self, kv: dict[str, str]) -> Iteration:
+        """Iteration an ITER/PHASE marker belongs to, created on first sight."""
+        iter_id = kv.get("iter", self._current_iter_id)
+        run_id = kv.get("run_id", self._current_run_id)
+        iteration = self._iterations.get((run_id, iter_id))
+        if iteration is None:
+            iteration = Iteration(
+                iter_num=_safe_int(iter_id) or 0, run_id=run_id, iter_id=iter_id
+            )
+            self._iterations[(run_id, iter_id)] = iteration
+        return iteration
+
+    def _on_tool_start(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle :::TOOL_START::: (new triple-colon format)."""
+        call_id = kv.get("id")
+        if not call_id:
+            return
+
+        state.active[call_id] = ToolCall(
+            id=call_id,
+            tool_name=kv.get("tool", "unknown"),
+            status=ToolStatus.UNKNOWN,
+            exit_code=None,
+            start_ts=_parse_timestamp(kv.get("ts")),
+            end_ts=None,
+            duration_ms=None,
+            cache_key=kv.get("cache_key"),
+            args_excerpt=None,
+            error_excerpt=None,
+            log_file=state.log_file,
+            line_range=(idx, idx),  # Will update end on END marker
+            run_id=self._current_run_id,
+            iter_id=self._current_iter_id,
+        )
+
+    def _on_tool_call_start(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> None:
+        """Handle ::TOOL_CALL_START:: (legacy double-colon format)."""
+        call_id = kv.get("id")
+        if not call_id:
+            return
+
+        state.active[call_id] = ToolCall(
+            id=call_id,
+            tool_name=kv.get("name", "unknown"),
+            status=ToolStatus.UNKNOWN,
+            exit_code=None,
+            start_ts=_parse_timestamp(kv.get("ts")),
+            end_ts=None,
+            duration_ms=None,
+            cache_key=kv.get("key"),
+            args_excerpt=None,
+            error_excerpt=None,
+            log_file=state.log_file,
+            line_range=(idx, idx),  # Will update end on END marker
+            run_id=self._current_run_id,
+            iter_id=self._current_iter_id,
+        )
+
+    def _on_tool_end(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> ToolCall | None:
+        """Handle :::TOOL_END::: (new triple-colon format)."""
+        call_id = kv.get("id")
+        if not call_id:
+            return None
+
+        # Map result=PASS/FAIL to status
+        result = kv.get("result", "").upper()
+        status = (
+            ToolStatus.PASS
+            if result == "PASS"
+            else (ToolStatus.FAIL if result == "FAIL" else ToolStatus.UNKNOWN)
+        )
+        duration_ms = _safe_int(kv.get("duration_ms"))
+
+        tc = state.active.pop(call_id, None)
+        if not tc:
+            # End without start; emit a synthetic record for visibility
+            # Infer tool name from duration - orphaned END markers are likely RovoDev sessions
+            # These occur when the START marker wasn't captured (e.g., script truncation)
+            # Even short sessions (auth failures, etc.) should be classified as rovodev-session
+            inferred_tool = (
+                "rovodev-session"
+                if duration_ms
+                and duration_ms > 500  # 0.5s threshold catches auth failures
+                else "unknown"
+            )
 
-            if block.startswith("::TOOL_CALL_START::"):
-                m = RE_START.match(block)
-                if not m:
-                    continue
-                kv = _parse_kv_blob(m.group("kv"))
-
-                call_id = kv.get("id")
-                if not call_id:
-                    continue
-
-                tc = ToolCall(
-                    id=call_id,
-                    tool_name=kv.get("name", "unknown"),
-                    status=ToolStatus.UNKNOWN,
-                    exit_code=None,
-                    start_ts=_parse_timestamp(kv.get("ts")),
-                    end_ts=None,
-                    duration_ms=None,
-                    cache_key=kv.get("key"),
-                    args_excerpt=None,
-                    error_excerpt=None,
-                    log_file=str(path),
-                    line_range=(idx + 1, idx + 1),  # Will update end on END marker
-                    run_id=self._current_run_id,
-                    iter_id=self._current_iter_id,
-                )
-                active[call_id] = tc
-                continue
+            return ToolCall(
+                id=call_id,
+                tool_name=inferred_tool,
+                status=status,
+                exit_code=_safe_int(kv.get("exit")),
+                start_ts=None,
+                end_ts=_parse_timestamp(kv.get("ts")),
+                duration_ms=duration_ms,
+                cache_key=None,
+                args_excerpt=None,
+                error_excerpt=kv.get("reason"),
+                log_file=state.log_file,
+                line_range=(idx, idx),
+                run_id=self._current_run_id,
+                iter_id=self._current_iter_id,
+            )
 
-            # Handle :::TOOL_END::: (new triple-colon format)
-            if block.startswith(":::TOOL_END:::"):
-                m = RE_TOOL_END.match(block)
-                if not m:
-                    continue
-                kv = _parse_kv_blob(m.group("kv"))
-                call_id = kv.get("id")
-                if not call_id:
-                    continue
-
-                tc = active.pop(call_id, None)
-                if not tc:
-                    # End without start; emit a synthetic record for visibility
-                    # Map result=PASS/FAIL to status
-                    result = kv.get("result", "").upper()
-                    status = (
-                        ToolStatus.PASS
-                        if result == "PASS"
-                        else (
-                            ToolStatus.FAIL if result == "FAIL" else ToolStatus.UNKNOWN
-                        )
-                    )
-                    # Infer tool name from duration - orphaned END markers are likely RovoDev sessions
-                    # These occur when the START marker wasn't captured (e.g., script truncation)
-                    # Even short sessions (auth failures, etc.) should be classified as rovodev-session
-                    duration_ms = _safe_int(kv.get("duration_ms"))
-                    inferred_tool = (
-                        "rovodev-session"
-                        if duration_ms
-                        and duration_ms > 500  # 0.5s threshold catches auth failures
-                        else "unknown"
-                    )
-
-                    yield ToolCall(
-                        id=call_id,
-                        tool_name=inferred_tool,
-                        status=status,
-                        exit_code=_safe_int(kv.get("exit")),
-                        start_ts=None,
-                        end_ts=_parse_timestamp(kv.get("ts")),
-                        duration_ms=duration_ms,
-                        cache_key=None,
-                        args_excerpt=None,
-                        error_excerpt=kv.get("reason"),
-                        log_file=str(path),
-                        line_range=(idx + 1, idx + 1),
-                        run_id=self._current_run_id,
-                        iter_id=self._current_iter_id,
-                    )
-                    continue
-
-                # Map result=PASS/FAIL to status
-                result = kv.get("result", "").upper()
-                status = (
-                    ToolStatus.PASS
-                    if result == "PASS"
-                    else (ToolStatus.FAIL if result == "FAIL" else ToolStatus.UNKNOWN)
-                )
-                exit_code = _safe_int(kv.get("exit"))
-                duration_ms = _safe_int(kv.get("duration_ms"))
-                reason = kv.get("reason")
-
-                # Infer tool name from cache_key if available, else check duration
-                # Orphaned END markers with duration >10s are likely RovoDev sessions
-                inferred_tool = tc.tool_name
-                if inferred_tool == "unknown":
-                    cache_key = kv.get("cache_key") or tc.cache_key
-                    if cache_key:
-                        # Extract tool name from cache_key (e.g., "verifier|abc123" -> "verifier")
-                        inferred_tool = cache_key.split("|")[0].split("-")[0]
-                    elif duration_ms and duration_ms > 500:
-                        # Orphaned END markers >0.5s are likely RovoDev sessions
-                        inferred_tool = "rovodev-session"
-
-                # Update tool_name if we inferred one
-                if inferred_tool != "unknown":
-                    tc = replace(tc, tool_name=inferred_tool)
-
-                # If FAIL and reason missing, pull a short tail excerpt
-                error_excerpt = reason
-                if status == ToolStatus.FAIL and not error_excerpt and rolling_tail:
-                    error_excerpt = "\n".join(rolling_tail[-10:])
-
-                # Update line_range end
-                start_line = tc.line_range[0] if tc.line_range else idx + 1
-
-                tc2 = replace(
-                    tc,
-                    status=status,
-                    exit_code=exit_code,
-                    duration_ms=duration_ms,
-                    end_ts=_parse_timestamp(kv.get("ts")),
-                    error_excerpt=error_excerpt,
-                    line_range=(start_line, idx + 1),
-                )
-                yield tc2
-                continue
+        exit_code = _safe_int(kv.get("exit"))
+        reason = kv.get("reason")
+
+        # Infer tool name from cache_key if available, else check duration
+        # Orphaned END markers with duration >10s are likely RovoDev sessions
+        inferred_tool = tc.tool_name
+        if inferred_tool == "unknown":
+            cache_key = kv.get("cache_key") or tc.cache_key
+            if cache_key:
+                # Extract tool name from cache_key (e.g., "verifier|abc123" -> "verifier")
+                inferred_tool = cache_key.split("|")[0].split("-")[0]
+            elif duration_ms and duration_ms > 500:
+                # Orphaned END markers >0.5s are likely RovoDev sessions
+                inferred_tool = "rovodev-session"
+
+        # If FAIL and reason missing, pull a short tail excerpt
+        error_excerpt = reason
+        if status == ToolStatus.FAIL and not error_excerpt:
+            error_excerpt = state.tail_excerpt()
+
+        # Update line_range end
+        start_line = tc.line_range[0] if tc.line_range else idx
+
+        # Popped from state.active above, so finish it in place
+        tc.tool_name = inferred_tool
+        tc.status = status
+        tc.exit_code = exit_code
+        tc.duration_ms = duration_ms
+        tc.end_ts = _parse_timestamp(kv.get("ts"))
+        tc.error_excerpt = error_excerpt
+        tc.line_range = (start_line, idx)
+        return tc
+
+    def _on_tool_call_end(
+        self, kv: dict[str, str], idx: int, state: MarkerFileState
+    ) -> ToolCall | None:
+        """Handle ::TOOL_CALL_END:: (legacy double-colon format)."""
+        call_id = kv.get("id")
+        if not call_id:
+            return None
+
+        tc = state.active.pop(call_id, None)
+        if not tc:
+            # End without start; orphaned END markers are likely RovoDev sessions
+            duration_ms = _safe_int(kv.get("duration_ms"))
+            inferred_tool = (
+                "rovodev-session"
+                if duration_ms and duration_ms > 500  # 0.5s catches auth failures
+                else "unknown"
+            )
 
-            if block.startswith("::TOOL_CALL_END::"):
-                m = RE_END.match(block)
-                if not m:
-                    continue
-                kv = _parse_kv_blob(m.group("kv"))
-                call_id = kv.get("id")
-                if not call_id:
-                    continue
-
-                tc = active.pop(call_id, None)
-                if not tc:
-                    # End without start; orphaned END markers are likely RovoDev sessions
-                    duration_ms = _safe_int(kv.get("duration_ms"))
-                    inferred_tool = (
-                        "rovodev-session"
-                        if duration_ms
-                        and duration_ms > 500  # 0.5s catches auth failures
-                        else "unknown"
-                    )
-
-                    yield ToolCall(
-                        id=call_id,
-                        tool_name=inferred_tool,
-                        status=_status_from_str(kv.get("status")),
-                        exit_code=_safe_int(kv.get("exit")),
-                        start_ts=None,
-                        end_ts=_parse_timestamp(kv.get("ts")),
-                        duration_ms=duration_ms,
-                        cache_key=kv.get("key"),
-                        args_excerpt=None,
-                        error_excerpt=kv.get("err"),
-                        log_file=str(path),
-                        line_range=(idx + 1, idx + 1),
-                        run_id=self._current_run_id,
-                        iter_id=self._current_iter_id,
-                    )
-                    continue
-
-                status = _status_from_str(kv.get("status"))
-                exit_code = _safe_int(kv.get("exit"))
-                duration_ms = _safe_int(kv.get("duration_ms"))
-                err = kv.get("err")
-
-                # If FAIL and err missing, pull a short tail excerpt
-                error_excerpt = err
-                if status == ToolStatus.FAIL and not error_excerpt and rolling_tail:
-                    error_excerpt = "\n".join(rolling_tail[-10:])
-
-                # Update line_range end
-                start_line = tc.line_range[0] if tc.line_range else idx + 1
-
-                tc2 = replace(
-                    tc,
-                    status=status,
-                    exit_code=exit_code,
-                    duration_ms=duration_ms,
-                    end_ts=_parse_timestamp(kv.get("ts")),
-                    error_excerpt=error_excerpt,
-                    line_range=(start_line, idx + 1),
-                )
-                yield tc2
-
-        # Yield any active calls that never ended
-        for tc in active.values():
-            yield replace(
-                tc,
-                status=ToolStatus.UNKNOWN,
-                error_excerpt="\n".join(rolling_tail[-10:]) if rolling_tail else None,
+            return ToolCall(
+                id=call_id,
+                tool_name=inferred_tool,
+                status=_status_from_str(kv.get("status")),
+                exit_code=_safe_int(kv.get("exit")),
+                start_ts=None,
+                end_ts=_parse_timestamp(kv.get("ts")),
+                duration_ms=duration_ms,
+                cache_key=kv.get("key"),
+                args_excerpt=None,
+                error_excerpt=kv.get("err"),
+                log_file=state.log_file,
+                line_range=(idx, idx),
+                run_id=self._current_run_id,
+                iter_id=self._current_iter_id,
             )
 
+        status = _status_from_str(kv.get("status"))
+        exit_code = _safe_int(kv.get("exit"))
+        duration_ms = _safe_int(kv.get("duration_ms"))
+        err = kv.get("err")
+
+        # If FAIL and err missing, pull a short tail excerpt
+        error_excerpt = err
+        if status == ToolStatus.FAIL and not error_excerpt:
+            error_excerpt = state.tail_excerpt()
+
+        # Update line_range end
+        start_line = tc.line_range[0] if tc.line_range else idx
+
+        # Popped from state.active above, so finish it in place
+        tc.status = status
+        tc.exit_code = exit_code
+        tc.duration_ms = duration_ms
+        tc.end_ts = _parse_timestamp(kv.get("ts"))
+        tc.error_excerpt = error_excerpt
+        tc.line_range = (start_line, idx)
+        return tc
+
 
 def parse_file(path: Path) -> Iterator[ToolCall]:
     """Convenience function to parse a file."""
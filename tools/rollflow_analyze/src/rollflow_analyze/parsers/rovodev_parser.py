@@ -16,10 +16,15 @@ import re
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional
 
 from ..models import ToolCall, ToolStatus
 
+try:  # Optional faster JSON decoder (pip install rollflow-analyze[fast])
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 
 # Pattern for tool call log lines
 # Format: 2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: {"tool_name": ...}
@@ -35,6 +40,14 @@ RE_TOOL_RETURN = re.compile(
     r"Model request part:\s*(?P<json>\{.+\})$"
 )
 
+# Literal text every RE_TOOL_CALL / RE_TOOL_RETURN match contains. Checking
+# these with ``in`` first skips the regexes for the INFO chatter that makes up
+# most of a RovoDev log. Request parts are only decoded when they can be a
+# tool return, which also skips the (large) system and user prompt parts.
+TOOL_CALL_TEXT = "Model response tool call:"
+TOOL_RETURN_TEXT = "Model request part:"
+TOOL_RETURN_KIND = '"tool-return"'
+
 # Pattern for INFO-level tool call summary (simpler, just tool name)
 RE_TOOL_CALL_INFO = re.compile(
     r"^(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)\s*\|\s*INFO\s*\|\s*"
@@ -48,8 +61,10 @@ class RovoDevToolCall:
 
     tool_call_id: str
     tool_name: str
-    args: str
+    args: Optional[str]
     start_ts: datetime
+    # Undecoded args JSON, kept instead of ``args`` in lazy-args mode
+    args_raw: Optional[str] = None
     end_ts: Optional[datetime] = None
     response: Optional[str] = None
     duration_ms: Optional[int] = None
@@ -57,6 +72,11 @@ class RovoDevToolCall:
 
 def _parse_timestamp(ts_str: str) -> datetime:
     """Parse RovoDev timestamp format: 2026-01-25 17:10:05.978"""
+    try:
+        # Fast path for the usual millisecond/microsecond precision
+        return datetime.fromisoformat(ts_str)
+    except ValueError:
+        pass
     try:
         return datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S.%f")
     except ValueError:
@@ -67,6 +87,33 @@ def _parse_timestamp(ts_str: str) -> datetime:
             return datetime.now()
 
 
+# Digit runs that may be integers beyond 64 bits (orjson rejects or rounds them)
+RE_LONG_DIGITS = re.compile(r"\d{19}")
+
+
+def _orjson_loads(text: str):
+    """Decode with orjson, deferring to json for anything it rejects.
+
+    orjson is stricter than the stdlib (no NaN, no lone surrogates); those
+    inputs fall back to ``json.loads``.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def _orjson_loads_args(text: str):
+    """Like ``_orjson_loads``, but exact for integers wider than 64 bits.
+
+    Decoded args may be shown via ``str()``, where orjson rounding a huge
+    integer to a float (as some versions do) would be visible.
+    """
+    if RE_LONG_DIGITS.search(text):
+        return json.loads(text)
+    return _orjson_loads(text)
+
+
 def _truncate_args(args: str, max_len: int = 200) -> str:
     """Truncate args for display, preserving useful info."""
     if len(args) <= max_len:
@@ -74,6 +121,53 @@ def _truncate_args(args: str, max_len: int = 200) -> str:
     return args[:max_len] + "..."
 
 
+def _args_excerpt(pending: RovoDevToolCall) -> Optional[str]:
+    """Excerpt for an eagerly decoded call; None while args are still raw."""
+    return None if pending.args is None else _truncate_args(pending.args)
+
+
+def _describe_args(args_raw: str, loads) -> str:
+    """Pick the most useful part of a tool's args JSON for display."""
+    try:
+        args_parsed = loads(args_raw)
+    except json.JSONDecodeError:
+        return args_raw
+    if "command" in args_parsed:
+        return args_parsed["command"]
+    elif "file_paths" in args_parsed:
+        return f"files: {args_parsed['file_paths']}"
+    elif "file_path" in args_parsed:
+        return f"file: {args_parsed['file_path']}"
+    elif "content_pattern" in args_parsed:
+        return f"pattern: {args_parsed['content_pattern']}"
+    return str(args_parsed)
+
+
+def format_args_excerpt(args_raw: str) -> str:
+    """Build the args excerpt the eager parser stores from a raw args blob."""
+    loads = _orjson_loads_args if orjson is not None else json.loads
+    return _truncate_args(_describe_args(args_raw, loads))
+
+
+def resolve_args_excerpt(tool_call: ToolCall) -> Optional[str]:
+    """Return a call's args excerpt, decoding lazily kept args on first use.
+
+    The decoded excerpt replaces ``args_raw`` on the call, so afterwards it
+    is indistinguishable from one produced with ``lazy_args=False``.
+    """
+    if tool_call.args_raw is not None:
+        tool_call.args_excerpt = format_args_excerpt(tool_call.args_raw)
+        tool_call.args_raw = None
+    return tool_call.args_excerpt
+
+
+def resolve_args_excerpts(tool_calls: Iterable[ToolCall]) -> None:
+    """Decode lazily kept args for every call (see ``resolve_args_excerpt``)."""
+    for tool_call in tool_calls:
+        if tool_call.args_raw is not None:
+            resolve_args_excerpt(tool_call)
+
+
 class RovoDevParser:
     """Parser for RovoDev log files.
 
@@ -81,9 +175,29 @@ class RovoDevParser:
     visibility into all tool invocations during agent runs.
     """
 
-    def __init__(self, verbose: bool = False):
+    def __init__(
+        self, verbose: bool = False, fast_json: bool = True, lazy_args: bool = False
+    ):
+        """Initialize parser.
+
+        Args:
+            verbose: Print per-file progress and parse warnings
+            fast_json: Decode JSON payloads with orjson when it is installed
+                (falls back to the stdlib decoder otherwise)
+            lazy_args: Keep each call's args JSON undecoded in
+                ``ToolCall.args_raw`` and leave ``args_excerpt`` unset until
+                ``resolve_args_excerpt`` is called. Saves the second JSON
+                decode per call for reports that only need counts/durations.
+        """
         self.verbose = verbose
+        self.lazy_args = lazy_args
+        if fast_json and orjson is not None:
+            self._json_loads, self._args_loads = _orjson_loads, _orjson_loads_args
+        else:
+            self._json_loads, self._args_loads = json.loads, json.loads
         self._pending_calls: dict[str, RovoDevToolCall] = {}
+        # Lines consumed from the current file (lets a resumed parse keep numbering)
+        self._line_num = 0
 
     def parse_file(self, file_path: Path) -> Iterator[ToolCall]:
         """Parse a single RovoDev log file.
@@ -100,7 +214,7 @@ class RovoDevParser:
                     file_path, "rt", encoding="utf-8", errors="replace"
                 ) as f:
                     yield from self._parse_lines(f, file_path)
-            except (gzip.BadGzipFile, OSError) as e:
+            except (gzip.BadGzipFile, OSError, EOFError) as e:
                 if self.verbose:
                     print(f"    Warning: Could not read gzip file: {e}")
                 return
@@ -113,48 +227,90 @@ class RovoDevParser:
                     print(f"    Warning: Could not read file: {e}")
                 return
 
-    def _parse_lines(self, lines, file_path: Path) -> Iterator[ToolCall]:
-        """Parse lines from a file-like object."""
-        self._pending_calls.clear()
-        line_num = 0
+    def parse_lines(
+        self, lines, file_path: Path, resume: bool = False, finalize: bool = True
+    ) -> Iterator[ToolCall]:
+        """Parse an iterable of RovoDev log lines (see ``_parse_lines``)."""
+        yield from self._parse_lines(lines, file_path, resume=resume, finalize=finalize)
+
+    def export_pending(self) -> dict:
+        """Pending calls and line count as JSON-serializable resume state."""
+        return {
+            "line_num": self._line_num,
+            "pending": [
+                {
+                    "tool_call_id": p.tool_call_id,
+                    "tool_name": p.tool_name,
+                    "args": p.args,
+                    "args_raw": p.args_raw,
+                    "start_ts": p.start_ts.isoformat(),
+                }
+                for p in self._pending_calls.values()
+            ],
+        }
+
+    def import_pending(self, state: dict) -> None:
+        """Restore resume state produced by ``export_pending``."""
+        self._line_num = state.get("line_num", 0)
+        self._pending_calls = {
+            p["tool_call_id"]: RovoDevToolCall(
+                tool_call_id=p["tool_call_id"],
+                tool_name=p["tool_name"],
+                args=p["args"],
+                args_raw=p.get("args_raw"),
+                start_ts=datetime.fromisoformat(p["start_ts"]),
+            )
+            for p in state.get("pending", [])
+        }
+
+    def _parse_lines(
+        self, lines, file_path: Path, resume: bool = False, finalize: bool = True
+    ) -> Iterator[ToolCall]:
+        """Parse lines from a file-like object.
+
+        Args:
+            lines: Iterable of log lines
+            file_path: Log file the lines came from
+            resume: Keep pending calls and line numbering from the previous
+                call instead of starting a new file
+            finalize: Emit still-pending calls as UNKNOWN at the end
+        """
+        if not resume:
+            self._pending_calls.clear()
+            self._line_num = 0
+        line_num = self._line_num
+        json_loads, args_loads = self._json_loads, self._args_loads
+        lazy_args = self.lazy_args
 
         for line in lines:
             line_num += 1
-            line = line.rstrip("\n")
-
-            # Try to match tool call (start)
-            match = RE_TOOL_CALL.match(line)
+            self._line_num = line_num
+            # Cheap substring gates run before any regex or JSON work
+            match = None
+            if TOOL_CALL_TEXT in line:
+                line = line.rstrip("\n")
+                # Try to match tool call (start)
+                match = RE_TOOL_CALL.match(line)
             if match:
                 try:
-                    data = json.loads(match.group("json"))
+                    data = json_loads(match.group("json"))
                     tool_call_id = data.get("tool_call_id", f"unknown_{line_num}")
                     tool_name = data.get("tool_name", "unknown")
 
                     # Parse args - they might be a JSON string or already parsed
                     args_raw = data.get("args", "")
-                    if isinstance(args_raw, str):
-                        try:
-                            args_parsed = json.loads(args_raw)
-                            # Extract the most useful part for display
-                            if "command" in args_parsed:
-                                args = args_parsed["command"]
-                            elif "file_paths" in args_parsed:
-                                args = f"files: {args_parsed['file_paths']}"
-                            elif "file_path" in args_parsed:
-                                args = f"file: {args_parsed['file_path']}"
-                            elif "content_pattern" in args_parsed:
-                                args = f"pattern: {args_parsed['content_pattern']}"
-                            else:
-                                args = str(args_parsed)
-                        except json.JSONDecodeError:
-                            args = args_raw
+                    if not isinstance(args_raw, str):
+                        args, args_raw = str(args_raw), None
+                    elif lazy_args:
+                        args = None
                     else:
-                        args = str(args_raw)
+                        args, args_raw = _describe_args(args_raw, args_loads), None
 
                     self._pending_calls[tool_call_id] = RovoDevToolCall(
                         tool_call_id=tool_call_id,
                         tool_name=tool_name,
                         args=args,
+                        args_raw=args_raw,
                         start_ts=_parse_timestamp(match.group("timestamp")),
                     )
                 except (json.JSONDecodeError, KeyError) as e:
@@ -164,11 +320,14 @@ class RovoDevParser:
                         )
                 continue
 
+            if TOOL_RETURN_TEXT not in line or TOOL_RETURN_KIND not in line:
+                continue
+
             # Try to match tool return (end)
-            match = RE_TOOL_RETURN.match(line)
+            match = RE_TOOL_RETURN.match(line.rstrip("\n"))
             if match:
                 try:
-                    data = json.loads(match.group("json"))
+                    data = json_loads(match.group("json"))
                     if data.get("part_kind") == "tool-return":
                         tool_call_id = data.get("tool_call_id", "")
                         end_ts = _parse_timestamp(match.group("timestamp"))
@@ -193,20 +352,26 @@ class RovoDevParser:
                                 start_ts=pending.start_ts,
                                 end_ts=pending.end_ts,
                                 duration_ms=pending.duration_ms,
-                                args_excerpt=_truncate_args(pending.args),
+                                args_excerpt=_args_excerpt(pending),
+                                args_raw=pending.args_raw,
                                 log_file=str(file_path),
                             )
                 except (json.JSONDecodeError, KeyError):
                     pass
 
-        # Emit any unclosed calls (may have been interrupted)
+        if finalize:
+            yield from self.flush_pending(file_path)
+
+    def flush_pending(self, file_path: Path) -> Iterator[ToolCall]:
+        """Emit any unclosed calls (may have been interrupted)."""
         for tool_call_id, pending in self._pending_calls.items():
             yield ToolCall(
                 id=pending.tool_call_id,
                 tool_name=pending.tool_name,
                 status=ToolStatus.UNKNOWN,  # Unknown because no return received
                 start_ts=pending.start_ts,
-                args_excerpt=_truncate_args(pending.args),
+                args_excerpt=_args_excerpt(pending),
+                args_raw=pending.args_raw,
                 log_file=str(file_path),
             )
 
@@ -224,6 +389,20 @@ class RovoDevParser:
                 print(f"Warning: RovoDev logs directory not found: {dir_path}")
             return
 
+        log_files = self.find_log_files(dir_path, since=since)
+
+        for log_file in log_files:
+            yield from self.parse_file(log_file)
+
+    def find_log_files(
+        self, dir_path: Path, since: Optional[datetime] = None
+    ) -> list[Path]:
+        """List RovoDev logs in a directory, oldest first.
+
+        Args:
+            dir_path: Directory containing RovoDev log files
+            since: Only include logs modified after this datetime
+        """
         # Find all log files (both .log and .log.gz)
         log_files = list(dir_path.glob("rovodev*.log")) + list(
             dir_path.glob("rovodev*.log.gz")
@@ -235,14 +414,15 @@ class RovoDevParser:
         # Sort by modification time (oldest first for proper ordering)
         log_files.sort(key=lambda p: p.stat().st_mtime)
 
-        for log_file in log_files:
-            # Skip files older than 'since'
-            if since:
-                mtime = datetime.fromtimestamp(log_file.stat().st_mtime)
-                if mtime < since:
-                    continue
+        # Skip files older than 'since'
+        if since:
+            log_files = [
+                p
+                for p in log_files
+                if datetime.fromtimestamp(p.stat().st_mtime) >= since
+            ]
 
-            yield from self.parse_file(log_file)
+        return log_files
 
 
 def get_rovodev_logs_dir() -> Path:
@@ -1,20 +1,28 @@
 """Report generation for RollFlow analysis."""
 
+import heapq
 import json
-from dataclasses import asdict
+from dataclasses import fields
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterable, Sequence
 
+from .checkpoint import CheckpointStore, _epoch_ms
+from .flakiness import DEFAULT_FLAKY_WINDOW, FlakinessTracker
 from .models import (
     Aggregates,
     CacheAdvice,
+    CacheTelemetry,
+    Iteration,
     Report,
     ToolCall,
     ToolStatus,
     ToolSource,
     ToolBreakdown,
 )
+from .parsers.rovodev_parser import resolve_args_excerpt
+from .sketch import DurationSketch
+from .table import ToolCallTable
 
 
 def _serialize_value(obj: Any) -> Any:
@@ -31,224 +39,501 @@ def _serialize_value(obj: Any) -> Any:
 def _to_json_dict(obj: Any) -> Any:
     """Recursively convert dataclass to JSON-serializable dict."""
     if hasattr(obj, "__dataclass_fields__"):
-        return {k: _to_json_dict(v) for k, v in asdict(obj).items()}
-    if isinstance(obj, list):
+        return {
+            f.name: _to_json_dict(getattr(obj, f.name))
+            for f in fields(obj)
+            if f.metadata.get("serialize", True)
+        }
+    if isinstance(obj, (tuple, list, ToolCallTable)):
         return [_to_json_dict(item) for item in obj]
     if isinstance(obj, dict):
         return {k: _to_json_dict(v) for k, v in obj.items()}
     return _serialize_value(obj)
 
 
-def build_report(tool_calls: list[ToolCall], run_id: str | None = None) -> Report:
-    """Build a complete report from tool calls.
+def _percentiles(sketch: DurationSketch) -> dict[str, Any]:
+    """ToolBreakdown percentile fields read from a duration sketch."""
+    values: dict[str, Any] = {"duration_sketch": sketch}
+    for pct in (50, 90, 99):
+        value = sketch.quantile(pct / 100)
+        values[f"p{pct}_duration_ms"] = (
+            None if value is None else round(float(value), 1)
+        )
+    return values
 
-    Args:
-        tool_calls: List of parsed tool calls
-        run_id: Optional run identifier
 
-    Returns:
-        Complete Report with aggregates and cache advice
-    """
-    aggregates = _calculate_aggregates(tool_calls)
-    cache_advice = _calculate_cache_advice(tool_calls)
-    tool_breakdown = _calculate_tool_breakdown(tool_calls)
-
-    # Count by source
-    rovodev_count = sum(1 for tc in tool_calls if tc.source == ToolSource.ROVODEV)
-    shell_marker_count = sum(
-        1 for tc in tool_calls if tc.source == ToolSource.SHELL_MARKER
-    )
+class _ToolStats:
+    """Running per-tool counters for ``ReportAccumulator``."""
 
-    return Report(
-        run_id=run_id,
-        tool_calls=tool_calls,
-        aggregates=aggregates,
-        cache_advice=cache_advice,
-        tool_breakdown=tool_breakdown,
-        rovodev_tool_calls=rovodev_count,
-        shell_marker_calls=shell_marker_count,
+    __slots__ = (
+        "total_calls",
+        "duration_count",
+        "total_duration_ms",
+        "min_duration_ms",
+        "max_duration_ms",
+        "pass_count",
+        "fail_count",
+        "sketch",
     )
 
-
-def _calculate_aggregates(tool_calls: list[ToolCall]) -> Aggregates:
-    """Calculate aggregate statistics from tool calls.
-
-    Args:
-        tool_calls: List of tool calls to analyze
-
-    Returns:
-        Aggregates with pass/fail rates, top failures, slowest tools
+    def __init__(self) -> None:
+        self.total_calls = 0
+        self.duration_count = 0
+        self.total_duration_ms = 0
+        self.min_duration_ms: int | None = None
+        self.max_duration_ms: int | None = None
+        self.pass_count = 0
+        self.fail_count = 0
+        self.sketch = DurationSketch()
+
+    def add(self, tc: ToolCall) -> None:
+        """Count one call of this tool."""
+        self.total_calls += 1
+        duration = tc.duration_ms
+        if duration is not None:
+            self.duration_count += 1
+            self.total_duration_ms += duration
+            if self.min_duration_ms is None or duration < self.min_duration_ms:
+                self.min_duration_ms = duration
+            if self.max_duration_ms is None or duration > self.max_duration_ms:
+                self.max_duration_ms = duration
+            self.sketch.add(duration)
+        if tc.status == ToolStatus.PASS:
+            self.pass_count += 1
+        elif tc.status == ToolStatus.FAIL:
+            self.fail_count += 1
+
+    def merge(self, other: "_ToolStats") -> None:
+        """Fold another tool's counters into these."""
+        self.total_calls += other.total_calls
+        self.duration_count += other.duration_count
+        self.total_duration_ms += other.total_duration_ms
+        for value in (other.min_duration_ms, other.max_duration_ms):
+            if value is None:
+                continue
+            if self.min_duration_ms is None or value < self.min_duration_ms:
+                self.min_duration_ms = value
+            if self.max_duration_ms is None or value > self.max_duration_ms:
+                self.max_duration_ms = value
+        self.pass_count += other.pass_count
+        self.fail_count += other.fail_count
+        self.sketch.merge(other.sketch)
+
+
+class ReportAccumulator:
+    """Single-pass aggregation of ToolCalls into report sections.
+
+    Every aggregate, the per-tool breakdown and the cache advice are updated
+    as each call is added, so calls can be streamed in and dropped. Memory is
+    O(#tools + #cache keys) however many calls are added, plus a small tuple
+    per keyed PASS/FAIL outcome: flip rates (``flakiness``) need time order,
+    and files are not always read in the order their calls ran, so outcomes
+    are replayed sorted by start time as ``CheckpointStore.iter_outcomes``
+    does. Accumulators built over consecutive slices of the calls (per file
+    or per worker process) ``merge`` into the accumulator of the whole
+    sequence.
     """
-    total_calls = len(tool_calls)
-    pass_count = sum(1 for tc in tool_calls if tc.status == ToolStatus.PASS)
-    fail_count = sum(1 for tc in tool_calls if tc.status == ToolStatus.FAIL)
-    unknown_count = sum(1 for tc in tool_calls if tc.status == ToolStatus.UNKNOWN)
 
-    pass_rate = pass_count / total_calls if total_calls > 0 else 0.0
-    fail_rate = fail_count / total_calls if total_calls > 0 else 0.0
+    SLOWEST_LIMIT = 10
+    TOP_FAILURES_LIMIT = 10
+
+    def __init__(self, flaky_window: int = DEFAULT_FLAKY_WINDOW) -> None:
+        self.total_calls = 0
+        self.status_counts: dict[ToolStatus, int] = {}
+        self.source_counts: dict[ToolSource, int] = {}
+        # Insertion order is first appearance, which breaks ties in sorting
+        self._tools: dict[str, _ToolStats] = {}
+        self._failures: dict[str, int] = {}
+        # (duration_ms, -seq, tool_name) min-heap of the slowest calls
+        self._slowest: list[tuple[int, int, str]] = []
+        # cache_key -> [PASS calls, duration of all but the first, first's]
+        self._cache_keys: dict[str, list[int]] = {}
+        # Constructing a tracker validates the window
+        self._flaky_window = FlakinessTracker(flaky_window).window
+        # (no start, start_ms, seq, tool_name, cache_key, status) per outcome
+        self._outcomes: list[tuple[bool, int, int, str, str, ToolStatus]] = []
+
+    def add(self, tc: ToolCall) -> None:
+        """Fold one tool call into the running aggregates."""
+        seq = self.total_calls
+        self.total_calls += 1
+        status = tc.status
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.source_counts[tc.source] = self.source_counts.get(tc.source, 0) + 1
 
-    # Count failures by tool
-    failure_counts: dict[str, int] = {}
-    for tc in tool_calls:
-        if tc.status == ToolStatus.FAIL:
-            failure_counts[tc.tool_name] = failure_counts.get(tc.tool_name, 0) + 1
+        name = tc.tool_name
+        stats = self._tools.get(name)
+        if stats is None:
+            stats = self._tools[name] = _ToolStats()
+        stats.add(tc)
+        if tc.cache_key and status in (ToolStatus.PASS, ToolStatus.FAIL):
+            start_ms = _epoch_ms(tc.start_ts)
+            self._outcomes.append(
+                (start_ms is None, start_ms or 0, seq, name, tc.cache_key, status)
+            )
 
-    # Sort by failure count descending, take top 10
-    top_failures_by_tool = dict(
-        sorted(failure_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    )
+        duration = tc.duration_ms
+        if duration is not None:
+            # Earlier calls win ties, as with a stable descending sort
+            self._offer_slowest((duration, -seq, name))
+
+        if status == ToolStatus.PASS:
+            key = tc.cache_key
+            if key:
+                seen = self._cache_keys.get(key)
+                if seen is None:
+                    self._cache_keys[key] = [1, 0, duration or 0]
+                else:
+                    seen[0] += 1
+                    if duration is not None:
+                        seen[1] += duration
+        elif status == ToolStatus.FAIL:
+            self._failures[name] = self._failures.get(name, 0) + 1
+
+    def _offer_slowest(self, entry: tuple[int, int, str]) -> None:
+        """Keep ``entry`` if it is among the SLOWEST_LIMIT largest so far."""
+        if len(self._slowest) < self.SLOWEST_LIMIT:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def extend(self, tool_calls: Iterable[ToolCall]) -> None:
+        """Add every call from an iterable, consuming it once."""
+        add = self.add
+        for tc in tool_calls:
+            add(tc)
+
+    def merge(self, other: "ReportAccumulator") -> None:
+        """Fold in an accumulator built over the calls that follow ours.
+
+        The result equals one accumulator fed both call sequences in order,
+        including first-seen tie-breaking.
+        """
+        offset = self.total_calls
+        self.total_calls += other.total_calls
+        for counts, extra in (
+            (self.status_counts, other.status_counts),
+            (self.source_counts, other.source_counts),
+            (self._failures, other._failures),
+        ):
+            for key, n in extra.items():
+                counts[key] = counts.get(key, 0) + n
+
+        for name, stats in other._tools.items():
+            if name not in self._tools:
+                self._tools[name] = _ToolStats()
+            self._tools[name].merge(stats)
+
+        for duration, neg_seq, name in other._slowest:
+            self._offer_slowest((duration, neg_seq - offset, name))
+
+        for key, (n, skippable_ms, first_ms) in other._cache_keys.items():
+            seen = self._cache_keys.get(key)
+            if seen is None:
+                self._cache_keys[key] = [n, skippable_ms, first_ms]
+            else:
+                # Their first PASS is now a repeat of ours
+                seen[0] += n
+                seen[1] += skippable_ms + first_ms
+
+        for no_start, start_ms, seq, name, key, status in other._outcomes:
+            self._outcomes.append((no_start, start_ms, seq + offset, name, key, status))
+
+    def _flakiness(self) -> FlakinessTracker:
+        """Replay the keyed outcomes in ``iter_outcomes`` order."""
+        tracker = FlakinessTracker(self._flaky_window)
+        for *_, name, key, status in sorted(self._outcomes):
+            tracker.add(name, key, status)
+        return tracker
+
+    def aggregates(self) -> Aggregates:
+        """Pass/fail rates, top failures, slowest calls and flaky tools."""
+        total = self.total_calls
+        pass_count = self.status_counts.get(ToolStatus.PASS, 0)
+        fail_count = self.status_counts.get(ToolStatus.FAIL, 0)
+        top_failures = sorted(self._failures.items(), key=lambda x: x[1], reverse=True)
+        slowest = sorted(self._slowest, reverse=True)
+        flakiness = self._flakiness()
+        return Aggregates(
+            total_calls=total,
+            pass_count=pass_count,
+            fail_count=fail_count,
+            unknown_count=self.status_counts.get(ToolStatus.UNKNOWN, 0),
+            pass_rate=pass_count / total if total > 0 else 0.0,
+            fail_rate=fail_count / total if total > 0 else 0.0,
+            top_failures_by_tool=dict(top_failures[: self.TOP_FAILURES_LIMIT]),
+            slowest_tools=[(name, duration) for duration, _, name in slowest],
+            flakiest_tools=list(flakiness.tool_scores()),
+            flaky_keys=flakiness.flaky_keys(),
+            flakiness_window=flakiness.window,
+        )
 
-    # Find slowest tools (with valid duration)
-    tools_with_duration = [
-        (tc.tool_name, tc.duration_ms)
-        for tc in tool_calls
-        if tc.duration_ms is not None
-    ]
-    slowest_tools = sorted(tools_with_duration, key=lambda x: x[1], reverse=True)[:10]
+    def tool_breakdown(self) -> list[ToolBreakdown]:
+        """Per-tool breakdown sorted by total calls descending."""
+        breakdowns = [
+            ToolBreakdown(
+                tool_name=name,
+                total_calls=stats.total_calls,
+                total_duration_ms=stats.total_duration_ms,
+                avg_duration_ms=(
+                    stats.total_duration_ms / stats.duration_count
+                    if stats.duration_count
+                    else 0.0
+                ),
+                min_duration_ms=stats.min_duration_ms,
+                max_duration_ms=stats.max_duration_ms,
+                pass_count=stats.pass_count,
+                fail_count=stats.fail_count,
+                **_percentiles(stats.sketch),
+            )
+            for name, stats in self._tools.items()
+        ]
+        breakdowns.sort(key=lambda x: x.total_calls, reverse=True)
+        return breakdowns
+
+    def cache_advice(self) -> CacheAdvice:
+        """Skippable repeat PASS calls per cache key and the time they took."""
+        # Every PASS after the first for a key could have been a cache hit
+        duplicates = [
+            (key, n, ms) for key, (n, ms, _) in self._cache_keys.items() if n > 1
+        ]
+        return CacheAdvice(
+            reusable_pass_calls=len(self._cache_keys),
+            potential_skips=sum(n - 1 for _, n, _ in duplicates),
+            estimated_time_saved_ms=sum(ms for _, _, ms in duplicates),
+            duplicate_keys=[key for key, _, _ in duplicates],
+        )
 
-    # Find flakiest tools (tools with both PASS and FAIL)
-    tool_statuses: dict[str, set[ToolStatus]] = {}
-    for tc in tool_calls:
-        if tc.tool_name not in tool_statuses:
-            tool_statuses[tc.tool_name] = set()
-        tool_statuses[tc.tool_name].add(tc.status)
-
-    flakiest_tools = [
-        tool_name
-        for tool_name, statuses in tool_statuses.items()
-        if ToolStatus.PASS in statuses and ToolStatus.FAIL in statuses
-    ]
+    def build(
+        self, run_id: str | None = None, tool_calls: list[ToolCall] | None = None
+    ) -> Report:
+        """Assemble a Report from everything added so far.
+
+        Args:
+            run_id: Optional run identifier
+            tool_calls: Calls to list in the report, if they were kept
+
+        Returns:
+            Report with aggregates, cache advice and tool breakdown
+        """
+        return Report(
+            run_id=run_id,
+            tool_calls=tool_calls if tool_calls is not None else [],
+            aggregates=self.aggregates(),
+            cache_advice=self.cache_advice(),
+            tool_breakdown=self.tool_breakdown(),
+            rovodev_tool_calls=self.source_counts.get(ToolSource.ROVODEV, 0),
+            shell_marker_calls=self.source_counts.get(ToolSource.SHELL_MARKER, 0),
+        )
 
-    return Aggregates(
-        total_calls=total_calls,
-        pass_count=pass_count,
-        fail_count=fail_count,
-        unknown_count=unknown_count,
-        pass_rate=pass_rate,
-        fail_rate=fail_rate,
-        top_failures_by_tool=top_failures_by_tool,
-        slowest_tools=slowest_tools,
-        flakiest_tools=flakiest_tools,
-    )
 
+def build_report(
+    tool_calls: Iterable[ToolCall],
+    run_id: str | None = None,
+    keep_calls: bool = True,
+    flaky_window: int = DEFAULT_FLAKY_WINDOW,
+) -> Report:
+    """Build a complete report from tool calls.
 
-def _calculate_tool_breakdown(tool_calls: list[ToolCall]) -> list[ToolBreakdown]:
-    """Calculate detailed breakdown of tool usage.
+    The calls are consumed in a single pass, so any iterator works.
 
     Args:
-        tool_calls: List of tool calls to analyze
+        tool_calls: Parsed tool calls (list, ToolCallTable or iterator)
+        run_id: Optional run identifier
+        keep_calls: List the calls in ``Report.tool_calls``. With False only
+            the aggregates are kept and memory stays O(#tools).
+        flaky_window: Calls per cache key that flip rates are computed over
 
     Returns:
-        List of ToolBreakdown sorted by total calls descending
+        Complete Report with aggregates and cache advice
     """
-    # Group by tool name
-    tool_stats: dict[str, dict] = {}
+    accumulator = ReportAccumulator(flaky_window)
+    if not keep_calls or isinstance(tool_calls, Sequence):
+        accumulator.extend(tool_calls)
+        return accumulator.build(run_id, tool_calls if keep_calls else None)
 
+    kept: list[ToolCall] = []
     for tc in tool_calls:
-        name = tc.tool_name
-        if name not in tool_stats:
-            tool_stats[name] = {
-                "total_calls": 0,
-                "durations": [],
-                "pass_count": 0,
-                "fail_count": 0,
-            }
-
-        stats = tool_stats[name]
-        stats["total_calls"] += 1
-
-        if tc.duration_ms is not None:
-            stats["durations"].append(tc.duration_ms)
-
-        if tc.status == ToolStatus.PASS:
-            stats["pass_count"] += 1
-        elif tc.status == ToolStatus.FAIL:
-            stats["fail_count"] += 1
-
-    # Build breakdown list
-    breakdowns = []
-    for name, stats in tool_stats.items():
-        durations = stats["durations"]
-        total_duration = sum(durations) if durations else 0
-        avg_duration = total_duration / len(durations) if durations else 0.0
-
-        breakdowns.append(
-            ToolBreakdown(
-                tool_name=name,
-                total_calls=stats["total_calls"],
-                total_duration_ms=total_duration,
-                avg_duration_ms=avg_duration,
-                min_duration_ms=min(durations) if durations else None,
-                max_duration_ms=max(durations) if durations else None,
-                pass_count=stats["pass_count"],
-                fail_count=stats["fail_count"],
-            )
-        )
+        accumulator.add(tc)
+        kept.append(tc)
+    return accumulator.build(run_id, kept)
 
-    # Sort by total calls descending
-    breakdowns.sort(key=lambda x: x.total_calls, reverse=True)
-    return breakdowns
 
+def build_report_from_store(
+    store: CheckpointStore,
+    since: datetime | None = None,
+    run_id: str | None = None,
+    flaky_window: int = DEFAULT_FLAKY_WINDOW,
+) -> Report:
+    """Build a report from stored ToolCalls without re-parsing any logs.
 
-def _calculate_cache_advice(tool_calls: list[ToolCall]) -> CacheAdvice:
-    """Calculate cache optimization recommendations.
+    Aggregates are computed with SQL GROUP BY queries, so the calls are never
+    loaded into memory and ``Report.tool_calls`` is left empty. Durations are
+    streamed once into per-tool sketches for the percentiles, and outcomes
+    of calls with a cache key into the flip-rate tracker.
 
     Args:
-        tool_calls: List of tool calls to analyze
+        store: Checkpoint store filled by incremental ingestion
+        since: Only include calls that started at or after this time
+        run_id: Optional run identifier
+        flaky_window: Calls per cache key that flip rates are computed over
 
     Returns:
-        CacheAdvice with potential skips and time savings
+        Report with aggregates, cache advice and tool breakdown
     """
-    # Group PASS calls by cache_key
-    cache_key_calls: dict[str, list[ToolCall]] = {}
-    for tc in tool_calls:
-        if tc.status == ToolStatus.PASS and tc.cache_key:
-            if tc.cache_key not in cache_key_calls:
-                cache_key_calls[tc.cache_key] = []
-            cache_key_calls[tc.cache_key].append(tc)
-
-    # Find duplicate keys (keys with more than 1 PASS call)
-    duplicate_keys = [key for key, calls in cache_key_calls.items() if len(calls) > 1]
+    summary = store.summarize(since)
+
+    status_counts: dict[str, int] = {}
+    source_counts: dict[str, int] = {}
+    for row in summary["status"]:
+        status_counts[row["status"]] = status_counts.get(row["status"], 0) + row["n"]
+        source_counts[row["source"]] = source_counts.get(row["source"], 0) + row["n"]
+
+    total_calls = sum(status_counts.values())
+    pass_count = status_counts.get(ToolStatus.PASS.value, 0)
+    fail_count = status_counts.get(ToolStatus.FAIL.value, 0)
+
+    tools = summary["tools"]
+    failing = sorted(
+        (t for t in tools if t["fail_count"]),
+        key=lambda t: (-t["fail_count"], t["first_fail_seq"]),
+    )
+    flakiness = FlakinessTracker(flaky_window)
+    for tool_name, cache_key, status in store.iter_outcomes(since):
+        flakiness.add(tool_name, cache_key, ToolStatus(status))
 
-    # Count potential skips (all duplicate calls except the first)
-    potential_skips = sum(
-        len(calls) - 1 for calls in cache_key_calls.values() if len(calls) > 1
+    aggregates = Aggregates(
+        total_calls=total_calls,
+        pass_count=pass_count,
+        fail_count=fail_count,
+        unknown_count=status_counts.get(ToolStatus.UNKNOWN.value, 0),
+        pass_rate=pass_count / total_calls if total_calls > 0 else 0.0,
+        fail_rate=fail_count / total_calls if total_calls > 0 else 0.0,
+        top_failures_by_tool={t["tool_name"]: t["fail_count"] for t in failing[:10]},
+        slowest_tools=[
+            (row["tool_name"], row["duration_ms"]) for row in summary["slowest"]
+        ],
+        flakiest_tools=list(flakiness.tool_scores()),
+        flaky_keys=flakiness.flaky_keys(),
+        flakiness_window=flakiness.window,
     )
 
-    # Estimate time saved (sum of durations for skippable calls)
-    estimated_time_saved_ms = 0
-    for key in duplicate_keys:
-        calls = cache_key_calls[key]
-        # Skip first call (cache population), sum rest
-        for tc in calls[1:]:
-            if tc.duration_ms is not None:
-                estimated_time_saved_ms += tc.duration_ms
-
-    # Count reusable PASS calls (unique cache keys with PASS)
-    reusable_pass_calls = len(
-        [key for key, calls in cache_key_calls.items() if len(calls) >= 1]
+    sketches = {t["tool_name"]: DurationSketch() for t in tools}
+    for tool_name, duration_ms in store.iter_durations(since):
+        sketches[tool_name].add(duration_ms)
+
+    tool_breakdown = [
+        ToolBreakdown(
+            tool_name=t["tool_name"],
+            total_calls=t["total_calls"],
+            total_duration_ms=t["total_duration_ms"],
+            avg_duration_ms=t["avg_duration_ms"],
+            min_duration_ms=t["min_duration_ms"],
+            max_duration_ms=t["max_duration_ms"],
+            pass_count=t["pass_count"],
+            fail_count=t["fail_count"],
+            **_percentiles(sketches[t["tool_name"]]),
+        )
+        for t in tools
+    ]
+
+    cache_keys = summary["cache_keys"]
+    cache_advice = CacheAdvice(
+        reusable_pass_calls=len(cache_keys),
+        potential_skips=sum(row["n"] - 1 for row in cache_keys),
+        estimated_time_saved_ms=sum(row["skippable_ms"] for row in cache_keys),
+        duplicate_keys=[row["cache_key"] for row in cache_keys if row["n"] > 1],
     )
 
-    return CacheAdvice(
-        reusable_pass_calls=reusable_pass_calls,
-        potential_skips=potential_skips,
-        estimated_time_saved_ms=estimated_time_saved_ms,
-        duplicate_keys=duplicate_keys,
+    return Report(
+        run_id=run_id,
+        aggregates=aggregates,
+        cache_advice=cache_advice,
+        tool_breakdown=tool_breakdown,
+        rovodev_tool_calls=source_counts.get(ToolSource.ROVODEV.value, 0),
+        shell_marker_calls=source_counts.get(ToolSource.SHELL_MARKER.value, 0),
     )
 
 
-def write_json_report(report: Report, output_path: Path) -> None:
+JSON_FORMATS = ("pretty", "compact", "ndjson")
+
+
+_PRETTY_ENCODER = json.JSONEncoder(indent=2)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _dump_value(value: Any, json_format: str, depth: int) -> str:
+    """Encode one already-converted value as it would appear at ``depth``."""
+    if json_format != "pretty":
+        return _COMPACT_ENCODER.encode(value)
+    # Strings never contain raw newlines in JSON, so re-indenting is safe
+    return _PRETTY_ENCODER.encode(value).replace("\n", "\n" + "  " * depth)
+
+
+def _write_report_json(f: IO[str], report: Report, json_format: str) -> None:
+    """Write a report in ``Report`` field order, one tool call at a time."""
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format: {json_format}")
+
+    pretty = json_format == "pretty"
+    ndjson = json_format == "ndjson"
+
+    def encode_call(tc: ToolCall) -> str:
+        if tc.args_raw is not None:
+            resolve_args_excerpt(tc)
+        return _dump_value(_to_json_dict(tc), json_format, 2)
+
+    if ndjson:
+        # One call per line, then one line with the rest of the report
+        for tc in report.tool_calls:
+            f.write(encode_call(tc))
+            f.write("\n")
+        summary = {
+            f.name: _to_json_dict(getattr(report, f.name))
+            for f in fields(Report)
+            if f.name != "tool_calls"
+        }
+        f.write(_dump_value(summary, json_format, 0))
+        f.write("\n")
+        return
+
+    newline, indent = ("\n", "  ") if pretty else ("", "")
+    colon = ": " if pretty else ":"
+    f.write("{")
+    for i, report_field in enumerate(fields(Report)):
+        name = report_field.name
+        f.write(("," if i else "") + newline + indent + json.dumps(name) + colon)
+        if name == "tool_calls":
+            first = True
+            for tc in report.tool_calls:
+                f.write(("[" if first else ",") + newline + indent * 2)
+                f.write(encode_call(tc))
+                first = False
+            f.write("[]" if first else newline + indent + "]")
+            continue
+        value = _to_json_dict(getattr(report, name))
+        f.write(_dump_value(value, json_format, 1))
+    f.write(newline + "}")
+
+
+def write_json_report(
+    report: Report, output_path: Path, json_format: str = "pretty"
+) -> None:
     """Write report as JSON to file.
 
+    Tool calls are encoded and written one at a time, so memory use does not
+    grow with the number of calls.
+
     Args:
         report: Report to serialize
         output_path: Path to write JSON file
+        json_format: "pretty" (indented, the default), "compact" (no
+            whitespace) or "ndjson" (one tool call per line, then one line
+            with the rest of the report)
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    report_dict = _to_json_dict(report)
-
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(report_dict, f, indent=2)
+        _write_report_json(f, report, json_format)
 
 
 def write_markdown_summary(report: Report, output_path: Path) -> None:
@@ -279,16 +564,22 @@ def write_markdown_summary(report: Report, output_path: Path) -> None:
         "",
         "## Tool Breakdown",
         "",
-        "| Tool | Calls | Avg Duration | Total Time | Pass | Fail |",
-        "|------|-------|--------------|------------|------|------|",
+        "| Tool | Calls | Avg Duration | p50 | p90 | p99 | Total Time | Pass | Fail |",
+        "|------|-------|--------------|-----|-----|-----|------------|------|------|",
     ]
 
     # Add top 15 tools by call count
     for tb in report.tool_breakdown[:15]:
         avg_ms = f"{tb.avg_duration_ms:.0f}ms" if tb.avg_duration_ms else "N/A"
-        total_s = f"{tb.total_duration_ms/1000:.1f}s" if tb.total_duration_ms else "N/A"
+        total_s = (
+            f"{tb.total_duration_ms / 1000:.1f}s" if tb.total_duration_ms else "N/A"
+        )
+        p50, p90, p99 = (
+            f"{p:.0f}ms" if p is not None else "N/A"
+            for p in (tb.p50_duration_ms, tb.p90_duration_ms, tb.p99_duration_ms)
+        )
         lines.append(
-            f"| `{tb.tool_name}` | {tb.total_calls} | {avg_ms} | {total_s} | {tb.pass_count} | {tb.fail_count} |"
+            f"| `{tb.tool_name}` | {tb.total_calls} | {avg_ms} | {p50} | {p90} | {p99} | {total_s} | {tb.pass_count} | {tb.fail_count} |"
         )
 
     lines.extend(
@@ -297,10 +588,11 @@ def write_markdown_summary(report: Report, output_path: Path) -> None:
             "## Cache Advice",
             "",
             f"- **Potential skips:** {report.cache_advice.potential_skips}",
-            f"- **Estimated time saved:** {report.cache_advice.estimated_time_saved_ms/1000:.1f}s",
+            f"- **Estimated time saved:** {report.cache_advice.estimated_time_saved_ms / 1000:.1f}s",
             "",
         ]
     )
+    lines.extend(_cache_telemetry_lines(report.cache_telemetry))
 
     # Add slowest tools section if available
     if report.aggregates.slowest_tools:
@@ -313,8 +605,72 @@ def write_markdown_summary(report: Report, output_path: Path) -> None:
             ]
         )
         for tool_name, duration_ms in report.aggregates.slowest_tools[:10]:
-            lines.append(f"| `{tool_name}` | {duration_ms/1000:.1f}s |")
+            lines.append(f"| `{tool_name}` | {duration_ms / 1000:.1f}s |")
         lines.append("")
 
+    lines.extend(_iteration_lines(report.iterations))
+
     with open(output_path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
+
+
+def _cache_telemetry_lines(telemetry: CacheTelemetry | None) -> list[str]:
+    """Markdown for measured cache hit rates (empty without CACHE_* markers)."""
+    if telemetry is None:
+        return []
+    lines = [
+        "## Cache Telemetry (measured)",
+        "",
+        f"- **Lookups:** {telemetry.lookups} ({telemetry.hits} hits, {telemetry.misses} misses)",
+        f"- **Hit rate:** {telemetry.hit_rate:.1%}",
+        f"- **Time saved:** {telemetry.time_saved_ms / 1000:.1f}s",
+        f"- **Guard-blocked lookups:** {telemetry.guard_blocked} of {telemetry.guard_checks} guard checks",
+    ]
+    for reason, n in sorted(
+        telemetry.guard_blocked_by_reason.items(), key=lambda x: x[1], reverse=True
+    ):
+        lines.append(f"  - `{reason}`: {n}")
+    if telemetry.by_tool_scope:
+        lines.extend(
+            [
+                "",
+                "| Tool | Scope | Lookups | Hits | Hit rate | Time saved |",
+                "|------|-------|---------|------|----------|------------|",
+            ]
+        )
+        for row in telemetry.by_tool_scope:
+            lines.append(
+                f"| `{row.tool_name}` | {row.scope or '-'} | {row.lookups} | {row.hits} "
+                f"| {row.hit_rate:.1%} | {row.time_saved_ms / 1000:.1f}s |"
+            )
+    lines.append("")
+    return lines
+
+
+def _iteration_lines(iterations: list[Iteration], limit: int = 20) -> list[str]:
+    """Markdown table of the latest iterations' timelines."""
+    timed = [it for it in iterations if it.timeline and it.timeline.wall_ms]
+    if not timed:
+        return []
+    lines = [
+        "## Iteration Timelines",
+        "",
+        "Idle is wall time with no tool call running (LLM thinking, loop overhead).",
+        "",
+        "| Iter | Phase | Wall | Tool time | Idle | Overlap | Critical path | Longest gap |",
+        "|------|-------|------|-----------|------|---------|---------------|-------------|",
+    ]
+    for it in timed[-limit:]:
+        tl = it.timeline
+        gap = (
+            f"{tl.longest_gaps[0].duration_ms / 1000:.1f}s" if tl.longest_gaps else "-"
+        )
+        idle_pct = tl.idle_ms / tl.wall_ms
+        lines.append(
+            f"| {it.iter_num} | {it.phase or '-'} | {tl.wall_ms / 1000:.1f}s "
+            f"| {tl.tool_ms / 1000:.1f}s | {tl.idle_ms / 1000:.1f}s ({idle_pct:.0%}) "
+            f"| {tl.overlap_ms / 1000:.1f}s | {tl.critical_path_ms / 1000:.1f}s "
+            f"({len(tl.critical_path)} calls) | {gap} |"
+        )
+    lines.append("")
+    return lines
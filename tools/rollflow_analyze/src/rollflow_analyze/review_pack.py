@@ -1,30 +1,41 @@
 """Generate human-readable review packs from analysis reports."""
 
+from collections import Counter
 from pathlib import Path
+from typing import Optional
 
+from .cache_db import CacheDB
+from .fingerprint import error_fingerprint
 from .models import Report, ToolCall, ToolStatus
 
 
-def write_review_pack(report: Report, output_path: Path) -> None:
+def write_review_pack(
+    report: Report, output_path: Path, cache_db: Optional[CacheDB] = None
+) -> None:
     """Generate comprehensive markdown review pack from report.
 
     Args:
         report: Report to format
         output_path: Path to write markdown review pack
+        cache_db: Cache DB to read recurring failures from (default: group
+            the report's own failed calls)
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    lines = _build_review_pack_lines(report)
+    lines = _build_review_pack_lines(report, cache_db)
 
     with open(output_path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
 
 
-def _build_review_pack_lines(report: Report) -> list[str]:
+def _build_review_pack_lines(
+    report: Report, cache_db: Optional[CacheDB] = None
+) -> list[str]:
     """Build all sections of the review pack.
 
     Args:
         report: Report to format
+        cache_db: Cache DB to read recurring failures from
 
     Returns:
         List of lines to write
@@ -49,7 +60,7 @@ def _build_review_pack_lines(report: Report) -> list[str]:
 
     # Failures (if any)
     if report.aggregates.fail_count > 0:
-        lines.extend(_failures_section(report))
+        lines.extend(_failures_section(report, cache_db))
         lines.append("")
 
     # Tool Breakdown
@@ -170,12 +181,27 @@ def _performance_section(report: Report) -> list[str]:
         lines.extend(
             [
                 "",
-                "### Flaky Tools (Both PASS and FAIL)",
+                f"### Flaky Tools (Flipped PASS/FAIL on the Same Cache Key, "
+                f"Last {agg.flakiness_window} Calls per Key)",
                 "",
             ]
         )
         for tool_name in agg.flakiest_tools:
             lines.append(f"- `{tool_name}` ⚠️")
+        if agg.flaky_keys:
+            lines.extend(
+                [
+                    "",
+                    "| Tool | Cache Key | Flips | Flip Rate | Score | Last |",
+                    "|------|-----------|-------|-----------|-------|------|",
+                ]
+            )
+            for fk in agg.flaky_keys:
+                lines.append(
+                    f"| `{fk.tool_name}` | `{fk.cache_key[:40]}` | "
+                    f"{fk.flips}/{fk.window_calls - 1} | {fk.flip_rate:.0%} | "
+                    f"{fk.score:.2f} | {fk.last_status.value} |"
+                )
 
     return lines
 
@@ -212,7 +238,7 @@ def _cache_section(report: Report) -> list[str]:
     return lines
 
 
-def _failures_section(report: Report) -> list[str]:
+def _failures_section(report: Report, cache_db: Optional[CacheDB]) -> list[str]:
     """Generate failures section."""
     agg = report.aggregates
 
@@ -238,6 +264,8 @@ def _failures_section(report: Report) -> list[str]:
     # Find failed tool calls with error excerpts
     failed_calls = [tc for tc in report.tool_calls if tc.status == ToolStatus.FAIL]
 
+    lines.extend(_recurring_failures_lines(failed_calls, cache_db))
+
     if failed_calls:
         lines.extend(
             [
@@ -277,6 +305,62 @@ def _failures_section(report: Report) -> list[str]:
     return lines
 
 
+def _recurring_failures(failed_calls: list[ToolCall], limit: int) -> list[dict]:
+    """Group failed calls by fingerprint, shaped like ``CacheDB.top_failures``."""
+    groups: Counter = Counter()
+    samples: dict[tuple[str, str], ToolCall] = {}
+    for tc in failed_calls:
+        key = (tc.tool_name, error_fingerprint(tc.error_excerpt, tc.exit_code))
+        groups[key] += 1
+        samples[key] = tc
+    return [
+        {
+            "tool_name": tool_name,
+            "err_hash": err_hash,
+            "count": count,
+            "last_exit_code": samples[tool_name, err_hash].exit_code,
+            "err_excerpt": samples[tool_name, err_hash].error_excerpt,
+        }
+        for (tool_name, err_hash), count in groups.most_common(limit)
+    ]
+
+
+def _recurring_failures_lines(
+    failed_calls: list[ToolCall],
+    cache_db: Optional[CacheDB] = None,
+    limit: int = 5,
+) -> list[str]:
+    """Table of failures seen more than once, grouped by error fingerprint.
+
+    Read from the cache DB's ``fail_summary`` when there is one (which also
+    covers ``--from-store`` reports, whose calls aren't loaded); otherwise
+    the report's own failed calls are fingerprinted.
+    """
+    if cache_db is not None:
+        failures = cache_db.top_failures(limit)
+    else:
+        failures = _recurring_failures(failed_calls, limit)
+
+    recurring = [row for row in failures if row["count"] > 1]
+    if not recurring:
+        return []
+
+    lines = [
+        "",
+        "### Recurring Failures",
+        "",
+        "| Tool | Count | Fingerprint | Latest Error |",
+        "|------|-------|-------------|--------------|",
+    ]
+    for row in recurring:
+        excerpt = row["err_excerpt"] or f"exit code {row['last_exit_code']}"
+        error = excerpt.splitlines()[0].replace("|", "\\|")[:80]
+        lines.append(
+            f"| `{row['tool_name']}` | {row['count']} | `{row['err_hash']}` | {error} |"
+        )
+    return lines
+
+
 def _extract_log_excerpt(tool_call: ToolCall, context_lines: int = 10) -> str | None:
     """Extract log excerpt around a tool call.
 
@@ -0,0 +1,408 @@
+"""Replay stored ToolCalls against candidate cache policies.
+
+``CacheAdvice`` counts repeated PASS cache keys within one report and never
+expires anything. ``rollflow_analyze simulate`` instead replays every call in
+the checkpoint store (filled by ``--incremental``) in timestamp order through
+a model of the pass cache, once per policy:
+
+* ``mode`` is CACHE_MODE: ``off`` neither looks up nor records, ``record``
+  only records, ``use`` looks up and records
+* ``scopes`` is CACHE_SCOPE; a call is only cacheable when its tool maps to
+  one of them (see ``TOOL_SCOPES``) and it has a cache key
+* ``ttl_hours`` is MAX_CACHE_AGE_HOURS; older entries miss
+* ``capacity`` caps the entries kept, least recently used evicted first
+
+As in cache.sh, a miss runs the call and caches it if it PASSed, and a hit
+skips the call, so it neither refreshes the entry's age nor records a
+result. A hit on a call that actually FAILed is stale: the cache would have
+reported PASS for something that no longer passed.
+"""
+
+import argparse
+import json
+import sys
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .models import ToolCall, ToolStatus
+
+MODES = ("off", "record", "use")
+
+# Tool name -> cache scope, after docs/CACHE_DESIGN.md. Tools not listed are
+# never cached; --scope-map adds or overrides entries.
+TOOL_SCOPES = {
+    "verifier": "verify",
+    "shellcheck": "verify",
+    "markdownlint": "verify",
+    "fix-markdown": "verify",
+    "pre-commit": "verify",
+    "lint": "verify",
+    "cat": "read",
+    "ls": "read",
+    "find": "read",
+    "grep": "read",
+    "open_files": "read",
+    "git_log": "read",
+    "git_show": "read",
+    "rovodev": "llm_ro",
+    "opencode": "llm_ro",
+}
+
+DEFAULT_SCOPE_SETS = ("verify", "verify,read", "verify,read,llm_ro")
+
+# Matches cache.sh's MAX_CACHE_AGE_HOURS fallback
+DEFAULT_TTL_HOURS = 168.0
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """One cache configuration to replay; None means no limit."""
+
+    mode: str = "use"
+    scopes: frozenset[str] = frozenset({"verify", "read"})
+    ttl_hours: Optional[float] = DEFAULT_TTL_HOURS
+    capacity: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        """Short description, e.g. ``use verify,read ttl=168h cap=1000``."""
+        if self.mode == "off":
+            return self.mode
+        ttl = "none" if self.ttl_hours is None else f"{self.ttl_hours:g}h"
+        cap = "none" if self.capacity is None else str(self.capacity)
+        return f"{self.mode} {','.join(sorted(self.scopes))} ttl={ttl} cap={cap}"
+
+
+@dataclass
+class PolicyResult:
+    """What one policy would have done over the replayed calls."""
+
+    policy: str
+    mode: str
+    scopes: list[str]
+    ttl_hours: Optional[float]
+    capacity: Optional[int]
+    # Calls whose tool is in scope and that have a cache key
+    lookups: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    # Duration of the calls a hit would have skipped
+    time_saved_ms: int = 0
+    # Hits on calls that actually FAILed
+    stale_hits: int = 0
+    staleness_risk: float = 0.0
+    # Misses on a key whose entry was past its TTL
+    expired: int = 0
+    evictions: int = 0
+    peak_entries: int = 0
+    # Age of the oldest cached PASS a hit was served from
+    max_hit_age_hours: Optional[float] = None
+    hits_by_scope: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Simulation:
+    """Replay results for every policy, best time saved first."""
+
+    calls: int = 0
+    # Calls with no timestamp to order them by
+    untimed_calls: int = 0
+    # Calls with a cache key whose tool maps to no scope
+    unscoped_calls: int = 0
+    first_ts: Optional[str] = None
+    last_ts: Optional[str] = None
+    results: list[PolicyResult] = field(default_factory=list)
+
+
+def policy_grid(
+    modes: Iterable[str] = ("use",),
+    scope_sets: Iterable[str] = DEFAULT_SCOPE_SETS,
+    ttls: Iterable[Optional[float]] = (DEFAULT_TTL_HOURS,),
+    capacities: Iterable[Optional[int]] = (None,),
+) -> list[CachePolicy]:
+    """Every combination of the given settings.
+
+    Nothing is cached in ``off`` mode, so it contributes a single policy.
+    """
+    policies: list[CachePolicy] = []
+    ttls, capacities = list(ttls), list(capacities)
+    scopes = [frozenset(s for s in group.split(",") if s) for group in scope_sets]
+    for mode in modes:
+        if mode == "off":
+            policies.append(CachePolicy(mode=mode))
+            continue
+        for scope, ttl, capacity in product(scopes, ttls, capacities):
+            policies.append(CachePolicy(mode, scope, ttl, capacity))
+    return list(dict.fromkeys(policies))
+
+
+def _replay(
+    calls: list[tuple[float, ToolCall, Optional[str]]], policy: CachePolicy
+) -> PolicyResult:
+    """Run ``(epoch_s, call, scope)`` entries, in time order, through one policy."""
+    result = PolicyResult(
+        policy=policy.label,
+        mode=policy.mode,
+        scopes=sorted(policy.scopes),
+        ttl_hours=policy.ttl_hours,
+        capacity=policy.capacity,
+    )
+    if policy.mode == "off":
+        return result
+    ttl_s = None if policy.ttl_hours is None else policy.ttl_hours * 3600
+    # cache_key -> epoch seconds of the cached PASS, least recently used first
+    entries: OrderedDict[str, float] = OrderedDict()
+    max_age_s: Optional[float] = None
+    for at, tc, scope in calls:
+        if scope not in policy.scopes:
+            continue
+        key = tc.cache_key
+        cached_at = entries.get(key)
+        if policy.mode == "use":
+            result.lookups += 1
+            if cached_at is not None and ttl_s is not None and at - cached_at > ttl_s:
+                result.expired += 1
+                del entries[key]
+                cached_at = None
+            if cached_at is not None:
+                result.hits += 1
+                result.time_saved_ms += tc.duration_ms or 0
+                result.hits_by_scope[scope] = result.hits_by_scope.get(scope, 0) + 1
+                if tc.status == ToolStatus.FAIL:
+                    result.stale_hits += 1
+                max_age_s = max(max_age_s or 0.0, at - cached_at)
+                entries.move_to_end(key)
+                continue
+            result.misses += 1
+        if tc.status != ToolStatus.PASS:
+            continue
+        entries[key] = at
+        entries.move_to_end(key)
+        if policy.capacity is not None and len(entries) > policy.capacity:
+            entries.popitem(last=False)
+            result.evictions += 1
+        result.peak_entries = max(result.peak_entries, len(entries))
+
+    if result.lookups:
+        result.hit_rate = result.hits / result.lookups
+    if result.hits:
+        result.staleness_risk = result.stale_hits / result.hits
+    if max_age_s is not None:
+        result.max_hit_age_hours = round(max_age_s / 3600, 2)
+    result.hits_by_scope = dict(sorted(result.hits_by_scope.items()))
+    return result
+
+
+def simulate(
+    tool_calls: Iterable[ToolCall],
+    policies: Iterable[CachePolicy],
+    tool_scopes: Optional[dict[str, str]] = None,
+) -> Simulation:
+    """Replay calls in timestamp order against each policy.
+
+    Args:
+        tool_calls: Calls in any order; ordered by start (else end) time
+        policies: Policies to compare
+        tool_scopes: Tool name -> scope (default ``TOOL_SCOPES``)
+
+    Returns:
+        Simulation with one PolicyResult per policy
+    """
+    scopes_by_tool = TOOL_SCOPES if tool_scopes is None else tool_scopes
+    sim = Simulation()
+    timed: list[tuple[float, int, ToolCall, Optional[str]]] = []
+    for tc in tool_calls:
+        sim.calls += 1
+        ts = tc.start_ts or tc.end_ts
+        if ts is None:
+            sim.untimed_calls += 1
+            continue
+        scope = scopes_by_tool.get(tc.tool_name) if tc.cache_key else None
+        if tc.cache_key and scope is None:
+            sim.unscoped_calls += 1
+        # Naive (RovoDev) timestamps are local time, as in the timeline
+        timed.append((ts.timestamp(), len(timed), tc, scope))
+    timed.sort(key=lambda entry: entry[:2])
+    calls = [(at, tc, scope) for at, _, tc, scope in timed]
+    if calls:
+        sim.first_ts = (calls[0][1].start_ts or calls[0][1].end_ts).isoformat()
+        sim.last_ts = (calls[-1][1].start_ts or calls[-1][1].end_ts).isoformat()
+
+    sim.results = [_replay(calls, policy) for policy in policies]
+    sim.results.sort(key=lambda r: (-r.time_saved_ms, r.stale_hits))
+    return sim
+
+
+def simulation_to_dict(sim: Simulation) -> dict:
+    """Convert a Simulation to a JSON-serializable dict."""
+    return asdict(sim)
+
+
+def format_markdown(sim: Simulation) -> str:
+    """Render the policy comparison as a markdown table."""
+    lines = [
+        "# Cache Policy Simulation",
+        "",
+        f"- **Calls replayed:** {sim.calls - sim.untimed_calls} "
+        f"({sim.untimed_calls} without timestamps skipped)",
+        f"- **Span:** {sim.first_ts or '-'} .. {sim.last_ts or '-'}",
+        f"- **Cache keys on unscoped tools:** {sim.unscoped_calls}",
+        "",
+        "| Policy | Lookups | Hit rate | Time saved (s) | Stale hits | "
+        "Staleness risk | Expired | Evicted | Peak entries |",
+        "|--------|---------|----------|----------------|------------|"
+        "----------------|---------|---------|--------------|",
+    ]
+    for r in sim.results:
+        lines.append(
+            f"| {r.policy} | {r.lookups} | {r.hit_rate:.1%} | "
+            f"{r.time_saved_ms / 1000:.1f} | {r.stale_hits} | "
+            f"{r.staleness_risk:.1%} | {r.expired} | {r.evictions} | "
+            f"{r.peak_entries} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _optional_number(kind: type):
+    """argparse type for a number where 'none' means no limit."""
+
+    def parse(value: str):
+        if value.lower() == "none":
+            return None
+        number = kind(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive or 'none': {value}")
+        return number
+
+    return parse
+
+
+def _scope_mapping(value: str) -> tuple[str, str]:
+    tool, sep, scope = value.partition("=")
+    if not sep or not tool:
+        raise argparse.ArgumentTypeError(f"expected TOOL=SCOPE: {value}")
+    return tool, scope
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create argument parser for the simulate subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="rollflow_analyze simulate",
+        description="Replay stored tool calls against cache policies and compare "
+        "hit rate, time saved and staleness risk.",
+    )
+    parser.add_argument(
+        "--checkpoint-db",
+        type=Path,
+        default=Path("artifacts/rollflow_cache/ingest.sqlite"),
+        help="Checkpoint store filled by --incremental (default: artifacts/rollflow_cache/ingest.sqlite)",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        help="Only replay calls from the last N hours or days (e.g., '24h', '30d')",
+    )
+    parser.add_argument(
+        "--mode",
+        dest="modes",
+        action="append",
+        choices=MODES,
+        help="CACHE_MODE to simulate; repeatable (default: use)",
+    )
+    parser.add_argument(
+        "--scope",
+        dest="scope_sets",
+        action="append",
+        metavar="SCOPES",
+        help="Comma-separated CACHE_SCOPE to simulate; repeatable "
+        f"(default: {' '.join(DEFAULT_SCOPE_SETS)})",
+    )
+    parser.add_argument(
+        "--ttl-hours",
+        dest="ttls",
+        action="append",
+        type=_optional_number(float),
+        metavar="HOURS",
+        help=f"Entry TTL, or 'none'; repeatable (default: {DEFAULT_TTL_HOURS:g})",
+    )
+    parser.add_argument(
+        "--capacity",
+        dest="capacities",
+        action="append",
+        type=_optional_number(int),
+        metavar="N",
+        help="LRU capacity in entries, or 'none'; repeatable (default: none)",
+    )
+    parser.add_argument(
+        "--scope-map",
+        action="append",
+        type=_scope_mapping,
+        default=[],
+        metavar="TOOL=SCOPE",
+        help="Map a tool to a cache scope (empty SCOPE: never cached); repeatable",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        help="Also write the results as JSON to this path",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for ``rollflow_analyze simulate``."""
+    from .checkpoint import CheckpointStore
+    from .cli import parse_since
+
+    args = create_parser().parse_args(argv)
+    since_dt: Optional[datetime] = None
+    if args.since:
+        try:
+            since_dt = parse_since(args.since)
+        except ValueError as e:
+            print(f"Error: Invalid --since format: {e}", file=sys.stderr)
+            return 1
+    if not args.checkpoint_db.exists():
+        print(
+            f"Error: Checkpoint store not found: {args.checkpoint_db} "
+            "(run with --incremental first)",
+            file=sys.stderr,
+        )
+        return 1
+
+    tool_scopes = dict(TOOL_SCOPES)
+    for tool, scope in args.scope_map:
+        if scope:
+            tool_scopes[tool] = scope
+        else:
+            tool_scopes.pop(tool, None)
+    policies = policy_grid(
+        args.modes or ("use",),
+        args.scope_sets or DEFAULT_SCOPE_SETS,
+        args.ttls or (DEFAULT_TTL_HOURS,),
+        args.capacities or (None,),
+    )
+    sim = simulate(
+        CheckpointStore(args.checkpoint_db).iter_calls(since=since_dt),
+        policies,
+        tool_scopes,
+    )
+    if sim.calls == 0:
+        print("Warning: No stored tool calls in the selected window", file=sys.stderr)
+    print(format_markdown(sim), end="")
+
+    if args.out:
+        try:
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            args.out.write_text(
+                json.dumps(simulation_to_dict(sim), indent=2) + "\n", encoding="utf-8"
+            )
+        except OSError as e:
+            print(f"Error writing simulation results: {e}", file=sys.stderr)
+            return 1
+    return 0
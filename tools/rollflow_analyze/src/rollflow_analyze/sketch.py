@@ -0,0 +1,125 @@
+"""Mergeable fixed-memory quantile sketch for tool durations."""
+
+import math
+from typing import Iterable, Optional
+
+# Quantile estimates are within 1% of the true value
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Bucket cap; the lowest buckets are folded together past this. At 1%
+# accuracy, 1 ms to 30 days needs about 1100 buckets, so the cap is rarely hit.
+DEFAULT_MAX_BUCKETS = 2048
+
+
+class DurationSketch:
+    """Log-bucketed quantile sketch (DDSketch-style) over non-negative values.
+
+    Each positive value lands in bucket ``ceil(log(v) / log(gamma))``, so every
+    bucket spans a fixed ratio and a quantile read from it is within
+    ``relative_accuracy`` of the true value. Zeros get their own counter.
+    Memory is bounded by ``max_buckets``. Two sketches built with the same
+    accuracy merge by adding bucket counts, so per-file or per-process
+    sketches combine into exactly the sketch of all their values.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Record one value (negative values count as zero)."""
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Record every value from an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "DurationSketch") -> None:
+        """Fold another sketch's values into this one.
+
+        Raises:
+            ValueError: If the sketches use different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        if other.count == 0:
+            return
+        buckets = self.buckets
+        for index, n in other.buckets.items():
+            buckets[index] = buckets.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together until within max_buckets."""
+        keys = sorted(self.buckets)
+        excess = keys[: len(keys) - self.max_buckets + 1]
+        target = excess[-1]
+        self.buckets[target] += sum(self.buckets.pop(k) for k in excess[:-1])
+
+    def _bucket_value(self, index: int) -> float:
+        """Representative value of a bucket (relative error <= accuracy)."""
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0 <= q <= 1), or None if empty."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = self._bucket_value(index)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def histogram(self) -> list[tuple[float, float, int]]:
+        """Non-empty buckets as ``(lower, upper, count)``, ascending.
+
+        Zeros are reported as the ``(0, 0, n)`` bucket.
+        """
+        rows = [(0.0, 0.0, self.zero_count)] if self.zero_count else []
+        for index in sorted(self.buckets):
+            upper = self._gamma**index
+            rows.append((upper / self._gamma, upper, self.buckets[index]))
+        return rows
@@ -0,0 +1,185 @@
+"""Columnar (struct-of-arrays) storage for large numbers of ToolCalls."""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Hashable, Iterable, Iterator, Optional, Sequence, overload
+
+from .models import ToolCall, ToolSource, ToolStatus
+
+# Stands in for None in the int64 columns
+NULL = -(2**63)
+
+# Stands in for "naive datetime" in the UTC offset column
+NAIVE = -(2**31)
+
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_STATUSES = list(ToolStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_SOURCES = list(ToolSource)
+_SOURCE_CODES = {source: code for code, source in enumerate(_SOURCES)}
+
+
+class _Interner:
+    """Stores each distinct value once; rows hold a small integer index."""
+
+    def __init__(self) -> None:
+        self.values: list = []
+        self._index: dict = {}
+
+    def code(self, value: Hashable) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def _encode_ts(dt: Optional[datetime]) -> tuple[int, int]:
+    """Split a datetime into (epoch microseconds, UTC offset seconds)."""
+    if dt is None:
+        return NULL, NAIVE
+    offset = dt.utcoffset()
+    if offset is None:
+        delta, tz = dt - _EPOCH_NAIVE, NAIVE
+    else:
+        delta, tz = dt - _EPOCH_UTC, int(offset.total_seconds())
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds, tz
+
+
+def _decode_ts(us: int, tz: int) -> Optional[datetime]:
+    """Inverse of ``_encode_ts``."""
+    if us == NULL:
+        return None
+    if tz == NAIVE:
+        return _EPOCH_NAIVE + timedelta(microseconds=us)
+    utc = _EPOCH_UTC + timedelta(microseconds=us)
+    return utc.astimezone(timezone(timedelta(seconds=tz)))
+
+
+def _int_or_null(value: Optional[int]) -> int:
+    return NULL if value is None else value
+
+
+def _null_or_int(value: int) -> Optional[int]:
+    return None if value == NULL else value
+
+
+class ToolCallTable(Sequence[ToolCall]):
+    """Struct-of-arrays container for ToolCalls.
+
+    Timestamps, durations, exit codes and line ranges live in int64 arrays
+    (timestamps as epoch microseconds plus a UTC offset, so they round-trip
+    exactly), status and source as one-byte codes, and repeated strings
+    (tool names, cache keys, log files, run/iteration ids) are interned.
+    Only ids and excerpts are kept per row as Python strings.
+
+    Indexing or iterating builds a ToolCall equal to the one appended, so
+    code written against ``list[ToolCall]`` (``report``, ``review_pack``,
+    the cache update) works unchanged. The rows are copies: changes to
+    them are not written back.
+    """
+
+    def __init__(self, tool_calls: Iterable[ToolCall] = ()):
+        self._ids: list[str] = []
+        self._strings = _Interner()
+        self._tool_name = array("I")
+        self._cache_key = array("I")
+        self._log_file = array("I")
+        self._run_id = array("I")
+        self._iter_id = array("I")
+        self._status = array("b")
+        self._source = array("b")
+        self._exit_code = array("q")
+        self._start_us = array("q")
+        self._start_tz = array("i")
+        self._end_us = array("q")
+        self._end_tz = array("i")
+        self._duration_ms = array("q")
+        self._line_start = array("q")
+        self._line_end = array("q")
+        self._args_excerpt: list[Optional[str]] = []
+        self._args_raw: list[Optional[str]] = []
+        self._error_excerpt: list[Optional[str]] = []
+        self.extend(tool_calls)
+
+    def append(self, tc: ToolCall) -> None:
+        """Store one call."""
+        intern = self._strings.code
+        self._ids.append(tc.id)
+        self._tool_name.append(intern(tc.tool_name))
+        self._cache_key.append(intern(tc.cache_key))
+        self._log_file.append(intern(tc.log_file))
+        self._run_id.append(intern(tc.run_id))
+        self._iter_id.append(intern(tc.iter_id))
+        self._status.append(_STATUS_CODES[tc.status])
+        self._source.append(_SOURCE_CODES[tc.source])
+        self._exit_code.append(_int_or_null(tc.exit_code))
+        for us_col, tz_col, dt in (
+            (self._start_us, self._start_tz, tc.start_ts),
+            (self._end_us, self._end_tz, tc.end_ts),
+        ):
+            us, tz = _encode_ts(dt)
+            us_col.append(us)
+            tz_col.append(tz)
+        self._duration_ms.append(_int_or_null(tc.duration_ms))
+        line_range = tc.line_range or (None, None)
+        self._line_start.append(_int_or_null(line_range[0]))
+        self._line_end.append(_int_or_null(line_range[1]))
+        self._args_excerpt.append(tc.args_excerpt)
+        self._args_raw.append(tc.args_raw)
+        self._error_excerpt.append(tc.error_excerpt)
+
+    def extend(self, tool_calls: Iterable[ToolCall]) -> None:
+        """Store every call from an iterable."""
+        for tc in tool_calls:
+            self.append(tc)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> ToolCall: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ToolCall]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ToolCallTable index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[ToolCall]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def _row(self, i: int) -> ToolCall:
+        """Rebuild row ``i`` as a ToolCall."""
+        strings = self._strings.values
+        line_start, line_end = self._line_start[i], self._line_end[i]
+        return ToolCall(
+            id=self._ids[i],
+            tool_name=strings[self._tool_name[i]],
+            status=_STATUSES[self._status[i]],
+            source=_SOURCES[self._source[i]],
+            exit_code=_null_or_int(self._exit_code[i]),
+            start_ts=_decode_ts(self._start_us[i], self._start_tz[i]),
+            end_ts=_decode_ts(self._end_us[i], self._end_tz[i]),
+            duration_ms=_null_or_int(self._duration_ms[i]),
+            cache_key=strings[self._cache_key[i]],
+            args_excerpt=self._args_excerpt[i],
+            # Left undecoded; only the report writer needs the excerpt
+            args_raw=self._args_raw[i],
+            error_excerpt=self._error_excerpt[i],
+            log_file=strings[self._log_file[i]],
+            line_range=(
+                None if line_start == NULL else (line_start, _null_or_int(line_end))
+            ),
+            run_id=strings[self._run_id[i]],
+            iter_id=strings[self._iter_id[i]],
+        )
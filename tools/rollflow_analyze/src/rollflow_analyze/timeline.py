@@ -0,0 +1,315 @@
+"""Per-iteration timelines: where each Ralph iteration's wall time goes.
+
+``build_iterations`` groups ToolCalls into ``Iteration`` objects, using the
+ITER/PHASE markers collected by ``MarkerParser`` for boundaries and phases
+where the logs have them, and ``analyze_timeline`` lays each iteration's calls
+out on a time line:
+
+* wall time vs. the summed duration of its tool calls
+* busy time (some call running) vs. idle time, the gaps in which the agent
+  is thinking or the loop is doing unmarked work
+* calls that ran concurrently, and how many at once
+* the critical path: the longest chain of calls that ran one after another
+"""
+
+from bisect import bisect_right
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
+
+from .models import Iteration, IterationTimeline, TimelineGap, ToolCall
+
+# Idle gaps listed per iteration, longest first
+LONGEST_GAPS_LIMIT = 5
+
+# TOOL markers carry whole-second timestamps. When every call in an iteration
+# is timed that coarsely, calls closer than this are taken to be back to back
+# rather than overlapping.
+SECOND_RESOLUTION_SLACK_MS = 1000
+
+
+def _epoch_ms(ts: datetime) -> float:
+    """Milliseconds since the epoch (naive datetimes are local time)."""
+    return ts.timestamp() * 1000
+
+
+def _whole_seconds(*stamps: Optional[datetime]) -> bool:
+    return all(ts is None or ts.microsecond == 0 for ts in stamps)
+
+
+def call_interval(tc: ToolCall) -> Optional[tuple[float, float]]:
+    """(start_ms, end_ms) of a call from whichever timestamps it has.
+
+    A start plus ``duration_ms`` is preferred, since marker timestamps only
+    have whole seconds. Returns None for calls that cannot be placed.
+    """
+    duration = tc.duration_ms
+    if tc.start_ts is not None:
+        start = _epoch_ms(tc.start_ts)
+        if duration is not None:
+            return start, start + duration
+        if tc.end_ts is not None:
+            return start, max(start, _epoch_ms(tc.end_ts))
+        return None
+    if tc.end_ts is not None and duration is not None:
+        end = _epoch_ms(tc.end_ts)
+        return end - duration, end
+    return None
+
+
+def _union(spans: Iterable[tuple[float, float]]) -> list[list[float]]:
+    """Merge spans (sorted by start) into disjoint [start, end] segments."""
+    merged: list[list[float]] = []
+    for start, end in spans:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _critical_path(spans: Sequence[tuple[float, float, float, str]]) -> tuple:
+    """Heaviest chain of spans each starting after the previous one ended.
+
+    Weighted interval scheduling over (start, end, weight, name) spans.
+
+    Returns:
+        (total weight, names in time order)
+    """
+    order = sorted(range(len(spans)), key=lambda k: spans[k][1])
+    ends = [spans[k][1] for k in order]
+    best: list[float] = []
+    back: list[int] = []
+    # Index (into order) of the heaviest chain ending at or before each entry
+    leader: list[int] = []
+    for i, k in enumerate(order):
+        prev = bisect_right(ends, spans[k][0], 0, i) - 1
+        prev = leader[prev] if prev >= 0 else -1
+        best.append(spans[k][2] + (best[prev] if prev >= 0 else 0))
+        back.append(prev)
+        leader.append(i if not leader or best[i] > best[leader[-1]] else leader[-1])
+    if not leader:
+        return 0, []
+    names: list[str] = []
+    i = leader[-1]
+    total = best[i]
+    while i >= 0:
+        names.append(spans[order[i]][3])
+        i = back[i]
+    names.reverse()
+    return total, names
+
+
+def analyze_timeline(
+    tool_calls: Iterable[ToolCall],
+    start_ts: Optional[datetime] = None,
+    end_ts: Optional[datetime] = None,
+) -> IterationTimeline:
+    """Lay one iteration's calls out on a time line.
+
+    Args:
+        tool_calls: The iteration's calls
+        start_ts: Iteration start (from ITER_START); defaults to the first call
+        end_ts: Iteration end (from ITER_END); defaults to the last call
+
+    Returns:
+        IterationTimeline for the iteration
+    """
+    timeline = IterationTimeline()
+    spans: list[tuple[float, float, str]] = []
+    coarse = True
+    for tc in tool_calls:
+        interval = call_interval(tc)
+        if interval is None:
+            timeline.untimed_calls += 1
+            if tc.duration_ms is None:
+                continue
+            ms = tc.duration_ms
+        else:
+            spans.append((interval[0], interval[1], tc.tool_name))
+            coarse = coarse and _whole_seconds(tc.start_ts, tc.end_ts)
+            ms = round(interval[1] - interval[0])
+        timeline.tool_ms += ms
+        by_tool = timeline.tool_ms_by_tool
+        by_tool[tc.tool_name] = by_tool.get(tc.tool_name, 0) + ms
+    timeline.timed_calls = len(spans)
+    timeline.tool_ms_by_tool = dict(
+        sorted(timeline.tool_ms_by_tool.items(), key=lambda x: x[1], reverse=True)
+    )
+
+    window_start = _epoch_ms(start_ts) if start_ts else None
+    window_end = _epoch_ms(end_ts) if end_ts else None
+    if spans:
+        if window_start is None:
+            window_start = min(s for s, _, _ in spans)
+        if window_end is None:
+            window_end = max(e for _, e, _ in spans)
+    if window_start is None or window_end is None or window_end < window_start:
+        return timeline
+    timeline.wall_ms = round(window_end - window_start)
+
+    # Busy time and idle gaps, within the iteration's window
+    spans.sort()
+    busy = _union((max(s, window_start), min(e, window_end)) for s, e, _ in spans)
+    timeline.busy_ms = round(sum(e - s for s, e in busy))
+    timeline.idle_ms = max(0, timeline.wall_ms - timeline.busy_ms)
+    gaps: list[tuple[float, float]] = []
+    cursor = window_start
+    for s, e in busy + [[window_end, window_end]]:
+        if s > cursor:
+            gaps.append((s - cursor, cursor))
+        cursor = max(cursor, e)
+    gaps.sort(reverse=True)
+    timeline.longest_gaps = [
+        TimelineGap(
+            start_ts=datetime.fromtimestamp(at / 1000, timezone.utc),
+            duration_ms=round(ms),
+        )
+        for ms, at in gaps[:LONGEST_GAPS_LIMIT]
+    ]
+
+    # Concurrency, with whole-second timestamps not counted as overlap
+    slack = SECOND_RESOLUTION_SLACK_MS if coarse else 0
+    shrunk = [(s, max(s, e - slack), name) for s, e, name in spans]
+    shrunk_union = _union((s, e) for s, e, _ in shrunk)
+    timeline.overlap_ms = round(
+        sum(e - s for s, e, _ in shrunk) - sum(e - s for s, e in shrunk_union)
+    )
+    events = sorted(
+        [(s, 1) for s, e, _ in shrunk if e > s]
+        + [(e, -1) for s, e, _ in shrunk if e > s]
+    )
+    running = 0
+    timeline.max_concurrency = 1 if spans else 0
+    for _, delta in events:
+        running += delta
+        timeline.max_concurrency = max(timeline.max_concurrency, running)
+    overlapping = 0
+    reach = float("-inf")
+    for i, (s, e, _) in enumerate(shrunk):
+        overlaps_earlier = s < reach
+        overlaps_later = i + 1 < len(shrunk) and shrunk[i + 1][0] < e
+        if overlaps_earlier or overlaps_later:
+            overlapping += 1
+        reach = max(reach, e)
+    timeline.overlapping_calls = overlapping
+
+    total, names = _critical_path(
+        [(s, se, e - s, name) for (s, e, name), (_, se, _) in zip(spans, shrunk)]
+    )
+    timeline.critical_path_ms = round(total)
+    timeline.critical_path = names
+    return timeline
+
+
+def _copy_mark(mark: Iteration) -> Iteration:
+    return replace(mark, phases=[replace(p) for p in mark.phases], tool_calls=[])
+
+
+def _join_mark(into: Iteration, part: Iteration) -> None:
+    """Fold the part of an iteration seen in a later file into ``into``."""
+    if into.start_ts is None:
+        into.start_ts = part.start_ts
+    if part.end_ts is not None:
+        into.end_ts = part.end_ts
+    for phase in part.phases:
+        opened = next(
+            (
+                p
+                for p in reversed(into.phases)
+                if p.name == phase.name and p.end_ts is None
+            ),
+            None,
+        )
+        if opened is not None and phase.start_ts is None:
+            # PHASE_START in one file, PHASE_END in the next
+            opened.end_ts = phase.end_ts
+            opened.status = phase.status
+            opened.exit_code = phase.exit_code
+            if opened.start_ts is not None and opened.end_ts is not None:
+                opened.duration_ms = round(
+                    (opened.end_ts - opened.start_ts).total_seconds() * 1000
+                )
+        else:
+            into.phases.append(replace(phase))
+    into.phase = part.phase or into.phase
+
+
+def build_iterations(
+    tool_calls: Iterable[ToolCall],
+    marks: Iterable[Iteration] = (),
+    keep_calls: bool = True,
+) -> list[Iteration]:
+    """Group calls into iterations and analyze each one's timeline.
+
+    Calls are matched to iterations by ``(run_id, iter_id)``. Calls without
+    an ``iter_id`` (RovoDev tool calls) are placed by time into the marked
+    iteration whose ITER_START..ITER_END span contains their start.
+    Iterations only known from their calls' ``iter_id`` span their first to
+    last call.
+
+    Args:
+        tool_calls: All parsed calls
+        marks: Iterations from ``MarkerParser.iterations``, in log order; the
+            same iteration may appear once per file it spans
+        keep_calls: Attach the calls to ``Iteration.tool_calls``. With False
+            they are only used for the timeline.
+
+    Returns:
+        Iterations in order of first appearance (markers, then calls)
+    """
+    iterations: dict[tuple[Optional[str], str], Iteration] = {}
+    for mark in marks:
+        iter_id = mark.iter_id if mark.iter_id is not None else str(mark.iter_num)
+        key = (mark.run_id, iter_id)
+        if key in iterations:
+            _join_mark(iterations[key], mark)
+        else:
+            iterations[key] = _copy_mark(mark)
+    for it in iterations.values():
+        if it.duration_ms is None and it.start_ts and it.end_ts:
+            it.duration_ms = round((it.end_ts - it.start_ts).total_seconds() * 1000)
+
+    # Marked spans, for placing calls that carry no iteration id
+    windows = sorted(
+        (
+            (_epoch_ms(it.start_ts), _epoch_ms(it.end_ts), it)
+            for it in iterations.values()
+            if it.start_ts is not None and it.end_ts is not None
+        ),
+        key=lambda w: w[:2],
+    )
+    window_starts = [w[0] for w in windows]
+
+    for tc in tool_calls:
+        if tc.iter_id is not None:
+            key = (tc.run_id, tc.iter_id)
+            iteration = iterations.get(key)
+            if iteration is None:
+                num = int(tc.iter_id) if tc.iter_id.isdigit() else len(iterations)
+                iteration = iterations[key] = Iteration(iter_num=num, run_id=tc.run_id)
+            iteration.tool_calls.append(tc)
+            continue
+        interval = call_interval(tc)
+        if interval is None or not windows:
+            continue
+        i = bisect_right(window_starts, interval[0]) - 1
+        if i >= 0 and interval[0] <= windows[i][1]:
+            windows[i][2].tool_calls.append(tc)
+
+    for iteration in iterations.values():
+        calls = iteration.tool_calls
+        iteration.timeline = analyze_timeline(
+            calls, iteration.start_ts, iteration.end_ts
+        )
+        if iteration.start_ts is None and calls:
+            starts = [tc.start_ts for tc in calls if tc.start_ts is not None]
+            ends = [tc.end_ts for tc in calls if tc.end_ts is not None]
+            iteration.start_ts = min(starts, key=_epoch_ms, default=None)
+            iteration.end_ts = max(ends, key=_epoch_ms, default=None)
+            iteration.duration_ms = iteration.timeline.wall_ms or None
+        if not keep_calls:
+            iteration.tool_calls = []
+    return list(iterations.values())
@@ -0,0 +1,78 @@
+"""Wall-time benchmark for CacheDB writes: one call at a time vs batched.
+
+Builds N synthetic calls (about 1 in 7 FAIL, the rest PASS with cache keys
+repeating every 5,000 calls) and records them:
+
+* per call, with ``upsert_pass`` / ``log_fail`` (a connection and commit each)
+* in bulk, with ``upsert_pass_many`` / ``log_fail_many`` (one transaction each)
+
+Usage:
+    python tests/bench_cache_db.py              # 100,000 calls
+    python tests/bench_cache_db.py --calls 20000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.cache_db import CacheDB  # noqa: E402
+from rollflow_analyze.models import ToolCall, ToolStatus  # noqa: E402
+
+
+def _calls(n: int) -> list[ToolCall]:
+    start = datetime(2026, 1, 25, 12, 0, 0)
+    tools = ["verifier", "pre-commit", "fix-markdown", "bash", "grep"]
+    return [
+        ToolCall(
+            id=f"call-{i:08d}",
+            tool_name=tools[i % len(tools)],
+            status=ToolStatus.PASS if i % 7 else ToolStatus.FAIL,
+            exit_code=0 if i % 7 else 1,
+            end_ts=start + timedelta(seconds=i),
+            duration_ms=250,
+            cache_key=f"{tools[i % len(tools)]}|{i % 5000:04x}",
+            error_excerpt=None if i % 7 else "assertion failed in test_foo",
+        )
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--calls", type=int, default=100_000, help="Number of calls")
+    args = ap.parse_args()
+
+    calls = _calls(args.calls)
+    passes = [tc for tc in calls if tc.status == ToolStatus.PASS]
+    fails = [tc for tc in calls if tc.status == ToolStatus.FAIL]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CacheDB(Path(tmp) / "single.sqlite")
+        start = time.perf_counter()
+        for tc in passes:
+            db.upsert_pass(tc)
+        for tc in fails:
+            db.log_fail(tc)
+        single_s = time.perf_counter() - start
+        single_stats = db.get_stats()
+
+        db = CacheDB(Path(tmp) / "batched.sqlite")
+        start = time.perf_counter()
+        db.upsert_pass_many(passes)
+        db.log_fail_many(fails)
+        batched_s = time.perf_counter() - start
+        assert db.get_stats() == single_stats, "batched writes differ"
+
+    print(f"{args.calls} calls ({len(passes)} PASS, {len(fails)} FAIL)")
+    print(f"one connection per call: {single_s:8.2f}s")
+    print(f"batched (executemany):   {batched_s:8.2f}s  ({single_s / batched_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Contention benchmark for the shared cache DB: concurrent writers and readers.
+
+Starts W writer and R reader processes against one database file, as several
+loops plus their cache.sh lookups would. Writers alternate ``upsert_pass`` and
+``log_fail``; readers call ``lookup_pass`` on keys the writers produce. It is
+run twice:
+
+* legacy: a fresh connection per operation, rollback journal, FULL sync
+* current: ``CacheDB`` (one WAL-mode connection per process, NORMAL sync,
+  mmap, busy timeout)
+
+and reports wall time, operations per second and "database is locked"
+errors for each.
+
+Usage:
+    python tests/bench_cache_db_contention.py               # 8 writers, 8 readers
+    python tests/bench_cache_db_contention.py --ops 2000 --writers 4 --readers 16
+"""
+
+import argparse
+import multiprocessing as mp
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.cache_db import CacheDB  # noqa: E402
+from rollflow_analyze.models import ToolCall, ToolStatus  # noqa: E402
+
+KEYS = 500
+
+
+class LegacyCacheDB(CacheDB):
+    """CacheDB as it was: a new default-journal connection per operation."""
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def _call(worker: int, i: int) -> ToolCall:
+    status = ToolStatus.FAIL if i % 4 == 0 else ToolStatus.PASS
+    return ToolCall(
+        id=f"w{worker}-{i}",
+        tool_name="verifier",
+        status=status,
+        exit_code=1 if status == ToolStatus.FAIL else 0,
+        end_ts=datetime(2026, 1, 25, 12) + timedelta(seconds=i),
+        duration_ms=250,
+        cache_key=f"verifier|{(worker * 7919 + i) % KEYS:04x}",
+        error_excerpt="assertion failed" if status == ToolStatus.FAIL else None,
+    )
+
+
+def _worker(cls, db_path: Path, role: str, worker: int, ops: int, start, out) -> None:
+    db = cls(db_path)
+    errors = 0
+    start.wait()
+    for i in range(ops):
+        try:
+            if role == "reader":
+                db.lookup_pass(f"verifier|{(worker * 31 + i) % KEYS:04x}")
+            else:
+                tc = _call(worker, i)
+                if tc.status == ToolStatus.PASS:
+                    db.upsert_pass(tc)
+                else:
+                    db.log_fail(tc)
+        except sqlite3.OperationalError:
+            errors += 1
+    db.close()
+    out.put(errors)
+
+
+def _run(cls, writers: int, readers: int, ops: int, busy_timeout: float) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "cache.sqlite"
+        cls(db_path, busy_timeout=busy_timeout).close()
+        start = mp.Barrier(writers + readers + 1)
+        out = mp.Queue()
+        roles = ["writer"] * writers + ["reader"] * readers
+        procs = [
+            mp.Process(target=_worker, args=(cls, db_path, role, n, ops, start, out))
+            for n, role in enumerate(roles)
+        ]
+        for p in procs:
+            p.start()
+        start.wait()
+        t0 = time.perf_counter()
+        errors = sum(out.get() for _ in procs)
+        for p in procs:
+            p.join()
+        return time.perf_counter() - t0, errors
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--ops", type=int, default=1000, help="Operations per process")
+    ap.add_argument("--writers", type=int, default=8, help="Writer processes")
+    ap.add_argument("--readers", type=int, default=8, help="Reader processes")
+    ap.add_argument(
+        "--busy-timeout", type=float, default=5.0, help="Seconds to wait on a lock"
+    )
+    args = ap.parse_args()
+
+    total = args.ops * (args.writers + args.readers)
+    print(
+        f"{args.writers} writers + {args.readers} readers, "
+        f"{args.ops:,} ops each ({total:,} total)"
+    )
+    results = {}
+    for label, cls in (("legacy", LegacyCacheDB), ("current", CacheDB)):
+        elapsed, errors = _run(
+            cls, args.writers, args.readers, args.ops, args.busy_timeout
+        )
+        results[label] = elapsed
+        print(
+            f"  {label:<8} {elapsed:8.2f}s  {total / elapsed:10,.0f} ops/s  "
+            f"{errors} lock errors"
+        )
+    print(f"  speedup  {results['legacy'] / results['current']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
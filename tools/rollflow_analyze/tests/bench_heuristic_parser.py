@@ -0,0 +1,128 @@
+"""Throughput benchmark for HeuristicParser pattern matching.
+
+Generates a synthetic legacy log (mostly build chatter with tool start,
+status and error lines mixed in) and compares:
+
+* the old per-pattern loop (every pattern of a category tried in turn,
+  no prefilter)
+* ``HeuristicParser`` with one combined regex per category and the
+  literal-substring prefilter
+
+Usage:
+    python tests/bench_heuristic_parser.py              # 100 MB synthetic log
+    python tests/bench_heuristic_parser.py --mb 20
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.parsers.heuristic_parser import HeuristicParser  # noqa: E402
+
+_CHATTER = [
+    "  compiling module src/rollflow_analyze/report.py",
+    "  collected 41 items",
+    "  writing artifacts/rollflow_reports/latest.json",
+    "  checked 12 files in 0.31s",
+    "  downloading dependency 3 of 17",
+    "  tests/test_marker_parser.py ........",
+]
+
+_TOOL_LINES = [
+    ["Running tool: {tool}", "PASSED", "exit code: 0"],
+    ["[TOOL] {tool}", "Error: assertion failed in test_foo", "[FAIL]", "exit=1"],
+    ["Executing: {tool}", "Traceback (most recent call last)", "FAILED"],
+]
+
+
+def generate_log(path: Path, target_bytes: int, seed: int = 0) -> None:
+    """Write a synthetic legacy log of roughly ``target_bytes``."""
+    rng = random.Random(seed)
+    tools = ["shellcheck", "pytest", "markdownlint", "ruff"]
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target_bytes:
+            chunk = [f"{rng.choice(_CHATTER)}\n" for _ in range(rng.randint(10, 40))]
+            block = rng.choice(_TOOL_LINES)
+            chunk.insert(0, block[0].format(tool=rng.choice(tools)) + "\n")
+            chunk.extend(f"{line}\n" for line in block[1:])
+            text = "".join(chunk)
+            f.write(text)
+            written += len(text)
+
+
+class _PerPatternParser(HeuristicParser):
+    """HeuristicParser as it was: each pattern tried in turn, no prefilter."""
+
+    def __init__(self):
+        super().__init__()
+        self._prefilter = None
+
+    def _match_tool_start(self, line):
+        for pattern in self._compiled.get("tool_start", []):
+            if match := pattern.search(line):
+                return match.group("name")
+        return None
+
+    def _match_pass(self, line):
+        return any(p.search(line) for p in self._compiled.get("tool_pass", []))
+
+    def _match_fail(self, line):
+        return any(p.search(line) for p in self._compiled.get("tool_fail", []))
+
+    def _extract_exit_code(self, line):
+        for pattern in self._compiled.get("exit_code", []):
+            if match := pattern.search(line):
+                return int(match.group("code"))
+        return None
+
+    def _extract_error(self, line):
+        for pattern in self._compiled.get("error_msg", []):
+            if match := pattern.search(line):
+                return match.group("msg")
+        return None
+
+
+def _time(parser: HeuristicParser, path: Path) -> tuple[float, list]:
+    start = time.perf_counter()
+    calls = list(parser.parse_file(path))
+    return time.perf_counter() - start, calls
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mb", type=int, default=100, help="Synthetic log size in MB")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "legacy.log"
+        generate_log(path, args.mb * 1024 * 1024)
+        size_mb = path.stat().st_size / (1024 * 1024)
+
+        old_s, old_calls = _time(_PerPatternParser(), path)
+        new_s, new_calls = _time(HeuristicParser(), path)
+
+        def key(calls):
+            return [
+                (c.tool_name, c.status, c.exit_code, c.error_excerpt, c.line_range)
+                for c in calls
+            ]
+
+        assert key(old_calls) == key(new_calls), "combined parser output differs"
+
+        print(f"log: {size_mb:.0f} MB, {len(new_calls)} tool calls")
+        print(f"per-pattern loop:    {old_s:7.2f}s  {size_mb / old_s:7.1f} MB/s")
+        print(
+            f"combined+prefilter:  {new_s:7.2f}s  {size_mb / new_s:7.1f} MB/s"
+            f"  ({old_s / new_s:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
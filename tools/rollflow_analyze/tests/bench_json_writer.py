@@ -0,0 +1,90 @@
+"""Peak-memory benchmark for writing the JSON report.
+
+Compares, for N synthetic tool calls:
+
+* the old writer: convert the whole report to nested dicts, then
+  ``json.dump(..., indent=2)``
+* ``write_json_report`` (one tool call encoded at a time)
+
+Usage:
+    python tests/bench_json_writer.py              # 200,000 calls
+    python tests/bench_json_writer.py --calls 50000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.models import ToolCall, ToolStatus  # noqa: E402
+from rollflow_analyze.report import (  # noqa: E402
+    _to_json_dict,
+    build_report,
+    write_json_report,
+)
+
+
+def _calls(n: int):
+    start = datetime(2026, 1, 25, 12, 0, 0)
+    tools = ["verifier", "pre-commit", "fix-markdown", "bash", "grep"]
+    for i in range(n):
+        ts = start + timedelta(seconds=i)
+        yield ToolCall(
+            id=f"call-{i:08d}",
+            tool_name=tools[i % len(tools)],
+            status=ToolStatus.PASS if i % 7 else ToolStatus.FAIL,
+            exit_code=0 if i % 7 else 1,
+            start_ts=ts,
+            end_ts=ts + timedelta(milliseconds=250),
+            duration_ms=250,
+            cache_key=f"{tools[i % len(tools)]}|{i % 500:04x}",
+            error_excerpt=None if i % 7 else "assertion failed in test_foo",
+            log_file=f"logs/iter_{i // 1000:03d}.log",
+            line_range=(i, i + 3),
+        )
+
+
+def _old_write(report, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_to_json_dict(report), f, indent=2)
+
+
+def _measure(label: str, write) -> None:
+    start = time.perf_counter()
+    write()
+    elapsed = time.perf_counter() - start
+    # Separate traced run; tracemalloc slows everything down
+    tracemalloc.start()
+    write()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:34s} peak {peak / (1024 * 1024):8.1f} MB  {elapsed:6.2f}s")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--calls", type=int, default=200_000, help="Number of calls")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "report.json"
+        report = build_report(list(_calls(args.calls)))
+        print(f"{args.calls} calls (peak excludes the calls already in memory)")
+        _measure("dict tree + json.dump(indent=2)", partial(_old_write, report, out))
+        _measure("write_json_report (pretty)", partial(write_json_report, report, out))
+        _measure(
+            "write_json_report (ndjson)",
+            partial(write_json_report, report, out, json_format="ndjson"),
+        )
+
+
+if __name__ == "__main__":
+    main()
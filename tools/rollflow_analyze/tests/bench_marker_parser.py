@@ -0,0 +1,133 @@
+"""Micro-benchmark for MarkerParser marker dispatch.
+
+Compares the old per-prefix ``startswith`` cascade (one compiled regex per
+marker) against the combined ``RE_MARKER`` dispatch, then measures end-to-end
+``MarkerParser.parse_file`` throughput on a synthetic log.
+
+Usage:
+    python tests/bench_marker_parser.py              # 1M-line synthetic log
+    python tests/bench_marker_parser.py --lines 200000
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.parsers.marker_parser import (  # noqa: E402
+    MARKER_PREFIXES,
+    RE_MARKER,
+    RE_MARKER_KV,
+    MarkerParser,
+)
+
+# Baseline: one anchored regex per marker, probed in declaration order
+_LEGACY_RES = [
+    (p, re.compile(r"^" + re.escape(p) + r"\s+(?P<kv>.+)$")) for p in MARKER_PREFIXES
+]
+
+
+def _legacy_route(line: str) -> str | None:
+    """Route a line the way the startswith cascade used to."""
+    if not line.startswith("::"):
+        return None
+    if not any(line.startswith(p) for p in MARKER_PREFIXES):
+        return None
+    for prefix, regex in _LEGACY_RES:
+        if line.startswith(prefix):
+            m = regex.match(line)
+            return prefix if m else None
+    return None
+
+
+def _dispatch_route(line: str) -> str | None:
+    """Route a line through the combined marker regex."""
+    if not line.startswith("::"):
+        return None
+    m = RE_MARKER.match(line)
+    if not m or not RE_MARKER_KV.match(line, m.end()):
+        return None
+    return m.group()
+
+
+def generate_log(path: Path, num_lines: int, seed: int = 0) -> None:
+    """Write a synthetic Ralph log with ~20% marker lines."""
+    rng = random.Random(seed)
+    tools = ["verifier", "pre-commit", "fix-markdown", "acli_rovodev"]
+    with open(path, "w", encoding="utf-8") as f:
+        written = 0
+        call = 0
+        while written < num_lines:
+            if rng.random() < 0.1:
+                f.write(
+                    f":::ITER_START::: iter={call} run_id=run_bench "
+                    "ts=2026-01-25T12:00:00Z\n"
+                    f":::CACHE_GUARD::: iter={call} allowed=1 reason=no_pending_tasks "
+                    "phase=BUILD ts=1737891050\n"
+                )
+                written += 2
+            call += 1
+            tool = rng.choice(tools)
+            f.write(
+                f":::TOOL_START::: id=t{call} tool={tool} cache_key=k{call % 97} "
+                "git_sha=abc123 ts=2026-01-25T12:00:00Z\n"
+            )
+            body = rng.randint(4, 12)
+            for i in range(body):
+                f.write(f"[{tool}] processing item {i} of {body}: ok\n")
+            result = "PASS" if rng.random() < 0.9 else "FAIL"
+            f.write(
+                f":::TOOL_END::: id=t{call} result={result} exit=0 "
+                f"duration_ms={rng.randint(10, 5000)} ts=2026-01-25T12:00:01Z\n"
+            )
+            written += body + 2
+
+
+def _time(fn, lines: list[str]) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        fn(line)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "bench.log"
+        generate_log(log_path, args.lines)
+        lines = log_path.read_text().splitlines()
+        n = len(lines)
+        print(f"Synthetic log: {n:,} lines, {log_path.stat().st_size / 1e6:.1f} MB")
+
+        # Both routers must agree before timing means anything
+        for line in lines[:10_000]:
+            assert _legacy_route(line) == _dispatch_route(line), line
+
+        legacy = _time(_legacy_route, lines)
+        dispatch = _time(_dispatch_route, lines)
+        print(f"  startswith cascade: {n / legacy:12,.0f} lines/sec")
+        print(f"  RE_MARKER dispatch: {n / dispatch:12,.0f} lines/sec")
+        print(f"  speedup:            {legacy / dispatch:12.2f}x")
+
+        start = time.perf_counter()
+        calls = sum(1 for _ in MarkerParser().parse_file(log_path))
+        elapsed = time.perf_counter() - start
+        print(
+            f"  parse_file:         {n / elapsed:12,.0f} lines/sec "
+            f"({calls:,} tool calls)"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
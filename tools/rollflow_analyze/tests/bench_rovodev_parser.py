@@ -0,0 +1,146 @@
+"""Throughput benchmark for RovoDevParser line filtering and JSON decoding.
+
+Generates a synthetic RovoDev log (mostly INFO/DEBUG chatter with tool
+call/return pairs mixed in) and compares:
+
+* the old per-line loop (substring gates blanked, so both anchored regexes
+  run on every line and every request part is decoded), stdlib JSON
+* ``RovoDevParser`` with the substring prefilter and stdlib JSON
+* ``RovoDevParser`` with the prefilter and orjson (when installed)
+
+Usage:
+    python tests/bench_rovodev_parser.py              # 500 MB synthetic log
+    python tests/bench_rovodev_parser.py --mb 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.parsers import rovodev_parser  # noqa: E402
+from rollflow_analyze.parsers.rovodev_parser import RovoDevParser  # noqa: E402
+
+_CHATTER = [
+    "INFO     | Sending request to model",
+    "INFO     | Received response from model in 2.31s",
+    "DEBUG    | Token usage: input=48211 output=912 cache_read=40960",
+    "DEBUG    | Streaming chunk received (512 bytes)",
+    "INFO     | Model response tool call: bash",
+    (
+        "DEBUG    | Model request part: "
+        '{"content": "Continue with the task.", "part_kind": "user-prompt"}'
+    ),
+    "WARNING  | Retrying request after rate limit (attempt 1)",
+]
+
+
+def generate_log(path: Path, target_bytes: int, seed: int = 0) -> int:
+    """Write a synthetic RovoDev log of roughly ``target_bytes``.
+
+    Returns:
+        Number of complete tool call/return pairs written
+    """
+    rng = random.Random(seed)
+    tools = ["bash", "grep", "open_files", "find_and_replace_code"]
+    pairs = 0
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target_bytes:
+            chunk = []
+            for _ in range(rng.randint(10, 40)):
+                chunk.append(f"2026-01-25 17:10:05.978 | {rng.choice(_CHATTER)}\n")
+            pairs += 1
+            tool = rng.choice(tools)
+            call_id = f"toolu_bdrk_{pairs:08d}"
+            args = json.dumps({"command": f"rg -n pattern_{pairs} src/"})
+            call = {"tool_name": tool, "args": args, "tool_call_id": call_id}
+            chunk.append(
+                "2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: "
+                f"{json.dumps(call)}\n"
+            )
+            content = "\n".join(f"src/mod_{i}.py:{i}: match" for i in range(40))
+            ret = {
+                "tool_name": tool,
+                "content": content,
+                "tool_call_id": call_id,
+                "part_kind": "tool-return",
+            }
+            chunk.append(
+                "2026-01-25 17:10:06.033 | DEBUG    | Model request part: "
+                f"{json.dumps(ret)}\n"
+            )
+            text = "".join(chunk)
+            f.write(text)
+            written += len(text)
+    return pairs
+
+
+@contextmanager
+def _gates_disabled():
+    """Blank the substring gates so every line reaches the regexes (old loop)."""
+    saved = (
+        rovodev_parser.TOOL_CALL_TEXT,
+        rovodev_parser.TOOL_RETURN_TEXT,
+        rovodev_parser.TOOL_RETURN_KIND,
+    )
+    rovodev_parser.TOOL_CALL_TEXT = ""
+    rovodev_parser.TOOL_RETURN_TEXT = ""
+    rovodev_parser.TOOL_RETURN_KIND = ""
+    try:
+        yield
+    finally:
+        (
+            rovodev_parser.TOOL_CALL_TEXT,
+            rovodev_parser.TOOL_RETURN_TEXT,
+            rovodev_parser.TOOL_RETURN_KIND,
+        ) = saved
+
+
+def _timed(label: str, fn, num_bytes: int) -> float:
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {num_bytes / 1e6 / elapsed:8.1f} MB/s  ({count:,} calls)")
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, default=500, help="Log size in MB")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "rovodev.log"
+        pairs = generate_log(log_path, args.mb * 1_000_000)
+        size = log_path.stat().st_size
+        print(f"Synthetic log: {size / 1e6:.1f} MB, {pairs:,} tool calls")
+
+        def parse(fast_json: bool) -> int:
+            rovodev = RovoDevParser(fast_json=fast_json)
+            return sum(1 for _ in rovodev.parse_file(log_path))
+
+        with _gates_disabled():
+            legacy = _timed("regex on every line + json:", lambda: parse(False), size)
+
+        stdlib = _timed("prefilter + json:", lambda: parse(False), size)
+        print(f"  {'speedup vs old loop:':<28} {legacy / stdlib:8.2f}x")
+
+        if rovodev_parser.orjson is None:
+            print("  orjson not installed, skipping fast JSON mode")
+        else:
+            fast = _timed("prefilter + orjson:", lambda: parse(True), size)
+            print(f"  {'speedup vs old loop:':<28} {legacy / fast:8.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Memory benchmark for holding many ToolCalls.
+
+Builds N synthetic calls and compares the heap used by:
+
+* a list of dict-backed dataclasses (ToolCall before it was slotted)
+* a list of the slotted ``ToolCall``
+* a ``ToolCallTable`` (struct-of-arrays, interned strings)
+
+Usage:
+    python tests/bench_toolcall_memory.py              # 1,000,000 calls
+    python tests/bench_toolcall_memory.py --calls 200000
+"""
+
+import argparse
+import dataclasses
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path so the benchmark runs without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rollflow_analyze.models import ToolCall, ToolStatus  # noqa: E402
+from rollflow_analyze.table import ToolCallTable  # noqa: E402
+
+# Same fields as ToolCall, but with a per-instance __dict__
+DictToolCall = dataclasses.make_dataclass(
+    "DictToolCall",
+    [
+        (f.name, f.type)
+        if f.default is dataclasses.MISSING
+        else (f.name, f.type, f.default)
+        for f in dataclasses.fields(ToolCall)
+    ],
+)
+
+
+def _calls(n: int, cls=ToolCall):
+    start = datetime(2026, 1, 25, 12, 0, 0)
+    tools = ["verifier", "pre-commit", "fix-markdown", "bash", "grep"]
+    for i in range(n):
+        ts = start + timedelta(seconds=i)
+        yield cls(
+            id=f"call-{i:08d}",
+            tool_name=tools[i % len(tools)],
+            status=ToolStatus.PASS if i % 7 else ToolStatus.FAIL,
+            exit_code=0 if i % 7 else 1,
+            start_ts=ts,
+            end_ts=ts + timedelta(milliseconds=250),
+            duration_ms=250,
+            cache_key=f"{tools[i % len(tools)]}|{i % 500:04x}",
+            log_file=f"logs/iter_{i // 1000:03d}.log",
+            line_range=(i, i + 3),
+            run_id="run_a",
+            iter_id=str(i // 1000),
+        )
+
+
+def _measure(build) -> float:
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / (1024 * 1024)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--calls", type=int, default=1_000_000, help="Number of calls")
+    args = ap.parse_args()
+    n = args.calls
+
+    dict_mb = _measure(lambda: list(_calls(n, DictToolCall)))
+    slots_mb = _measure(lambda: list(_calls(n)))
+    table_mb = _measure(lambda: ToolCallTable(_calls(n)))
+
+    print(f"{n} calls")
+    print(f"list[dataclass with __dict__]: {dict_mb:8.1f} MB")
+    print(
+        f"list[slotted ToolCall]:        {slots_mb:8.1f} MB  ({dict_mb / slots_mb:.1f}x)"
+    )
+    print(
+        f"ToolCallTable:                 {table_mb:8.1f} MB  ({dict_mb / table_mb:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Tests for the cache lookup daemon."""
+
+import json
+import socket
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from rollflow_analyze.cache_daemon import (
+    CacheDaemonServer,
+    CacheLookup,
+    is_pass_fresh,
+    query,
+)
+from rollflow_analyze.cache_db import CacheDB, RetentionPolicy
+from rollflow_analyze.models import ToolCall, ToolStatus
+
+
+def _pass(key: str, duration_ms: int = 250) -> ToolCall:
+    return ToolCall(
+        id=key,
+        tool_name="verifier",
+        status=ToolStatus.PASS,
+        exit_code=0,
+        end_ts=datetime.now(timezone.utc),
+        duration_ms=duration_ms,
+        cache_key=key,
+    )
+
+
+@pytest.fixture
+def socket_dir():
+    # pytest's tmp_path can exceed the ~100 byte AF_UNIX path limit
+    with tempfile.TemporaryDirectory(prefix="rf") as tmp:
+        yield Path(tmp)
+
+
+class TestIsPassFresh:
+    """Hit rules shared with cache.sh."""
+
+    NOW = datetime(2026, 1, 25, 12, 0, 0)
+
+    def _row(self, hours_ago: float, meta: dict | None = None) -> dict:
+        ts = (self.NOW - timedelta(hours=hours_ago)).isoformat()
+        return {"last_pass_ts": ts, "meta_json": json.dumps(meta) if meta else None}
+
+    def test_missing_row_is_miss(self):
+        assert not is_pass_fresh(None, now=self.NOW)
+
+    def test_ttl(self):
+        assert is_pass_fresh(self._row(1), max_age_hours=2, now=self.NOW)
+        assert not is_pass_fresh(self._row(3), max_age_hours=2, now=self.NOW)
+
+    def test_git_sha_mismatch_is_miss(self):
+        row = self._row(1, {"git_sha": "abc"})
+        assert is_pass_fresh(row, "abc", now=self.NOW)
+        assert not is_pass_fresh(row, "def", now=self.NOW)
+        # Without a current SHA the check is skipped
+        assert is_pass_fresh(row, None, now=self.NOW)
+
+
+class TestCacheLookup:
+    """Protocol handling and the LRU."""
+
+    def test_protocol(self, tmp_path: Path):
+        db = CacheDB(tmp_path / "cache.sqlite")
+        db.upsert_pass(_pass("k1", duration_ms=1234))
+        lookup = CacheLookup(db)
+
+        assert lookup.handle("PING") == "PONG"
+        assert lookup.handle("PASS k1") == "HIT"
+        assert lookup.handle("PASS k1 - 24") == "HIT"
+        assert lookup.handle("PASS k2 abc 24") == "MISS"
+        assert lookup.handle("LOAD k1") == "1234"
+        assert lookup.handle("LOAD k2") == "0"
+        assert lookup.handle("PASS k1 abc soon").startswith("ERR")
+        assert lookup.handle("DROP TABLE").startswith("ERR")
+        assert json.loads(lookup.handle("STATS"))["pass_cache_entries"] == 1
+
+    def test_sees_outside_writes(self, tmp_path: Path):
+        db = CacheDB(tmp_path / "cache.sqlite")
+        lookup = CacheLookup(db)
+
+        assert lookup.handle("PASS k1") == "MISS"
+        assert lookup.handle("PASS k1") == "MISS"
+
+        # Another process records a pass; the cached miss must not survive it
+        CacheDB(db.db_path).upsert_pass(_pass("k1"))
+        assert lookup.handle("PASS k1") == "HIT"
+
+
+class TestCacheDaemonServer:
+    """End-to-end over a Unix socket."""
+
+    def test_query_over_socket(self, tmp_path: Path, socket_dir: Path):
+        db = CacheDB(tmp_path / "cache.sqlite")
+        db.upsert_pass(_pass("k1"))
+        server = CacheDaemonServer(socket_dir / "cache.sock", CacheLookup(db))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert query(server.socket_path, "PASS k1") == "HIT"
+            assert query(server.socket_path, "PASS nope") == "MISS"
+            # A second daemon refuses to take over a live socket
+            with pytest.raises(RuntimeError, match="already running"):
+                CacheDaemonServer(server.socket_path, CacheLookup(db))
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert not server.socket_path.exists()
+
+    def test_stale_socket_is_replaced(self, tmp_path: Path, socket_dir: Path):
+        path = socket_dir / "cache.sock"
+        with socket.socket(socket.AF_UNIX) as dead:
+            dead.bind(str(path))
+        assert path.exists()
+
+        server = CacheDaemonServer(path, CacheLookup(CacheDB(tmp_path / "c.sqlite")))
+        server.server_close()
+
+    def test_no_daemon_raises(self, socket_dir: Path):
+        with pytest.raises(OSError):
+            query(socket_dir / "missing.sock", "PING")
+
+    def test_service_actions_trim_in_slices(self, tmp_path: Path, socket_dir: Path):
+        db = CacheDB(tmp_path / "cache.sqlite")
+        db.upsert_pass_many(_pass(f"k{i}") for i in range(20))
+        policy = RetentionPolicy(max_pass_rows_per_tool=5, batch_size=2)
+        server = CacheDaemonServer(socket_dir / "c.sock", CacheLookup(db), policy)
+        try:
+            server.service_actions()  # 4 batches of 2
+            assert db.get_stats()["pass_cache_entries"] == 12
+            server.service_actions()  # still behind, so it runs again at once
+            server.service_actions()
+            assert db.get_stats()["pass_cache_entries"] == 5
+        finally:
+            server.server_close()
@@ -0,0 +1,305 @@
+"""Tests for the cache database."""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from rollflow_analyze.cache_db import CacheDB, RetentionPolicy
+from rollflow_analyze.models import ToolCall, ToolStatus
+
+
+def _call(i: int, status: ToolStatus, key: str | None = "k") -> ToolCall:
+    return ToolCall(
+        id=f"t{i}",
+        tool_name="lint",
+        status=status,
+        exit_code=0 if status == ToolStatus.PASS else 1,
+        end_ts=datetime(2026, 1, 25, 12, 0, i % 60),
+        duration_ms=i * 10,
+        cache_key=key,
+        error_excerpt=None if status == ToolStatus.PASS else f"error {i}",
+    )
+
+
+class TestCacheDB:
+    """Test suite for CacheDB."""
+
+    def test_upsert_pass_many_matches_single_upserts(self, tmp_path: Path):
+        """Batched upserts leave the same rows as one upsert per call."""
+        calls = [_call(i, ToolStatus.PASS, key=f"k{i % 3}") for i in range(10)]
+        single = CacheDB(tmp_path / "single.sqlite")
+        batched = CacheDB(tmp_path / "batched.sqlite")
+
+        for tc in calls:
+            single.upsert_pass(tc)
+        written = batched.upsert_pass_many(iter(calls))
+
+        assert written == 10
+        for key in ("k0", "k1", "k2"):
+            assert batched.lookup_pass(key) == single.lookup_pass(key)
+        # Later calls for a key win
+        assert batched.lookup_pass("k0")["last_duration_ms"] == 90
+
+    def test_log_fail_many(self, tmp_path: Path):
+        """Failures are all logged, including ones without a cache key."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+
+        logged = db.log_fail_many(
+            [_call(1, ToolStatus.FAIL), _call(2, ToolStatus.FAIL, key=None)]
+        )
+
+        assert logged == 2
+        assert db.get_stats()["fail_log_entries"] == 2
+
+    def test_invalid_call_writes_nothing(self, tmp_path: Path):
+        """A bad call aborts the whole batch."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        calls = [_call(1, ToolStatus.PASS), _call(2, ToolStatus.FAIL)]
+
+        with pytest.raises(ValueError, match="Can only cache PASS"):
+            db.upsert_pass_many(calls)
+
+        assert db.get_stats()["pass_cache_entries"] == 0
+
+    def test_connection_is_tuned_and_reused(self, tmp_path: Path):
+        """One WAL-mode connection serves every query."""
+        with CacheDB(tmp_path / "cache.sqlite") as db:
+            with db._connect() as conn:
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+            db.upsert_pass(_call(1, ToolStatus.PASS))
+            db.lookup_pass("k")
+
+            assert mode == "wal"
+            assert sync == 1  # NORMAL
+            with db._connect() as again:
+                assert again is conn
+        assert db._conn is None
+
+    def test_failed_write_rolls_back(self, tmp_path: Path):
+        """An error inside a transaction leaves the shared connection usable."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        db.log_fail(_call(1, ToolStatus.FAIL))
+
+        with pytest.raises(RuntimeError), db._connect() as conn:
+            conn.execute("DELETE FROM fail_log")
+            raise RuntimeError("boom")
+        db.log_fail(_call(2, ToolStatus.FAIL))
+
+        assert db.get_stats()["fail_log_entries"] == 2
+
+    def test_threads_share_one_instance(self, tmp_path: Path):
+        """Concurrent writers on one instance are serialized, not lost."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+
+        def write(offset: int) -> None:
+            for i in range(20):
+                db.log_fail(_call(offset + i, ToolStatus.FAIL))
+
+        threads = [threading.Thread(target=write, args=(n * 20,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert db.get_stats()["fail_log_entries"] == 160
+
+    def test_lookup_cache_counts_hits_and_misses(self, tmp_path: Path):
+        """Repeated lookups, misses included, skip the database."""
+        db = CacheDB(tmp_path / "cache.sqlite", lookup_cache_size=2)
+        db.upsert_pass(_call(1, ToolStatus.PASS, key="hot"))
+
+        for _ in range(3):
+            assert db.lookup_pass("hot")["last_duration_ms"] == 10
+            assert db.lookup_pass("cold") is None
+        db.lookup_pass("other")  # evicts "hot", the least recently used
+
+        stats = db.get_stats()
+        assert stats["lookup_cache_hits"] == 4
+        assert stats["lookup_cache_misses"] == 3
+        assert stats["lookup_cache_evictions"] == 1
+        assert stats["lookup_cache_entries"] == 2
+
+    def test_upsert_invalidates_cached_miss(self, tmp_path: Path):
+        """A key cached as a miss is a hit right after it is upserted."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        assert db.lookup_pass("k") is None
+
+        db.upsert_pass(_call(1, ToolStatus.PASS))
+        assert db.lookup_pass("k")["last_duration_ms"] == 10
+
+        # Returned rows are copies, so callers can't corrupt the cache
+        db.lookup_pass("k")["last_duration_ms"] = 0
+        assert db.lookup_pass("k")["last_duration_ms"] == 10
+
+    def test_outside_commit_invalidates_lookup_cache(self, tmp_path: Path):
+        """Writes from another connection are seen on the next lookup."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        assert db.lookup_pass("k") is None
+
+        with sqlite3.connect(db.db_path) as other:
+            other.execute(
+                "INSERT INTO pass_cache VALUES ('k', 't', '2026-01-25T12:00:00', 1, NULL)"
+            )
+
+        assert db.lookup_pass("k")["last_duration_ms"] == 1
+
+    def test_failures_fingerprinted_and_counted(self, tmp_path: Path):
+        """Identical failures share one summary row and excerpt."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        calls = [_call(i, ToolStatus.FAIL) for i in range(1, 5)]
+        for i, tc in enumerate(calls):
+            tc.error_excerpt = f"/ci/run{i}/test_a.py:{i}: AssertionError"
+        calls[3].error_excerpt = "ImportError: no module named foo"
+        db.log_fail_many(calls[:2])
+        db.log_fail_many(calls[2:])
+
+        top = db.top_failures()
+
+        assert [(f["count"], f["tool_name"]) for f in top] == [(3, "lint"), (1, "lint")]
+        assert top[0]["err_excerpt"] == "/ci/run2/test_a.py:2: AssertionError"
+        assert top[0]["first_ts"] < top[0]["last_ts"]
+        assert db.top_failures(tool_name="other") == []
+        with sqlite3.connect(db.db_path) as conn:
+            rows = conn.execute("SELECT err_hash, err_excerpt FROM fail_log").fetchall()
+        assert all(h == top[0]["err_hash"] for h, _ in rows[:3])
+        assert all(excerpt is None for _, excerpt in rows)
+
+    def test_existing_failures_backfilled(self, tmp_path: Path):
+        """Failures logged before fingerprinting are hashed and summarized."""
+        path = tmp_path / "cache.sqlite"
+        with sqlite3.connect(path) as conn:
+            conn.executescript(
+                """
+                CREATE TABLE fail_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cache_key TEXT NOT NULL, tool_name TEXT NOT NULL,
+                    ts TEXT NOT NULL, exit_code INTEGER,
+                    err_hash TEXT, err_excerpt TEXT
+                );
+                INSERT INTO fail_log VALUES
+                    (NULL, 'k', 'lint', '2026-01-01', 1, NULL, 'a.py:1: boom'),
+                    (NULL, 'k', 'lint', '2026-01-02', 1, NULL, 'a.py:9: boom');
+                """
+            )
+
+        db = CacheDB(path)
+        assert db.top_failures()[0]["count"] == 2
+
+        # Retention takes deleted rows back out of the summary
+        db.evict(RetentionPolicy(max_fail_rows_per_tool=1))
+        assert db.top_failures()[0]["count"] == 1
+
+
+class TestRetention:
+    """Row counters and retention-driven eviction."""
+
+    NOW = datetime(2026, 1, 25, 12, 0, 0)
+
+    def _fill(self, db: CacheDB, tool: str, n: int, hours_ago_step: float = 1.0):
+        db.upsert_pass_many(
+            ToolCall(
+                id=f"{tool}-{i}",
+                tool_name=tool,
+                status=ToolStatus.PASS,
+                end_ts=self.NOW - timedelta(hours=i * hours_ago_step),
+                cache_key=f"{tool}|{i}",
+            )
+            for i in range(n)
+        )
+
+    def test_counters_track_replace_and_delete(self, tmp_path: Path):
+        """Counts stay exact through REPLACE, external writes and deletes."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        self._fill(db, "lint", 5)
+        self._fill(db, "lint", 3)  # replaces three keys
+        db.log_fail_many([_call(1, ToolStatus.FAIL), _call(2, ToolStatus.FAIL)])
+        with sqlite3.connect(db.db_path) as other:
+            other.execute("DELETE FROM pass_cache WHERE cache_key = 'lint|4'")
+
+        stats = db.get_stats()
+        assert stats["pass_cache_entries"] == 4
+        assert stats["fail_log_entries"] == 2
+
+    def test_counts_backfilled_for_existing_db(self, tmp_path: Path):
+        """A database created before the counters gets counted once."""
+        path = tmp_path / "cache.sqlite"
+        self._fill(CacheDB(path), "lint", 3)
+        with sqlite3.connect(path) as conn:
+            triggers = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+            ).fetchall()
+            for (name,) in triggers:
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.execute("DROP TABLE row_counts")
+            conn.execute(
+                "INSERT INTO pass_cache VALUES ('old', 'lint', '2026-01-01', 1, NULL)"
+            )
+
+        assert CacheDB(path).get_stats()["pass_cache_entries"] == 4
+
+    def test_evict_by_age(self, tmp_path: Path):
+        db = CacheDB(tmp_path / "cache.sqlite")
+        self._fill(db, "lint", 10)
+        db.log_fail(_call(1, ToolStatus.FAIL))  # logged 2026-01-25 12:00:01
+
+        deleted = db.evict(
+            RetentionPolicy(max_pass_age_hours=4.5, max_fail_age_hours=1),
+            now=self.NOW,
+        )
+
+        assert deleted == {"pass_cache": 5, "fail_log": 0}
+        assert db.lookup_pass("lint|4") is not None
+        assert db.lookup_pass("lint|5") is None
+        assert db.get_stats()["pass_cache_entries"] == 5
+
+    def test_evict_per_tool_cap_drops_least_recently_passed(self, tmp_path: Path):
+        db = CacheDB(tmp_path / "cache.sqlite")
+        self._fill(db, "lint", 6)
+        self._fill(db, "test", 2)
+        assert db.lookup_pass("lint|5") is not None  # now in the lookup LRU
+
+        deleted = db.evict(RetentionPolicy(max_pass_rows_per_tool=3))
+
+        assert deleted["pass_cache"] == 3
+        # lint|3..5 are the oldest; the LRU must not still report them
+        assert db.lookup_pass("lint|5") is None
+        assert db.lookup_pass("lint|2") is not None
+        assert db.lookup_pass("test|1") is not None
+
+    def test_evict_in_bounded_batches(self, tmp_path: Path):
+        """max_batches bounds each call; repeated calls finish the job."""
+        db = CacheDB(tmp_path / "cache.sqlite")
+        self._fill(db, "lint", 10)
+        policy = RetentionPolicy(max_pass_rows_per_tool=1, batch_size=4)
+
+        assert db.evict(policy, max_batches=1)["pass_cache"] == 4
+        assert db.evict(policy, max_batches=1)["pass_cache"] == 4
+        assert db.evict(policy)["pass_cache"] == 1
+        assert db.evict(policy)["pass_cache"] == 0
+        assert db.get_stats()["pass_cache_entries"] == 1
+
+    def test_policy_from_config(self, tmp_path: Path):
+        config = tmp_path / "config.yml"
+        config.write_text(
+            "max_cache_age_hours: 168\n"
+            "retention:\n"
+            "  max_pass_age_hours: 168\n"
+            "  max_fail_rows_per_tool: 1000\n"
+        )
+
+        policy = RetentionPolicy.from_config(config)
+
+        assert policy.max_pass_age_hours == 168
+        assert policy.max_fail_rows_per_tool == 1000
+        assert policy.max_pass_rows_per_tool is None
+        assert (
+            RetentionPolicy.from_config(tmp_path / "missing.yml") == RetentionPolicy()
+        )
+
+        config.write_text("retention:\n  max_rows: 5\n")
+        with pytest.raises(ValueError, match="max_rows"):
+            RetentionPolicy.from_config(config)
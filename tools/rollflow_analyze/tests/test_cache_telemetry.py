@@ -0,0 +1,63 @@
+"""Tests for CACHE_* marker parsing and measured hit rates."""
+
+from pathlib import Path
+
+from rollflow_analyze.cache_telemetry import build_cache_telemetry
+from rollflow_analyze.models import CacheEvent
+from rollflow_analyze.parsers.marker_parser import MarkerParser
+
+LOG = """\
+:::ITER_START::: iter=1 run_id=run_001 ts=1769342400000
+:::CACHE_CONFIG::: mode=use scope=verify,read exported=1 iter=1 ts=1769342400001
+:::CACHE_GUARD::: iter=1 allowed=0 reason=pending_tasks phase=BUILD ts=1769342400002
+:::CACHE_GUARD::: iter=1 allowed=1 reason=idempotent_check phase=PLAN ts=1769342400003
+:::CACHE_HIT::: cache_key=k1 tool=ralph saved_ms=42000 ts=2026-01-25T12:00:01Z
+:::ITER_START::: iter=2 run_id=run_001 ts=1769342460000
+:::CACHE_CONFIG::: mode=use scope=verify ts=1769342460001
+:::CACHE_MISS::: cache_key=k2 tool=ralph ts=2026-01-25T12:01:01Z
+:::CACHE_HIT::: cache_key=k3 tool=verifier ts=2026-01-25T12:01:02Z
+"""
+
+
+def test_parser_collects_cache_events(tmp_path: Path):
+    log = tmp_path / "loop.log"
+    log.write_text(LOG)
+    parser = MarkerParser()
+    assert list(parser.parse_file(log)) == []
+
+    kinds = [e.kind for e in parser.cache_events]
+    assert kinds == ["config", "guard", "guard", "hit", "config", "miss", "hit"]
+    config, blocked, _, hit = parser.cache_events[:4]
+    assert config.scope == "verify,read"
+    assert blocked.allowed is False
+    assert blocked.reason == "pending_tasks"
+    assert hit.cache_key == "k1"
+    assert hit.saved_ms == 42000
+    assert hit.iter_id == "1"
+    assert hit.run_id == "run_001"
+
+
+def test_hit_rate_per_tool_and_scope(tmp_path: Path):
+    log = tmp_path / "loop.log"
+    log.write_text(LOG)
+    parser = MarkerParser()
+    list(parser.parse_file(log))
+
+    telemetry = build_cache_telemetry(parser.cache_events)
+    assert telemetry.lookups == 3
+    assert telemetry.hits == 2
+    assert round(telemetry.hit_rate, 3) == 0.667
+    assert telemetry.time_saved_ms == 42000
+    assert telemetry.guard_checks == 2
+    assert telemetry.guard_blocked_by_reason == {"BUILD/pending_tasks": 1}
+
+    rows = {(r.tool_name, r.scope): r for r in telemetry.by_tool_scope}
+    assert rows[("ralph", "verify,read")].hit_rate == 1.0
+    assert rows[("ralph", "verify")].misses == 1
+    # A hit without saved_ms counts as a hit that saved nothing known
+    assert rows[("verifier", "verify")].time_saved_ms == 0
+
+
+def test_no_lookups_is_none():
+    assert build_cache_telemetry([]) is None
+    assert build_cache_telemetry([CacheEvent(kind="config", scope="verify")]) is None
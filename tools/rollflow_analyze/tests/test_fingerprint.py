@@ -0,0 +1,45 @@
+"""Tests for error fingerprints."""
+
+from rollflow_analyze.fingerprint import error_fingerprint, normalize_error
+
+
+class TestNormalizeError:
+    """Run-to-run noise is stripped, the cause is kept."""
+
+    def test_strips_noise(self):
+        text = (
+            "\x1b[31m2026-01-25T12:00:01Z /home/ci/repo/src/app.py:42: "
+            "KeyError at 0x7f3a2b in commit abc1234def\x1b[0m"
+        )
+        assert normalize_error(text) == (
+            "<ts> app.py:<n>: KeyError at <hex> in commit <id>"
+        )
+
+    def test_line_numbers_and_uuids(self):
+        assert (
+            normalize_error("SC2155 in workers/ralph/loop.sh line 480")
+            == "SC2155 in loop.sh line <n>"
+        )
+        assert (
+            normalize_error("call 3f2504e0-4f89-11d3-9a0c-0305e82c3301 timed out")
+            == "call <id> timed out"
+        )
+
+    def test_urls_and_words_survive(self):
+        text = "GET http://host/api/v1 failed: deadbeef not found"
+        assert normalize_error(text) == text
+
+
+class TestErrorFingerprint:
+    """Same cause, same fingerprint."""
+
+    def test_same_cause_different_run(self):
+        a = error_fingerprint("12:00:01 /tmp/a/x.py:10: AssertionError: 1 != 2")
+        b = error_fingerprint("13:45:59 /work/b/x.py:97: AssertionError: 1 != 2")
+        c = error_fingerprint("13:45:59 /work/b/x.py:97: AssertionError: 1 != 3")
+        assert a == b != c
+        assert len(a) == 16
+
+    def test_no_text_groups_by_exit_code(self):
+        assert error_fingerprint(None, 1) == error_fingerprint("  ", 1)
+        assert error_fingerprint(None, 1) != error_fingerprint(None, 2)
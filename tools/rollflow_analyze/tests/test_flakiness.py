@@ -0,0 +1,163 @@
+"""Tests for sliding-window flip rates per (tool, cache_key)."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from rollflow_analyze.checkpoint import Checkpoint, CheckpointStore
+from rollflow_analyze.flakiness import FlakinessTracker
+from rollflow_analyze.models import ToolCall, ToolStatus
+from rollflow_analyze.report import build_report, build_report_from_store
+
+P, F = ToolStatus.PASS, ToolStatus.FAIL
+
+
+def _track(statuses, window: int = 20, key: str = "k1", tool: str = "verifier"):
+    tracker = FlakinessTracker(window)
+    for status in statuses:
+        tracker.add(tool, key, status)
+    return tracker
+
+
+def test_fixed_failure_is_not_flaky():
+    # Broken, then fixed: the fix changed the cache key
+    tracker = FlakinessTracker()
+    for _ in range(3):
+        tracker.add("verifier", "before-fix", F)
+    for _ in range(3):
+        tracker.add("verifier", "after-fix", P)
+    assert tracker.flaky_keys() == []
+    assert tracker.tool_scores() == {}
+
+
+def test_flip_rate_in_window():
+    (key,) = _track([P, F, P, P, F]).flaky_keys()
+    assert (key.calls, key.window_calls, key.flips) == (5, 5, 3)
+    assert key.flip_rate == 0.75
+    assert key.score == round(3 / 8, 4)
+    assert key.last_status == F
+
+
+def test_old_flips_slide_out_of_window():
+    tracker = _track([P, F, P] + [P] * 4, window=5)
+    assert tracker.flaky_keys() == []
+    (key,) = _track([P, F, P] + [P] * 4, window=8).flaky_keys()
+    assert (key.flips, key.total_flips) == (2, 2)
+
+
+def test_ranking_prefers_steady_flipping_over_one_flip():
+    tracker = FlakinessTracker()
+    tracker.add("lint", "once", P)
+    tracker.add("lint", "once", F)
+    for status in [P, P, F] * 4:
+        tracker.add("verifier", "steady", status)
+    keys = tracker.flaky_keys()
+    # "once" has the higher raw flip rate, but too few calls to outrank
+    assert keys[0].flip_rate < keys[1].flip_rate
+    assert [k.cache_key for k in keys] == ["steady", "once"]
+    assert list(tracker.tool_scores()) == ["verifier", "lint"]
+
+
+def test_unkeyed_and_unknown_calls_are_ignored():
+    tracker = FlakinessTracker()
+    for status in [P, F, P]:
+        tracker.add("bash", None, status)
+    tracker.add("verifier", "k1", P)
+    tracker.add("verifier", "k1", ToolStatus.UNKNOWN)
+    tracker.add("verifier", "k1", P)
+    assert tracker.flaky_keys() == []
+
+
+@pytest.mark.parametrize("window", [2, 7, 64])
+def test_merged_trackers_match_single_pass(window: int):
+    rng = random.Random(window)
+    outcomes = [(rng.choice("ab"), rng.choice([P, F])) for _ in range(300)]
+    whole = FlakinessTracker(window)
+    for key, status in outcomes:
+        whole.add("t", key, status)
+
+    merged = FlakinessTracker(window)
+    for start in range(0, len(outcomes), 11):
+        part = FlakinessTracker(window)
+        for key, status in outcomes[start : start + 11]:
+            part.add("t", key, status)
+        merged.merge(part)
+
+    assert merged.flaky_keys(limit=None) == whole.flaky_keys(limit=None)
+    assert merged.tool_scores() == whole.tool_scores()
+
+
+def test_report_lists_flaky_keys():
+    calls = [
+        ToolCall(id=str(i), tool_name="verifier", status=s, cache_key="k1")
+        for i, s in enumerate([P, F, P, F])
+    ] + [ToolCall(id="x", tool_name="bash", status=s) for s in (P, F)]
+    agg = build_report(calls, flaky_window=3).aggregates
+    # bash passed and failed, but never for the same inputs
+    assert agg.flakiest_tools == ["verifier"]
+    assert agg.flakiness_window == 3
+    assert [(k.cache_key, k.flips, k.window_calls) for k in agg.flaky_keys] == [
+        ("k1", 2, 3)
+    ]
+
+
+def test_store_replays_outcomes_in_time_order(tmp_path: Path):
+    t0 = datetime(2026, 1, 25, 12, 0, tzinfo=timezone.utc)
+    calls = [
+        ToolCall(
+            id=str(i),
+            tool_name="verifier",
+            status=status,
+            start_ts=t0 + timedelta(minutes=i),
+            cache_key="k1",
+            log_file=f"iter_00{i // 3 + 1}.log",
+        )
+        for i, status in enumerate([P, P, P, F, F, F])
+    ]
+    store = CheckpointStore(tmp_path / "ingest.sqlite")
+    # The later log is ingested first
+    for path, part in (("iter_002.log", calls[3:]), ("iter_001.log", calls[:3])):
+        store.save(Checkpoint(path, "marker", 1, 0, 0.0), part, reset=False)
+
+    agg = build_report_from_store(store).aggregates
+    (key,) = agg.flaky_keys
+    # One flip (P -> F); store order would be F, F, F, P, P, P
+    assert (key.flips, key.last_status) == (1, F)
+    assert agg.flaky_keys == build_report(calls).aggregates.flaky_keys
+
+
+def test_store_and_memory_agree_on_interleaved_files(tmp_path: Path):
+    t0 = datetime(2026, 1, 25, 12, 0, tzinfo=timezone.utc)
+    statuses = [P, F, P, P, F, F, P, F]
+    calls = [
+        ToolCall(
+            id=str(i),
+            tool_name="verifier",
+            status=status,
+            # Two calls never got a start time; they sort after the rest
+            start_ts=None if i in (2, 5) else t0 + timedelta(minutes=i),
+            cache_key="k1",
+            # Even calls were logged by one worker, odd ones by another
+            log_file=f"iter_00{i % 2 + 1}.log",
+        )
+        for i, status in enumerate(statuses)
+    ]
+    by_file = [calls[0::2], calls[1::2]]
+    store = CheckpointStore(tmp_path / "ingest.sqlite")
+    for part in by_file:
+        store.save(Checkpoint(part[0].log_file, "marker", 1, 0, 0.0), part, reset=False)
+
+    stored = build_report_from_store(store).aggregates
+    in_memory = build_report(by_file[0] + by_file[1]).aggregates
+
+    # Time order P F P F P F, then the unstarted P F: 7 flips
+    assert [key.total_flips for key in stored.flaky_keys] == [7]
+    assert in_memory.flaky_keys == stored.flaky_keys
+    assert in_memory.flakiest_tools == stored.flakiest_tools
+
+
+def test_window_must_hold_a_transition():
+    with pytest.raises(ValueError):
+        FlakinessTracker(1)
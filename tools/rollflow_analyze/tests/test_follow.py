@@ -0,0 +1,197 @@
+"""Tests for --follow: tails and rolling windows."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from rollflow_analyze.follow import (
+    Follower,
+    LiveAggregates,
+    RollingWindow,
+    _Inotify,
+    _make_watcher,
+    write_snapshot,
+)
+from rollflow_analyze.models import ToolCall, ToolStatus
+
+
+def _call(tool: str = "verifier", status=ToolStatus.PASS, ms: int = 100) -> ToolCall:
+    return ToolCall(id="x", tool_name=tool, status=status, duration_ms=ms)
+
+
+def _markers(call_id: str, tool: str = "verifier", result: str = "PASS") -> str:
+    return (
+        f":::TOOL_START::: id={call_id} tool={tool} cache_key=k ts=2026-01-25T12:00:00Z\n"
+        f":::TOOL_END::: id={call_id} result={result} exit=0 duration_ms=250 "
+        "ts=2026-01-25T12:00:01Z\n"
+    )
+
+
+def _append(path: Path, text: str) -> None:
+    with open(path, "a") as f:
+        f.write(text)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRollingWindow:
+    """Slot ring expiry and per-tool metrics."""
+
+    def test_calls_expire_after_span(self):
+        window = RollingWindow(60)
+        window.add(_call(ms=100), now=1000.0)
+        window.add(_call(ms=300, status=ToolStatus.FAIL), now=1030.0)
+
+        snap = window.snapshot(now=1040.0)
+        assert snap["total_calls"] == 2
+        assert snap["fail_count"] == 1
+        assert snap["tools"]["verifier"]["avg_duration_ms"] == 200.0
+        assert snap["tools"]["verifier"]["max_duration_ms"] == 300
+
+        assert window.snapshot(now=1075.0)["total_calls"] == 1
+        assert window.snapshot(now=1100.0)["total_calls"] == 0
+
+    def test_memory_is_bounded_by_slots(self):
+        window = RollingWindow(60, slots=6)
+        for second in range(10_000):
+            window.add(_call(), now=float(second))
+        assert len(window._tools) == 6
+        # Only the last 6 ten-second slots (the current one partly) remain
+        assert window.snapshot(now=9999.0)["total_calls"] == 60
+
+    def test_windows_fed_together(self):
+        live = LiveAggregates()
+        live.add(_call("lint"), now=0.0)
+        live.add(_call("verifier"), now=600.0)
+        snap = live.snapshot(now=610.0)
+        assert snap["1m"]["total_calls"] == 1
+        assert snap["15m"]["total_calls"] == 2
+        assert list(snap["1h"]["tools"]) == ["lint", "verifier"]
+
+
+class TestFollower:
+    """Tailing the active logs."""
+
+    def test_reads_only_appended_lines(self, tmp_path: Path):
+        log = tmp_path / "iter_001.log"
+        log.write_text(_markers("old"))
+        follower = Follower(tmp_path, clock=FakeClock())
+        follower.select_files()
+
+        # What was there before following started is not counted
+        assert follower.poll() == 0
+        _append(log, _markers("t1"))
+        # A START without its END stays open until the END arrives
+        _append(log, _markers("t2").splitlines(keepends=True)[0])
+        assert follower.poll() == 1
+        _append(log, _markers("t2").splitlines(keepends=True)[1])
+        assert follower.poll() == 1
+        assert follower.snapshot()["windows"]["1m"]["total_calls"] == 2
+
+    def test_parser_keeps_no_history(self, tmp_path: Path):
+        log = tmp_path / "loop.log"
+        log.write_text("")
+        follower = Follower(tmp_path, clock=FakeClock())
+        follower.select_files()
+
+        for i in range(3):
+            _append(
+                log,
+                f":::ITER_START::: iter={i} ts=2026-01-25T12:00:00Z\n"
+                ":::CACHE_MISS::: cache_key=k tool=verifier ts=2026-01-25T12:00:00Z\n"
+                + _markers(f"t{i}"),
+            )
+            assert follower.poll() == 1
+        parser = follower.ralph._parser
+        assert len(parser.iterations) <= 1
+        assert len(parser.cache_events) <= 1
+
+    def test_switches_to_newer_log(self, tmp_path: Path):
+        first = tmp_path / "iter_001.log"
+        first.write_text("")
+        follower = Follower(tmp_path, clock=FakeClock())
+        follower.select_files()
+
+        second = tmp_path / "iter_002.log"
+        second.write_text(_markers("a") + _markers("b", result="FAIL"))
+        os.utime(second, (first.stat().st_mtime + 10,) * 2)
+        follower.select_files()
+        # A log that appears while following is read from its start
+        assert follower.ralph.path == second
+        assert follower.poll() == 2
+        assert follower.snapshot()["windows"]["1m"]["fail_count"] == 1
+
+    def test_watches_directory_of_nested_log(self, tmp_path: Path):
+        nested = tmp_path / "run_a" / "logs"
+        nested.mkdir(parents=True)
+        log = nested / "iter_001.log"
+        log.write_text("")
+        follower = Follower(tmp_path, clock=FakeClock())
+        follower.select_files()
+        assert follower.watch_dirs() == [tmp_path, nested]
+
+        watcher = _make_watcher(follower.watch_dirs())
+        try:
+            if not isinstance(watcher, _Inotify):
+                pytest.skip("inotify not available")
+            start = time.monotonic()
+            _append(log, _markers("t1"))
+            watcher.wait(5.0)
+            # Woken by the write, not the timeout
+            assert time.monotonic() - start < 2.0
+        finally:
+            watcher.close()
+
+    def test_truncated_log_is_reread(self, tmp_path: Path):
+        log = tmp_path / "loop.log"
+        log.write_text(_markers("a") * 3)
+        follower = Follower(tmp_path, clock=FakeClock())
+        follower.select_files()
+
+        log.write_text(_markers("b"))
+        assert follower.poll() == 1
+
+    def test_rovodev_log(self, tmp_path: Path):
+        rovodev_dir = tmp_path / "rovodev"
+        rovodev_dir.mkdir()
+        log = rovodev_dir / "rovodev.log"
+        log.write_text("")
+        follower = Follower(tmp_path / "none", rovodev_dir, clock=FakeClock())
+        follower.select_files()
+
+        _append(
+            log,
+            "2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: "
+            '{"tool_name": "bash", "args": "{}", "tool_call_id": "t1"}\n'
+            "2026-01-25 17:10:06.033 | DEBUG    | Model request part: "
+            '{"tool_name": "bash", "content": "ok", "tool_call_id": "t1", '
+            '"part_kind": "tool-return"}\n',
+        )
+        assert follower.poll() == 1
+        snap = follower.snapshot()
+        assert snap["files"]["rovodev"] == str(log)
+        assert snap["windows"]["1m"]["tools"]["bash"]["calls"] == 1
+
+    def test_run_emits_snapshots(self, tmp_path: Path):
+        (tmp_path / "loop.log").write_text("")
+        snapshots = []
+        Follower(tmp_path).run(snapshots.append, interval=0.05, max_refreshes=2)
+        assert len(snapshots) == 2
+        assert set(snapshots[0]["windows"]) == {"1m", "15m", "1h"}
+
+
+def test_write_snapshot_replaces_file(tmp_path: Path):
+    out = tmp_path / "live" / "follow.json"
+    write_snapshot({"n": 1}, out)
+    write_snapshot({"n": 2}, out)
+    assert json.loads(out.read_text()) == {"n": 2}
+    assert list(out.parent.iterdir()) == [out]
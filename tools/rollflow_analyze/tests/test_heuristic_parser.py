@@ -205,8 +205,94 @@ tool_start:
         finally:
             os.chdir(old_cwd)
 
+    def test_first_pattern_wins_over_leftmost_match(self, tmp_path: Path):
+        """An earlier pattern takes priority even if a later one matches first."""
+        log_file = tmp_path / "test.log"
+        log_file.write_text("go lint then build begins\nok\n")
+
+        parser = HeuristicParser(
+            patterns={
+                "tool_start": [r"(?P<name>\w+) begins", r"go (?P<name>\w+)"],
+                "tool_pass": [r"^ok$"],
+            }
+        )
+        calls = list(parser.parse_file(log_file))
+
+        assert [tc.tool_name for tc in calls] == ["build"]
+        assert calls[0].status == ToolStatus.PASS
+
+    def test_uncombinable_patterns_still_match(self, tmp_path: Path):
+        """Patterns with numbered backreferences fall back to one-by-one search."""
+        log_file = tmp_path / "test.log"
+        log_file.write_text("go lint\nbadbad\nrc=7\n")
+
+        parser = HeuristicParser(
+            patterns={
+                "tool_start": [r"go (?P<name>\w+)"],
+                "tool_fail": [r"nope", r"(bad)\1"],
+                "exit_code": [r"code (?P<code>\d+)", r"rc=(?P<code>\d+)"],
+            }
+        )
+        calls = list(parser.parse_file(log_file))
+
+        assert [(tc.status, tc.exit_code) for tc in calls] == [(ToolStatus.FAIL, 7)]
+
+    def test_prefilter_skips_only_unmatchable_lines(self, tmp_path: Path):
+        """Lines without any required literal are skipped without changing results."""
+        log_file = tmp_path / "test.log"
+        log_file.write_text(
+            "unrelated chatter\n"
+            "RUNNING TOOL: lint\n"
+            "more chatter\n"
+            "All PASSED\n"
+        )
+
+        parser = HeuristicParser()
+        calls = list(parser.parse_file(log_file))
+
+        assert [(tc.tool_name, tc.status) for tc in calls] == [
+            ("lint", ToolStatus.PASS)
+        ]
+
+    def test_parse_lines_streams_any_iterable(self, tmp_path: Path):
+        """parse_lines takes a one-shot iterator and matches parse_file."""
+        content = (
+            "Running tool: lint\n"
+            "[PASS]\n"
+            "Executing: pytest\n"
+            "Error: boom\n"
+            "trailing chatter\n"
+            "more chatter"
+        )
+        log_file = tmp_path / "test.log"
+        log_file.write_text(content)
+
+        parser = HeuristicParser()
+        streamed = list(
+            parser.parse_lines((line for line in content.splitlines()), log_file)
+        )
+        from_file = list(parser.parse_file(log_file))
+
+        ranges = [tc.line_range for tc in streamed]
+        assert ranges == [(1, 2), (3, 6)]
+        assert ranges == [tc.line_range for tc in from_file]
+        assert streamed[1].error_excerpt == "boom"
+
+    def test_parse_gzip_file(self, tmp_path: Path):
+        """Compressed logs are decompressed while streaming."""
+        import gzip
+
+        log_file = tmp_path / "test.log.gz"
+        with gzip.open(log_file, "wt") as f:
+            f.write("Running tool: lint\n[FAIL]\nexit code: 2\n")
+
+        calls = list(HeuristicParser().parse_file(log_file))
+
+        assert [(tc.status, tc.exit_code, tc.line_range) for tc in calls] == [
+            (ToolStatus.FAIL, 2, (1, 3))
+        ]
+
 
 # TODO: Add more edge case tests
 # - No tool detected
 # - Ambiguous status
-# - Very large files (streaming)
@@ -0,0 +1,337 @@
+"""Tests for per-file and parallel log ingestion."""
+
+from dataclasses import replace
+from pathlib import Path
+
+from rollflow_analyze.cache_telemetry import build_cache_telemetry
+from rollflow_analyze.checkpoint import CheckpointStore
+from rollflow_analyze.ingest import (
+    ingest_log_files,
+    ingest_rovodev_files,
+    parse_log_files,
+)
+from rollflow_analyze.models import ToolSource, ToolStatus
+from rollflow_analyze.parsers.marker_parser import MarkerParser
+from rollflow_analyze.parsers.rovodev_parser import (
+    RovoDevParser,
+    resolve_args_excerpt,
+)
+from rollflow_analyze.timeline import build_iterations
+
+
+def _write_logs(tmp_path: Path) -> list[Path]:
+    """Three logs where files 2 and 3 rely on context set by earlier files."""
+    logs = {
+        "iter_001.log": (
+            ":::ITER_START::: iter=1 run_id=run_a ts=2026-01-25T12:00:00Z\n"
+            ":::TOOL_START::: id=t1 tool=lint cache_key=k1 ts=2026-01-25T12:00:01Z\n"
+            ":::TOOL_END::: id=t1 result=PASS exit=0 duration_ms=10 ts=2026-01-25T12:00:02Z\n"
+        ),
+        "iter_002.log": (
+            ":::TOOL_START::: id=t2 tool=test cache_key=k2 ts=2026-01-25T12:01:00Z\n"
+            ":::TOOL_END::: id=t2 result=FAIL exit=1 duration_ms=20 ts=2026-01-25T12:01:01Z\n"
+            ":::ITER_START::: iter=2 ts=2026-01-25T12:01:02Z\n"
+            ":::TOOL_START::: id=t3 tool=lint cache_key=k1 ts=2026-01-25T12:01:03Z\n"
+            ":::TOOL_END::: id=t3 result=PASS exit=0 duration_ms=30 ts=2026-01-25T12:01:04Z\n"
+        ),
+        "iter_003.log": (
+            ":::TOOL_END::: id=orphan result=PASS exit=0 duration_ms=900 ts=2026-01-25T12:02:00Z\n"
+            "::RUN:: id=run_b\n"
+            ":::TOOL_START::: id=t4 tool=build cache_key=k4 ts=2026-01-25T12:02:01Z\n"
+        ),
+    }
+    paths = []
+    for name, content in logs.items():
+        path = tmp_path / name
+        path.write_text(content)
+        paths.append(path)
+    return paths
+
+
+def _sequential(paths: list[Path], source: ToolSource | None = None) -> list:
+    parser = MarkerParser()
+    calls = [tc for p in paths for tc in parser.parse_file(p)]
+    if source is not None:
+        calls = [replace(tc, source=source) for tc in calls]
+    return calls
+
+
+class TestParseLogFiles:
+    """Test suite for parse_log_files."""
+
+    def test_context_carries_across_files(self, tmp_path: Path):
+        """Calls before a file's own markers inherit the previous context."""
+        paths = _write_logs(tmp_path)
+
+        calls = [
+            tc for r in parse_log_files(paths, "marker", jobs=1) for tc in r.tool_calls
+        ]
+
+        by_id = {tc.id: tc for tc in calls}
+        assert (by_id["t2"].run_id, by_id["t2"].iter_id) == ("run_a", "1")
+        assert (by_id["t3"].run_id, by_id["t3"].iter_id) == ("run_a", "2")
+        assert (by_id["orphan"].run_id, by_id["orphan"].iter_id) == ("run_a", "2")
+        assert (by_id["t4"].run_id, by_id["t4"].iter_id) == ("run_b", "2")
+
+    def test_matches_single_parser(self, tmp_path: Path):
+        """Per-file parsing plus carry-over equals one parser over all files."""
+        paths = _write_logs(tmp_path)
+
+        calls = [
+            tc for r in parse_log_files(paths, "marker", jobs=1) for tc in r.tool_calls
+        ]
+
+        assert calls == _sequential(paths)
+
+    def test_marks_and_cache_events_inherit_context(self, tmp_path: Path):
+        """An iteration split across files joins up and keeps its CACHE_SCOPE."""
+        first = tmp_path / "iter_001.log"
+        first.write_text(
+            ":::ITER_START::: iter=1 run_id=run_a ts=2026-01-25T12:00:00Z\n"
+            ":::CACHE_CONFIG::: mode=use scope=verify iter=1 ts=2026-01-25T12:00:01Z\n"
+            ":::PHASE_START::: iter=1 phase=build run_id=run_a ts=2026-01-25T12:00:02Z\n"
+        )
+        second = tmp_path / "iter_002.log"
+        second.write_text(
+            ":::CACHE_HIT::: cache_key=k1 tool=verifier ts=2026-01-25T12:00:03Z\n"
+            ":::PHASE_END::: phase=build status=ok ts=2026-01-25T12:00:04Z\n"
+            ":::ITER_END::: ts=2026-01-25T12:00:05Z\n"
+        )
+
+        results = list(parse_log_files([first, second], "marker", jobs=2))
+
+        (hit,) = [e for e in results[1].cache_events if e.kind == "hit"]
+        assert (hit.run_id, hit.iter_id, hit.scope) == ("run_a", "1", "verify")
+        marks = [m for r in results for m in r.iterations]
+        (iteration,) = build_iterations([], marks)
+        assert (iteration.run_id, iteration.iter_num) == ("run_a", 1)
+        assert iteration.duration_ms == 5000
+        assert [(p.name, p.duration_ms) for p in iteration.phases] == [("build", 2000)]
+        telemetry = build_cache_telemetry(e for r in results for e in r.cache_events)
+        assert [(r.scope, r.hits) for r in telemetry.by_tool_scope] == [("verify", 1)]
+
+    def test_process_pool_preserves_order(self, tmp_path: Path):
+        """jobs > 1 yields the same calls in the same order as sequential."""
+        paths = _write_logs(tmp_path)
+
+        results = list(parse_log_files(paths, "marker", jobs=2))
+
+        assert [r.path for r in results] == paths
+        assert [tc for r in results for tc in r.tool_calls] == _sequential(paths)
+
+
+class TestIncrementalIngest:
+    """Test suite for checkpointed incremental ingestion."""
+
+    def _calls(self, results) -> list:
+        return [tc for r in results for tc in r.tool_calls]
+
+    def test_resume_matches_full_parse(self, tmp_path: Path):
+        """Appending to a log and re-running equals parsing it from scratch."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        paths = _write_logs(tmp_path)
+        first = self._calls(ingest_log_files(paths, store))
+        assert first == _sequential(paths, ToolSource.SHELL_MARKER)
+
+        with open(paths[2], "a") as f:
+            f.write(
+                "build output\n"
+                ":::TOOL_END::: id=t4 result=FAIL exit=2 duration_ms=40 ts=2026-01-25T12:02:05Z\n"
+                ":::TOOL_START::: id=t5 tool=lint cache_key=k1 ts=2026-01-25T12:02:06Z\n"
+            )
+
+        second = self._calls(ingest_log_files(paths, store))
+        assert second == _sequential(paths, ToolSource.SHELL_MARKER)
+        t4 = next(tc for tc in second if tc.id == "t4")
+        assert t4.error_excerpt == "build output"
+        assert t4.line_range == (3, 5)
+
+        checkpoint = store.get(str(paths[2]))
+        assert checkpoint.offset == paths[2].stat().st_size
+        assert [row["id"] for row in checkpoint.state["active"]] == ["t5"]
+
+    def test_resume_keeps_iterations(self, tmp_path: Path):
+        """Iterations split by a checkpoint match those of a full parse."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "iter_001.log"
+        log.write_text(
+            ":::ITER_START::: iter=1 run_id=run_a ts=2026-01-25T12:00:00Z\n"
+            ":::PHASE_START::: iter=1 phase=build run_id=run_a ts=2026-01-25T12:00:01Z\n"
+            ":::TOOL_START::: id=t1 tool=lint ts=2026-01-25T12:00:02Z\n"
+        )
+        list(ingest_log_files([log], store))
+        with open(log, "a") as f:
+            f.write(
+                ":::TOOL_END::: id=t1 result=PASS exit=0 duration_ms=10 ts=2026-01-25T12:00:03Z\n"
+                ":::PHASE_END::: iter=1 phase=build status=ok run_id=run_a ts=2026-01-25T12:00:04Z\n"
+                ":::ITER_END::: iter=1 run_id=run_a ts=2026-01-25T12:00:05Z\n"
+                ":::ITER_START::: iter=2 run_id=run_a ts=2026-01-25T12:00:06Z\n"
+            )
+
+        def iterations(results):
+            results = list(results)
+            calls = [tc for r in results for tc in r.tool_calls]
+            return build_iterations(calls, [m for r in results for m in r.iterations])
+
+        resumed = iterations(ingest_log_files([log], store))
+        full = iterations(parse_log_files([log], "marker"))
+        assert [(it.iter_num, it.duration_ms, it.tool_count) for it in resumed] == [
+            (1, 5000, 1),
+            (2, None, 0),
+        ]
+        for it in resumed + full:
+            it.tool_calls = []
+        assert resumed == full
+        # Unchanged file: marks come from the store alone
+        again = iterations(ingest_log_files([log], store))
+        for it in again:
+            it.tool_calls = []
+        assert again == full
+
+    def test_resume_keeps_cache_telemetry(self, tmp_path: Path):
+        """CACHE_* events from earlier runs still count, under their scope."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "iter_001.log"
+        log.write_text(
+            ":::CACHE_CONFIG::: mode=use scope=verify iter=1 ts=2026-01-25T12:00:00Z\n"
+            ":::CACHE_HIT::: cache_key=k1 tool=verifier saved_ms=500 ts=2026-01-25T12:00:01Z\n"
+        )
+        list(ingest_log_files([log], store))
+        with open(log, "a") as f:
+            f.write(
+                ":::CACHE_MISS::: cache_key=k2 tool=verifier ts=2026-01-25T12:00:02Z\n"
+                ":::CACHE_GUARD::: allowed=0 reason=unsafe phase=BUILD iter=1 ts=2026-01-25T12:00:03Z\n"
+            )
+
+        def telemetry(results):
+            return build_cache_telemetry(e for r in results for e in r.cache_events)
+
+        resumed = telemetry(ingest_log_files([log], store))
+        assert resumed == telemetry(parse_log_files([log], "marker"))
+        assert (resumed.lookups, resumed.hits, resumed.guard_checks) == (2, 1, 1)
+        assert [(r.scope, r.lookups) for r in resumed.by_tool_scope] == [("verify", 2)]
+        assert telemetry(ingest_log_files([log], store)) == resumed
+
+    def test_partial_line_is_left_for_next_run(self, tmp_path: Path):
+        """A line still being written is not consumed until it is complete."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "iter_001.log"
+        log.write_text(":::TOOL_START::: id=p1 tool=lint ts=2026-01-25T12:00:00Z\n")
+        list(ingest_log_files([log], store))
+
+        with open(log, "a") as f:
+            f.write(":::TOOL_END::: id=p1 result=PASS exit=0")
+        calls = self._calls(ingest_log_files([log], store))
+        assert [tc.status for tc in calls] == [ToolStatus.UNKNOWN]
+        assert store.get(str(log)).offset < log.stat().st_size
+
+        with open(log, "a") as f:
+            f.write(" duration_ms=12\n")
+        calls = self._calls(ingest_log_files([log], store))
+        assert [(tc.status, tc.duration_ms) for tc in calls] == [(ToolStatus.PASS, 12)]
+
+    def test_settled_partial_line_is_parsed(self, tmp_path: Path):
+        """A last line left unterminated across two runs is parsed as it is."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "iter_001.log"
+        log.write_text(
+            ":::TOOL_START::: id=p1 tool=lint ts=2026-01-25T12:00:00Z\n"
+            ":::TOOL_END::: id=p1 result=PASS exit=0 duration_ms=12"
+        )
+
+        calls = self._calls(ingest_log_files([log], store))
+        assert [tc.status for tc in calls] == [ToolStatus.UNKNOWN]
+
+        calls = self._calls(ingest_log_files([log], store))
+        assert [(tc.status, tc.duration_ms) for tc in calls] == [(ToolStatus.PASS, 12)]
+        assert store.get(str(log)).offset == log.stat().st_size
+        assert self._calls(ingest_log_files([log], store)) == calls
+
+    def test_rovodev_settled_partial_line_is_parsed(self, tmp_path: Path):
+        """RovoDev logs flush an unterminated last line the same way."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "rovodev.log"
+        log.write_text(
+            "2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: "
+            '{"tool_name": "bash", "args": "{}", "tool_call_id": "toolu_1"}\n'
+            "2026-01-25 17:10:06.033 | DEBUG    | Model request part: "
+            '{"tool_name": "bash", "content": "ok", "tool_call_id": "toolu_1", '
+            '"part_kind": "tool-return"}'
+        )
+
+        list(ingest_rovodev_files([log], store))
+        calls = self._calls(ingest_rovodev_files([log], store))
+        assert [(tc.status, tc.duration_ms) for tc in calls] == [(ToolStatus.PASS, 55)]
+
+    def test_rovodev_parse_error_is_reported(self, tmp_path: Path, monkeypatch):
+        """Any parse error is recorded on the result, as for marker logs."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "rovodev.log"
+        log.write_text("2026-01-25 17:10:05.978 | DEBUG    | hello\n")
+
+        def fail(*args, **kwargs):
+            raise ValueError("bad line")
+
+        monkeypatch.setattr(RovoDevParser, "parse_lines", fail)
+        (result,) = ingest_rovodev_files([log], store)
+        assert result.error == "bad line"
+        assert store.get(str(log)) is None
+
+    def test_unchanged_file_is_not_reparsed(self, tmp_path: Path, monkeypatch):
+        """An unchanged file is served from the store alone."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        paths = _write_logs(tmp_path)
+        first = self._calls(ingest_log_files(paths, store))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unchanged file was re-read")
+
+        monkeypatch.setattr(MarkerParser, "parse_lines", fail)
+        assert self._calls(ingest_log_files(paths, store)) == first
+
+    def test_truncated_file_is_reparsed(self, tmp_path: Path):
+        """A file that shrank is parsed again from the start."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        paths = _write_logs(tmp_path)
+        list(ingest_log_files(paths, store))
+
+        paths[1].write_text(
+            ":::TOOL_START::: id=x1 tool=fmt ts=2026-01-25T13:00:00Z\n"
+            ":::TOOL_END::: id=x1 result=PASS exit=0 duration_ms=5\n"
+        )
+
+        calls = self._calls(ingest_log_files(paths, store))
+        assert calls == _sequential(paths, ToolSource.SHELL_MARKER)
+        assert "t2" not in {tc.id for tc in calls}
+
+    def test_rovodev_resume(self, tmp_path: Path):
+        """A RovoDev call split across runs is paired up on the second run."""
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        log = tmp_path / "rovodev.log"
+        log.write_text(
+            "2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: "
+            '{"tool_name": "bash", "args": "{\\"command\\": \\"ls\\"}", '
+            '"tool_call_id": "toolu_1"}\n'
+        )
+
+        first = self._calls(ingest_rovodev_files([log], store))
+        assert [tc.status for tc in first] == [ToolStatus.UNKNOWN]
+
+        with open(log, "a") as f:
+            f.write(
+                "2026-01-25 17:10:06.033 | DEBUG    | Model request part: "
+                '{"tool_name": "bash", "content": "ok", "tool_call_id": "toolu_1", '
+                '"part_kind": "tool-return"}\n'
+            )
+
+        second = self._calls(ingest_rovodev_files([log], store))
+        assert second == [
+            replace(tc, source=ToolSource.ROVODEV)
+            for tc in RovoDevParser(lazy_args=True).parse_file(log)
+        ]
+        assert second[0].status == ToolStatus.PASS
+        assert second[0].duration_ms == 55
+        # Args were stored undecoded and decode the same as an eager parse
+        (stored,) = store.load_calls(str(log))
+        assert (stored.args_excerpt, stored.args_raw) == (None, '{"command": "ls"}')
+        assert resolve_args_excerpt(stored) == "ls"
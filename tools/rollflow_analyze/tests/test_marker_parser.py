@@ -95,6 +95,44 @@ class TestMarkerParser:
         assert calls[0].run_id == "run-001"
         assert calls[0].iter_id == "iter-001"
 
+    def test_parse_wrapped_marker_block(self, tmp_path: Path):
+        """Test marker fields wrapped onto a continuation line."""
+        log_file = tmp_path / "test.log"
+        log_file.write_text(
+            ":::TOOL_START::: id=w1 tool=verifier cache_key=k1\n"
+            "ts=2026-01-25T12:00:00Z\n"
+            "\n"
+            "verifier output\n"
+            ":::TOOL_END::: id=w1 result=PASS exit=0 duration_ms=75\n"
+            "ts=2026-01-25T12:00:01Z\n"
+        )
+
+        parser = MarkerParser()
+        calls = list(parser.parse_file(log_file))
+
+        assert len(calls) == 1
+        assert calls[0].start_ts is not None
+        assert calls[0].end_ts is not None
+        assert calls[0].line_range == (1, 5)
+
+    def test_parse_lines_from_iterator(self, tmp_path: Path):
+        """Test parsing lines from a one-shot iterator instead of a file."""
+        lines = iter(
+            [
+                "::TOOL_CALL_START:: id=s1 name=lint key=k1 ts=2026-01-24T12:00:00\n",
+                "linting\n",
+                "::TOOL_CALL_END:: id=s1 status=FAIL exit=2 duration_ms=30\n",
+            ]
+        )
+
+        parser = MarkerParser()
+        calls = list(parser.parse_lines(lines, tmp_path / "stream.log"))
+
+        assert len(calls) == 1
+        assert calls[0].status == ToolStatus.FAIL
+        assert calls[0].error_excerpt == "linting"
+        assert calls[0].log_file == str(tmp_path / "stream.log")
+
 
 # TODO: Add more edge case tests
 # - Unicode in tool names
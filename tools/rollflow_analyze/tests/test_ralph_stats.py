@@ -0,0 +1,55 @@
+"""Tests for bin/ralph-stats quick mode."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+BRAIN_ROOT = Path(__file__).resolve().parents[3]
+
+CALL = (
+    "2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: "
+    '{{"tool_name": "bash", "args": "{args}", "tool_call_id": "{id}"}}\n'
+)
+RETURN = (
+    "2026-01-25 17:10:06.033 | DEBUG    | Model request part: "
+    '{{"tool_name": "bash", "content": "ok", "tool_call_id": "{id}", '
+    '"part_kind": "tool-return"}}\n'
+)
+
+
+def _run_ralph_stats(root: Path, home: Path) -> str:
+    """Run ralph-stats from a scratch brain root, so its store stays there."""
+    return subprocess.run(
+        ["bash", str(root / "bin" / "ralph-stats")],
+        env={**os.environ, "HOME": str(home)},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_optimization_hints_from_rovodev_bash(tmp_path: Path):
+    root = tmp_path / "brain"
+    (root / "bin").mkdir(parents=True)
+    shutil.copy(BRAIN_ROOT / "bin" / "ralph-stats", root / "bin")
+    (root / "tools" / "rollflow_analyze").mkdir(parents=True)
+    (root / "tools" / "rollflow_analyze" / "src").symlink_to(
+        BRAIN_ROOT / "tools" / "rollflow_analyze" / "src"
+    )
+    (root / "workers" / "ralph" / "logs").mkdir(parents=True)
+
+    logs = tmp_path / "home" / ".rovodev" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "rovodev.log").write_text(
+        CALL.format(args='{\\"command\\": \\"grep foo bar\\"}', id="t1")
+        + RETURN.format(id="t1")
+        + CALL.format(args='{\\"command\\": \\"cat notes.md\\"}', id="t2")
+        + RETURN.format(id="t2")
+    )
+
+    # Second run: the calls come from the checkpoint store
+    for _ in range(2):
+        out = _run_ralph_stats(root, tmp_path / "home")
+        assert "1 grep/rg via bash" in out
+        assert "1 cat via bash" in out
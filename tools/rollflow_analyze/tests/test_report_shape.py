@@ -1,10 +1,20 @@
 """Tests for report generation and shape validation."""
 
 import json
+import random
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from rollflow_analyze.models import ToolCall, ToolStatus
-from rollflow_analyze.report import build_report, write_json_report
+import pytest
+
+from rollflow_analyze.checkpoint import Checkpoint, CheckpointStore
+from rollflow_analyze.models import ToolCall, ToolSource, ToolStatus
+from rollflow_analyze.report import (
+    ReportAccumulator,
+    build_report,
+    build_report_from_store,
+    write_json_report,
+)
 
 
 class TestReportShape:
@@ -24,6 +34,19 @@ class TestReportShape:
         assert "tool_calls" in data
         assert "aggregates" in data
         assert "cache_advice" in data
+        # Keys added later go after the original ones
+        assert list(data) == [
+            "generated_at",
+            "run_id",
+            "tool_calls",
+            "iterations",
+            "aggregates",
+            "cache_advice",
+            "tool_breakdown",
+            "rovodev_tool_calls",
+            "shell_marker_calls",
+            "cache_telemetry",
+        ]
 
         # Check aggregates structure
         agg = data["aggregates"]
@@ -104,4 +127,212 @@ class TestReportShape:
         assert data["tool_calls"][0]["id"] == "special-chars-!@#"
 
 
+def _random_calls(n: int, seed: int = 0) -> list[ToolCall]:
+    """Calls with repeated tools, cache keys and durations (ties included)."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    return [
+        ToolCall(
+            id=f"c{i}",
+            tool_name=rng.choice(["lint", "test", "build", "bash", "grep"]),
+            status=rng.choice(list(ToolStatus)),
+            source=rng.choice([ToolSource.SHELL_MARKER, ToolSource.ROVODEV]),
+            start_ts=start + timedelta(hours=i),
+            duration_ms=rng.choice([None, 10, 50, 50, 200, 1000]),
+            cache_key=rng.choice([None, "", "k1", "k2", "k3"]),
+            log_file="iter_001.log",
+        )
+        for i in range(n)
+    ]
+
+
+def _store_with(tmp_path: Path, calls: list[ToolCall]) -> CheckpointStore:
+    store = CheckpointStore(tmp_path / "ingest.sqlite")
+    store.save(Checkpoint("iter_001.log", "marker", 1, 0, 0.0), calls, reset=True)
+    return store
+
+
+class TestReportFromStore:
+    """Test suite for SQL aggregation over stored ToolCalls."""
+
+    def test_matches_in_memory_report(self, tmp_path: Path):
+        """GROUP BY aggregates equal build_report over the same calls."""
+        calls = _random_calls(300)
+        expected = build_report(calls)
+
+        report = build_report_from_store(_store_with(tmp_path, calls))
+
+        assert report.tool_calls == []
+        assert report.aggregates == expected.aggregates
+        assert report.tool_breakdown == expected.tool_breakdown
+        assert report.cache_advice == expected.cache_advice
+        assert report.rovodev_tool_calls == expected.rovodev_tool_calls
+        assert report.shell_marker_calls == expected.shell_marker_calls
+
+    def test_since_window(self, tmp_path: Path):
+        """Only calls started inside the window are aggregated."""
+        calls = _random_calls(100)
+        since = calls[60].start_ts
+        expected = build_report(calls[60:])
+
+        report = build_report_from_store(_store_with(tmp_path, calls), since=since)
+
+        assert report.aggregates == expected.aggregates
+        assert report.tool_breakdown == expected.tool_breakdown
+        assert report.cache_advice == expected.cache_advice
+
+    def test_since_window_compares_instants(self, tmp_path: Path):
+        """Aware and naive local timestamps are filtered by the time they denote."""
+        since = datetime(2026, 1, 25, 12, 0, tzinfo=timezone.utc)
+        starts = {
+            # 08:00 UTC, but its ISO string sorts after the cutoff's
+            "early_offset": datetime(
+                2026, 1, 25, 13, 0, tzinfo=timezone(timedelta(hours=5))
+            ),
+            # RovoDev timestamps are naive local time
+            "late_naive": (since + timedelta(hours=1))
+            .astimezone()
+            .replace(tzinfo=None),
+            "late_utc": since + timedelta(minutes=1),
+        }
+        calls = [
+            ToolCall(
+                id=name,
+                tool_name=name,
+                status=ToolStatus.PASS,
+                start_ts=ts,
+                log_file="iter_001.log",
+            )
+            for name, ts in starts.items()
+        ]
+        store = _store_with(tmp_path, calls)
+
+        assert [tc.id for tc in store.iter_calls(since)] == ["late_naive", "late_utc"]
+        report = build_report_from_store(store, since=since)
+        assert report.aggregates.total_calls == 2
+
+
+class TestReportAccumulator:
+    """Test suite for the single-pass aggregation behind build_report."""
+
+    def test_iterator_input_matches_list(self):
+        """A one-shot generator gives the same report as a list."""
+        calls = _random_calls(200)
+
+        expected = build_report(calls)
+        report = build_report(tc for tc in calls)
+
+        assert report.tool_calls == calls
+        assert report.aggregates == expected.aggregates
+        assert report.tool_breakdown == expected.tool_breakdown
+        assert report.cache_advice == expected.cache_advice
+
+    def test_keep_calls_false_drops_calls(self):
+        """Without keep_calls only the aggregates are retained."""
+        calls = _random_calls(50)
+
+        report = build_report(iter(calls), keep_calls=False)
+
+        assert report.tool_calls == []
+        assert report.aggregates.total_calls == 50
+        assert report.aggregates == build_report(calls).aggregates
+
+    def test_slowest_ties_keep_first_seen_order(self):
+        """Equal durations are listed in call order, like a stable sort."""
+        calls = [
+            ToolCall(id=str(i), tool_name=f"tool{i}", duration_ms=d)
+            for i, d in enumerate([5, 9, 5, 9, 1] + [0] * 12)
+        ]
+
+        slowest = build_report(calls).aggregates.slowest_tools
+
+        assert slowest[:5] == [
+            ("tool1", 9),
+            ("tool3", 9),
+            ("tool0", 5),
+            ("tool2", 5),
+            ("tool4", 1),
+        ]
+        assert [name for name, _ in slowest[5:]] == [f"tool{i}" for i in range(5, 10)]
+
+    def test_merged_accumulators_match_single_pass(self):
+        """Accumulators over consecutive slices merge into the whole report."""
+        calls = _random_calls(300)
+        whole = ReportAccumulator()
+        whole.extend(calls)
+
+        merged = ReportAccumulator()
+        for start in range(0, len(calls), 70):
+            part = ReportAccumulator()
+            part.extend(calls[start : start + 70])
+            merged.merge(part)
+
+        report, expected = merged.build(), whole.build()
+        assert report.aggregates == expected.aggregates
+        assert report.tool_breakdown == expected.tool_breakdown
+        assert report.cache_advice == expected.cache_advice
+
+    def test_percentiles_in_breakdown_and_json(self, tmp_path: Path):
+        """Per-tool p50/p90/p99 are reported; the sketch itself is not."""
+        calls = [
+            ToolCall(id=str(i), tool_name="lint", duration_ms=ms)
+            for i, ms in enumerate(range(1, 101))
+        ] + [ToolCall(id="x", tool_name="fmt")]
+
+        report = build_report(calls)
+        lint, fmt = sorted(report.tool_breakdown, key=lambda tb: tb.tool_name)[::-1]
+
+        assert lint.p50_duration_ms == pytest.approx(50, rel=0.02)
+        assert lint.p90_duration_ms == pytest.approx(90, rel=0.02)
+        assert lint.p99_duration_ms == pytest.approx(99, rel=0.02)
+        assert fmt.p50_duration_ms is None
+
+        output_path = tmp_path / "report.json"
+        write_json_report(report, output_path)
+        data = json.loads(output_path.read_text())
+        row = next(tb for tb in data["tool_breakdown"] if tb["tool_name"] == "lint")
+        assert row["p90_duration_ms"] == lint.p90_duration_ms
+        assert "duration_sketch" not in row
+
+
+class TestJsonWriter:
+    """Test suite for the incremental JSON report writer."""
+
+    def test_pretty_matches_json_dump(self, tmp_path: Path):
+        """Default output is byte-identical to json.dump(indent=2)."""
+        report = build_report(_random_calls(40))
+        output_path = tmp_path / "report.json"
+
+        write_json_report(report, output_path)
+
+        text = output_path.read_text()
+        assert text == json.dumps(json.loads(text), indent=2)
+        assert len(json.loads(text)["tool_calls"]) == 40
+
+    def test_compact_and_ndjson(self, tmp_path: Path):
+        """Compact holds the same data; NDJSON has one call per line."""
+        report = build_report(_random_calls(25))
+        pretty, compact, ndjson = (
+            tmp_path / "r.json",
+            tmp_path / "r.min.json",
+            tmp_path / "r.ndjson",
+        )
+
+        write_json_report(report, pretty)
+        write_json_report(report, compact, json_format="compact")
+        write_json_report(report, ndjson, json_format="ndjson")
+
+        expected = json.loads(pretty.read_text())
+        assert "\n" not in compact.read_text()
+        assert json.loads(compact.read_text()) == expected
+        lines = [json.loads(line) for line in ndjson.read_text().splitlines()]
+        assert lines[:-1] == expected.pop("tool_calls")
+        assert lines[-1] == expected
+
+    def test_unknown_format_rejected(self, tmp_path: Path):
+        """A typo in the format name is an error, not a silent default."""
+        with pytest.raises(ValueError, match="Unknown JSON format"):
+            write_json_report(build_report([]), tmp_path / "r.json", "yaml")
+
+
 # TODO: Add golden test with sample log + expected output
@@ -0,0 +1,88 @@
+"""Tests for review pack generation."""
+
+from pathlib import Path
+
+from rollflow_analyze.cache_db import CacheDB
+from rollflow_analyze.checkpoint import Checkpoint, CheckpointStore
+from rollflow_analyze.cli import main
+from rollflow_analyze.models import ToolCall, ToolStatus
+from rollflow_analyze.review_pack import _recurring_failures_lines
+
+
+def _fail(i: int, tool: str, error: str | None) -> ToolCall:
+    return ToolCall(
+        id=f"t{i}",
+        tool_name=tool,
+        status=ToolStatus.FAIL,
+        exit_code=1,
+        error_excerpt=error,
+    )
+
+
+class TestRecurringFailures:
+    """Grouping failures by fingerprint."""
+
+    def test_groups_same_cause(self):
+        calls = [
+            _fail(1, "pytest", "/ci/1/test_a.py:10: AssertionError"),
+            _fail(2, "pytest", "/ci/2/test_a.py:12: AssertionError"),
+            _fail(3, "pytest", "ImportError: foo"),
+            _fail(4, "lint", None),
+            _fail(5, "lint", None),
+        ]
+
+        lines = _recurring_failures_lines(calls)
+        rows = [line for line in lines if line.startswith("| `")]
+
+        assert len(rows) == 2
+        assert rows[0].startswith("| `pytest` | 2 |")
+        assert rows[0].endswith("| /ci/2/test_a.py:12: AssertionError |")
+        assert rows[1].startswith("| `lint` | 2 |")
+        assert "exit code 1" in rows[1]
+
+    def test_nothing_recurring(self):
+        calls = [_fail(1, "pytest", "a"), _fail(2, "pytest", "b")]
+        assert _recurring_failures_lines(calls) == []
+
+    def test_reads_cache_db(self, tmp_path: Path):
+        cache_db = CacheDB(tmp_path / "cache.sqlite")
+        cache_db.log_fail_many(
+            [
+                _fail(1, "pytest", "ImportError: foo"),
+                _fail(2, "pytest", "ImportError: foo"),
+            ]
+        )
+
+        # The report's own calls are not consulted
+        lines = _recurring_failures_lines([_fail(3, "lint", None)] * 3, cache_db)
+        rows = [line for line in lines if line.startswith("| `")]
+
+        assert len(rows) == 1
+        assert rows[0].startswith("| `pytest` | 2 |")
+        assert rows[0].endswith("| ImportError: foo |")
+
+    def test_from_store_review_pack(self, tmp_path: Path):
+        calls = [_fail(i, "pytest", "ImportError: foo") for i in range(3)]
+        for tc in calls:
+            tc.log_file = "iter_001.log"
+        store = CheckpointStore(tmp_path / "ingest.sqlite")
+        store.save(Checkpoint("iter_001.log", "marker", 1, 0, 0.0), calls, reset=True)
+        CacheDB(tmp_path / "cache.sqlite").log_fail_many(calls)
+
+        out = tmp_path / "analysis" / "iter_007.json"
+        code = main(
+            [
+                "--from-store",
+                "--checkpoint-db",
+                str(tmp_path / "ingest.sqlite"),
+                "--cache-db",
+                str(tmp_path / "cache.sqlite"),
+                "--out",
+                str(out),
+                "--review-pack",
+            ]
+        )
+
+        assert code == 0
+        pack = (tmp_path / "review_packs" / "iter_007.md").read_text()
+        assert "| `pytest` | 3 |" in pack
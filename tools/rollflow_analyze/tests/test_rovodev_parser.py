@@ -0,0 +1,135 @@
+"""Tests for RovoDev log parser."""
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+from rollflow_analyze.models import ToolStatus
+from rollflow_analyze.parsers.rovodev_parser import (
+    RovoDevParser,
+    resolve_args_excerpts,
+)
+from rollflow_analyze.report import build_report, write_json_report
+
+CALL = (
+    "2026-01-25 17:10:05.978 | DEBUG    | Model response tool call: "
+    '{{"tool_name": "bash", "args": "{args}", "tool_call_id": "{id}"}}\n'
+)
+RETURN = (
+    "2026-01-25 17:10:06.033 | DEBUG    | Model request part: "
+    '{{"tool_name": "bash", "content": "ok", "tool_call_id": "{id}", '
+    '"part_kind": "tool-return"}}\n'
+)
+
+
+class TestRovoDevParser:
+    """Test suite for RovoDevParser."""
+
+    def test_parse_call_and_return(self, tmp_path: Path):
+        """Test pairing a tool call with its return amid log chatter."""
+        log_file = tmp_path / "rovodev.log"
+        log_file.write_text(
+            "2026-01-25 17:10:05.978 | INFO     | Model response tool call: bash\n"
+            + CALL.format(args='{\\"command\\": \\"ls -la\\"}', id="toolu_1")
+            + "2026-01-25 17:10:06.000 | DEBUG    | Model request part: "
+            '{"content": "toolu_1", "part_kind": "user-prompt"}\n'
+            + RETURN.format(id="toolu_1")
+        )
+
+        calls = list(RovoDevParser().parse_file(log_file))
+
+        assert len(calls) == 1
+        assert calls[0].id == "toolu_1"
+        assert calls[0].status == ToolStatus.PASS
+        assert calls[0].args_excerpt == "ls -la"
+        assert calls[0].duration_ms == 55
+
+    def test_fast_json_matches_stdlib(self, tmp_path: Path):
+        """Test that orjson mode decodes exactly like the stdlib decoder."""
+        log_file = tmp_path / "rovodev.log"
+        log_file.write_text(
+            CALL.format(args='{\\"file_path\\": \\"a.py\\"}', id="toolu_1")
+            # NaN and huge integers are rejected by orjson, accepted by json
+            + CALL.format(args='{\\"limit\\": NaN}', id="toolu_2")
+            + CALL.format(args='{\\"n\\": 123456789012345678901234567890}', id="t3")
+            + CALL.format(args="not json", id="toolu_4")
+            + RETURN.format(id="toolu_1")
+            + RETURN.format(id="toolu_2")
+        )
+
+        fast = list(RovoDevParser(fast_json=True).parse_file(log_file))
+        stdlib = list(RovoDevParser(fast_json=False).parse_file(log_file))
+
+        assert fast == stdlib
+        assert [tc.args_excerpt for tc in fast] == [
+            "file: a.py",
+            "{'limit': nan}",
+            "{'n': 123456789012345678901234567890}",
+            "not json",
+        ]
+
+    def test_lazy_args_resolve_to_same_excerpts(self, tmp_path: Path):
+        """Test that lazily kept args decode to the eager excerpts."""
+        log_file = tmp_path / "rovodev.log"
+        log_file.write_text(
+            CALL.format(args='{\\"command\\": \\"ls\\"}', id="toolu_1")
+            + CALL.format(args='{\\"content_pattern\\": \\"TODO\\"}', id="toolu_2")
+            + CALL.format(args="not json", id="toolu_3")
+            + RETURN.format(id="toolu_1")
+            + RETURN.format(id="toolu_2")
+        )
+
+        eager = list(RovoDevParser().parse_file(log_file))
+        lazy = list(RovoDevParser(lazy_args=True).parse_file(log_file))
+
+        assert [tc.args_excerpt for tc in lazy] == [None, None, None]
+        assert [tc.duration_ms for tc in lazy] == [tc.duration_ms for tc in eager]
+        resolve_args_excerpts(lazy)
+        assert lazy == eager
+
+    def test_json_report_resolves_lazy_args(self, tmp_path: Path):
+        """Test that the JSON report shows excerpts, never raw args."""
+        log_file = tmp_path / "rovodev.log"
+        log_file.write_text(
+            CALL.format(args='{\\"file_paths\\": [\\"a.py\\"]}', id="toolu_1")
+            + RETURN.format(id="toolu_1")
+        )
+        calls = list(RovoDevParser(lazy_args=True).parse_file(log_file))
+        output_path = tmp_path / "report.json"
+
+        write_json_report(build_report(calls), output_path)
+
+        data = json.loads(output_path.read_text())
+        assert data["tool_calls"][0]["args_excerpt"] == "files: ['a.py']"
+        assert "args_raw" not in data["tool_calls"][0]
+
+    def test_parse_directory_reads_archives_in_mtime_order(self, tmp_path: Path):
+        """Test .gz archives, including damaged ones, among plain logs."""
+        logs = {
+            # Multi-member archive: call in the first member, return in the second
+            "rovodev.1.log.gz": gzip.compress(
+                CALL.format(args="{}", id="toolu_1").encode()
+            )
+            + gzip.compress(RETURN.format(id="toolu_1").encode()),
+            "rovodev.log": CALL.format(args="{}", id="toolu_2").encode(),
+            "rovodev.2.log.gz": gzip.compress(
+                (CALL.format(args="{}", id="toolu_3") + RETURN.format(id="toolu_3"))
+                .replace("\n", "\r\n")
+                .encode()
+            ),
+            # Truncated archive: readable calls are kept, pending ones dropped
+            "rovodev.3.log.gz": gzip.compress(
+                (
+                    RETURN.format(id="x") * 50 + CALL.format(args="{}", id="toolu_4")
+                ).encode()
+            )[:-12],
+        }
+        for mtime, (name, data) in enumerate(logs.items(), start=1_700_000_000):
+            path = tmp_path / name
+            path.write_bytes(data)
+            os.utime(path, (mtime, mtime))
+
+        calls = list(RovoDevParser().parse_directory(tmp_path))
+
+        assert [tc.id for tc in calls] == ["toolu_1", "toolu_2", "toolu_3"]
@@ -0,0 +1,131 @@
+"""Tests for replaying stored tool calls against cache policies."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from rollflow_analyze.checkpoint import Checkpoint, CheckpointStore
+from rollflow_analyze.cli import main
+from rollflow_analyze.models import ToolCall, ToolStatus
+from rollflow_analyze.simulate import CachePolicy, policy_grid, simulate
+
+T0 = datetime(2026, 1, 25, 12, 0, tzinfo=timezone.utc)
+
+
+def _call(
+    hours: float,
+    key: str = "k1",
+    tool: str = "verifier",
+    status=ToolStatus.PASS,
+    ms: int = 1000,
+) -> ToolCall:
+    return ToolCall(
+        id=f"{key}@{hours}",
+        tool_name=tool,
+        status=status,
+        start_ts=T0 + timedelta(hours=hours),
+        duration_ms=ms,
+        cache_key=key,
+    )
+
+
+def _only(calls, policy: CachePolicy):
+    (result,) = simulate(calls, [policy]).results
+    return result
+
+
+def test_replays_in_timestamp_order():
+    # Stored out of order: the PASS at 0h is what the 1h call hits
+    calls = [_call(1), _call(0), _call(2, status=ToolStatus.FAIL)]
+    result = _only(calls, CachePolicy())
+    assert (result.lookups, result.hits, result.misses) == (3, 2, 1)
+    assert result.time_saved_ms == 2000
+    # The cache would have reported PASS for the call that failed
+    assert result.stale_hits == 1
+    assert result.staleness_risk == 0.5
+    assert result.max_hit_age_hours == 2.0
+
+
+def test_ttl_expires_entries():
+    calls = [_call(0), _call(5), _call(12)]
+    result = _only(calls, CachePolicy(ttl_hours=6))
+    # A hit skips the call, so it does not refresh the entry's age
+    assert (result.hits, result.expired) == (1, 1)
+    assert _only(calls, CachePolicy(ttl_hours=None)).hits == 2
+
+
+def test_lru_capacity_evicts_least_recently_used():
+    calls = [_call(0, "a"), _call(1, "b"), _call(2, "a"), _call(3, "c"), _call(4, "b")]
+    result = _only(calls, CachePolicy(capacity=2))
+    # "a" was used at 2h, so "b" is evicted when "c" is cached; "b" then
+    # misses and evicts "a"
+    assert result.hits == 1
+    assert result.evictions == 2
+    assert result.peak_entries == 2
+
+
+def test_modes_and_scopes():
+    calls = [
+        _call(0, "v"),
+        _call(1, "v"),
+        _call(0, "llm", tool="rovodev"),
+        _call(1, "llm", tool="rovodev"),
+        _call(2, "x", tool="custom"),
+    ]
+    sim = simulate(
+        calls, policy_grid(("off", "record", "use"), ("verify", "verify,llm_ro"))
+    )
+    by_label = {r.policy: r for r in sim.results}
+    assert set(by_label) == {
+        "off",
+        "record verify ttl=168h cap=none",
+        "record llm_ro,verify ttl=168h cap=none",
+        "use verify ttl=168h cap=none",
+        "use llm_ro,verify ttl=168h cap=none",
+    }
+    assert by_label["off"].peak_entries == 0
+    recorded = by_label["record llm_ro,verify ttl=168h cap=none"]
+    assert (recorded.lookups, recorded.peak_entries) == (0, 2)
+    assert by_label["use verify ttl=168h cap=none"].hits == 1
+    assert by_label["use llm_ro,verify ttl=168h cap=none"].hits_by_scope == {
+        "llm_ro": 1,
+        "verify": 1,
+    }
+    # Best time saved first
+    assert sim.results[0].policy == "use llm_ro,verify ttl=168h cap=none"
+    assert sim.unscoped_calls == 1
+
+
+def test_simulate_subcommand_reads_checkpoint_store(tmp_path: Path, capsys):
+    db = tmp_path / "ingest.sqlite"
+    store = CheckpointStore(db)
+    calls = [_call(0), _call(1), _call(2)]
+    for tc in calls:
+        tc.log_file = "loop.log"
+    store.save(Checkpoint("loop.log", "marker", 1, 0, 0.0), calls, reset=False)
+
+    out = tmp_path / "sim.json"
+    code = main(
+        [
+            "simulate",
+            "--checkpoint-db",
+            str(db),
+            "--scope",
+            "verify",
+            "--ttl-hours",
+            "1.5",
+            "--ttl-hours",
+            "none",
+            "--out",
+            str(out),
+        ]
+    )
+    assert code == 0
+    assert "| use verify ttl=none cap=none | 3 | 66.7% |" in capsys.readouterr().out
+    data = json.loads(out.read_text())
+    assert data["calls"] == 3
+    assert [r["hits"] for r in data["results"]] == [2, 1]
+
+
+def test_simulate_without_store(tmp_path: Path):
+    assert main(["simulate", "--checkpoint-db", str(tmp_path / "none.sqlite")]) == 1
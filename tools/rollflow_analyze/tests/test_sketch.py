@@ -0,0 +1,81 @@
+"""Tests for the mergeable duration sketch."""
+
+import pickle
+import random
+
+import pytest
+
+from rollflow_analyze.sketch import DurationSketch
+
+
+def _durations(n: int, seed: int = 0) -> list[int]:
+    rng = random.Random(seed)
+    return [int(rng.lognormvariate(5, 2)) for _ in range(n)]
+
+
+class TestDurationSketch:
+    """Test suite for DurationSketch."""
+
+    def test_empty_sketch(self):
+        """An empty sketch has no quantiles."""
+        sketch = DurationSketch()
+
+        assert sketch.count == 0
+        assert sketch.quantile(0.5) is None
+        assert sketch.histogram() == []
+
+    @pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+    def test_quantile_within_relative_accuracy(self, q: float):
+        """Estimates stay within 1% of the exact order statistic."""
+        values = _durations(20000)
+        sketch = DurationSketch()
+        sketch.extend(values)
+
+        exact = sorted(values)[int(q * (len(values) - 1))]
+
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+    def test_min_max_and_zeros_are_exact(self):
+        """Extremes are tracked exactly and zeros get their own bucket."""
+        sketch = DurationSketch()
+        sketch.extend([0, 0, 0, 7, 1500])
+
+        assert (sketch.quantile(0), sketch.quantile(1)) == (0, 1500)
+        assert sketch.quantile(0.5) == 0
+        assert sketch.histogram()[0] == (0.0, 0.0, 3)
+        assert sum(n for _, _, n in sketch.histogram()) == 5
+
+    def test_merge_equals_single_sketch(self):
+        """Sketches of slices merge into the sketch of the whole sequence."""
+        values = _durations(5000)
+        whole = DurationSketch()
+        whole.extend(values)
+
+        merged = DurationSketch()
+        for start in range(0, len(values), 1000):
+            part = DurationSketch()
+            part.extend(values[start : start + 1000])
+            # Sketches travel between processes pickled
+            merged.merge(pickle.loads(pickle.dumps(part)))
+
+        assert merged.buckets == whole.buckets
+        assert (merged.count, merged.min, merged.max) == (
+            whole.count,
+            whole.min,
+            whole.max,
+        )
+        assert merged.quantile(0.9) == whole.quantile(0.9)
+
+    def test_merge_rejects_different_accuracy(self):
+        """Buckets of different widths can't be added together."""
+        with pytest.raises(ValueError, match="different accuracy"):
+            DurationSketch(0.01).merge(DurationSketch(0.05))
+
+    def test_bucket_cap_bounds_memory(self):
+        """Past max_buckets the lowest buckets are folded together."""
+        sketch = DurationSketch(max_buckets=16)
+        sketch.extend(2**i for i in range(64))
+
+        assert len(sketch.buckets) <= 16
+        assert sketch.count == 64
+        assert sketch.quantile(0.99) == pytest.approx(2**62, rel=0.01)
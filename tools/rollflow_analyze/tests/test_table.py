@@ -0,0 +1,104 @@
+"""Tests for the slotted ToolCall and the columnar ToolCallTable."""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from rollflow_analyze.models import ToolCall, ToolSource, ToolStatus
+from rollflow_analyze.parsers.rovodev_parser import resolve_args_excerpt
+from rollflow_analyze.report import build_report, write_json_report
+from rollflow_analyze.table import ToolCallTable
+
+
+def _random_calls(n: int, seed: int = 0) -> list[ToolCall]:
+    """Calls covering None fields, naive and offset-aware timestamps."""
+    rng = random.Random(seed)
+    tzs = [None, timezone.utc, timezone(timedelta(hours=2, minutes=30))]
+    calls = []
+    for i in range(n):
+        tz = rng.choice(tzs)
+        start = datetime(2026, 1, 25, 12, 0, 0, rng.randint(0, 999999), tzinfo=tz)
+        calls.append(
+            ToolCall(
+                id=f"c{i}",
+                tool_name=rng.choice(["lint", "test", "bash"]),
+                status=rng.choice(list(ToolStatus)),
+                source=rng.choice(list(ToolSource)),
+                exit_code=rng.choice([None, 0, 1, -9]),
+                start_ts=rng.choice([None, start]),
+                end_ts=rng.choice([None, start + timedelta(seconds=3)]),
+                duration_ms=rng.choice([None, 0, 1234]),
+                cache_key=rng.choice([None, "", "k1", "k2"]),
+                args_excerpt=rng.choice([None, "ls -la"]),
+                error_excerpt=rng.choice([None, "boom\ntraceback"]),
+                log_file=rng.choice([None, "logs/iter_001.log"]),
+                line_range=rng.choice([None, (i, i + 3)]),
+                run_id=rng.choice([None, "run_a"]),
+                iter_id=rng.choice([None, "1", "2"]),
+            )
+        )
+    return calls
+
+
+class TestToolCallTable:
+    """Test suite for ToolCallTable."""
+
+    def test_slotted_tool_call(self):
+        """ToolCall carries no per-instance __dict__."""
+        tc = ToolCall(id="t1", tool_name="lint")
+
+        assert not hasattr(tc, "__dict__")
+        with pytest.raises(AttributeError):
+            tc.not_a_field = 1
+
+    def test_rows_round_trip(self):
+        """Every row reads back equal to the call that was appended."""
+        calls = _random_calls(300)
+
+        table = ToolCallTable(calls)
+
+        assert len(table) == len(calls)
+        assert list(table) == calls
+        assert table[-1] == calls[-1]
+        assert table[10:13] == calls[10:13]
+        for row, tc in zip(table, calls):
+            if tc.start_ts is not None:
+                assert row.start_ts.isoformat() == tc.start_ts.isoformat()
+
+    def test_index_out_of_range(self):
+        """Indexing past the end raises IndexError like a list."""
+        table = ToolCallTable(_random_calls(3))
+
+        with pytest.raises(IndexError):
+            table[3]
+
+    def test_lazy_args_stay_undecoded(self):
+        """Row access passes undecoded RovoDev args through untouched."""
+        tc = ToolCall(id="t1", tool_name="bash", args_raw='{"command": "ls"}')
+        table = ToolCallTable([tc])
+
+        row = table[0]
+
+        assert row.args_excerpt is None
+        assert row.args_raw == '{"command": "ls"}'
+        assert resolve_args_excerpt(row) == "ls"
+        assert table[0].args_raw == '{"command": "ls"}'
+
+    def test_report_from_table_matches_list(self, tmp_path: Path):
+        """A report over a table serializes exactly like one over a list."""
+        calls = _random_calls(200)
+        expected_path = tmp_path / "list.json"
+        table_path = tmp_path / "table.json"
+
+        expected = build_report(calls)
+        report = build_report(ToolCallTable(calls))
+        report.generated_at = expected.generated_at
+        write_json_report(expected, expected_path)
+        write_json_report(report, table_path)
+
+        assert json.loads(table_path.read_text()) == json.loads(
+            expected_path.read_text()
+        )
@@ -0,0 +1,140 @@
+"""Tests for iteration grouping and timeline analysis."""
+
+from datetime import datetime, timedelta, timezone
+
+from rollflow_analyze.models import Iteration, Phase, ToolCall, ToolStatus
+from rollflow_analyze.timeline import analyze_timeline, build_iterations
+
+T0 = datetime(2026, 1, 25, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _call(
+    tool: str,
+    start_s: float,
+    duration_ms: int,
+    iter_id: str | None = "1",
+    run_id: str | None = "run_001",
+) -> ToolCall:
+    return ToolCall(
+        id=f"{tool}-{start_s}",
+        tool_name=tool,
+        status=ToolStatus.PASS,
+        start_ts=T0 + timedelta(seconds=start_s),
+        duration_ms=duration_ms,
+        run_id=run_id,
+        iter_id=iter_id,
+    )
+
+
+class TestAnalyzeTimeline:
+    """Wall vs. tool time, gaps, overlap and the critical path."""
+
+    def test_sequential_calls_with_gaps(self):
+        calls = [
+            _call("lint", 10.25, 5000),  # 10.25-15.25
+            _call("test", 20.5, 10000),  # 20.5-30.5
+        ]
+        tl = analyze_timeline(calls, T0, T0 + timedelta(seconds=60))
+
+        assert tl.wall_ms == 60000
+        assert tl.tool_ms == 15000
+        assert tl.busy_ms == 15000
+        assert tl.idle_ms == 45000
+        assert tl.overlap_ms == 0
+        assert tl.max_concurrency == 1
+        assert tl.overlapping_calls == 0
+        assert [g.duration_ms for g in tl.longest_gaps] == [29500, 10250, 5250]
+        assert tl.longest_gaps[0].start_ts == T0 + timedelta(seconds=30.5)
+        assert tl.critical_path == ["lint", "test"]
+        assert tl.critical_path_ms == 15000
+        assert tl.tool_ms_by_tool == {"test": 10000, "lint": 5000}
+
+    def test_overlapping_calls(self):
+        calls = [
+            _call("build", 0.5, 10000),  # 0.5-10.5
+            _call("lint", 2.5, 2000),  # 2.5-4.5, inside build
+            _call("test", 3.5, 3000),  # 3.5-6.5, overlaps both
+            _call("deploy", 11.5, 1000),  # after build
+        ]
+        tl = analyze_timeline(calls)
+
+        assert tl.wall_ms == 12000
+        assert tl.busy_ms == 11000
+        assert tl.overlap_ms == 5000
+        assert tl.max_concurrency == 3
+        assert tl.overlapping_calls == 3
+        # build -> deploy outweighs lint -> test (which overlap anyway)
+        assert tl.critical_path == ["build", "deploy"]
+        assert tl.critical_path_ms == 11000
+
+    def test_whole_second_timestamps_are_not_overlap(self):
+        # Marker ts are truncated to seconds: a 1.5s call "starting" at :00 is
+        # followed by one stamped :01
+        calls = [_call("a", 0, 1500), _call("b", 1, 1500)]
+        tl = analyze_timeline(calls)
+        assert tl.overlapping_calls == 0
+        assert tl.critical_path == ["a", "b"]
+
+    def test_untimed_calls(self):
+        tl = analyze_timeline([ToolCall(id="x", tool_name="x", duration_ms=50)])
+        assert tl.untimed_calls == 1
+        assert tl.tool_ms == 50
+        assert tl.wall_ms == 0
+
+
+class TestBuildIterations:
+    """Grouping calls by iteration and joining marker fragments."""
+
+    def _mark(self, iter_num: int, start_s: float, end_s: float | None) -> Iteration:
+        return Iteration(
+            iter_num=iter_num,
+            run_id="run_001",
+            start_ts=T0 + timedelta(seconds=start_s),
+            end_ts=None if end_s is None else T0 + timedelta(seconds=end_s),
+        )
+
+    def test_groups_by_iter_id_and_time(self):
+        marks = [self._mark(1, 0, 30), self._mark(2, 30, 60)]
+        calls = [
+            _call("verifier", 1, 2000),
+            _call("verifier", 31, 2000, iter_id="2"),
+            # RovoDev calls carry no iteration; placed by time (naive = local)
+            _call("bash", 40, 100, iter_id=None, run_id=None),
+            _call("grep", 90, 100, iter_id=None, run_id=None),
+        ]
+        calls[2].start_ts = calls[2].start_ts.astimezone().replace(tzinfo=None)
+
+        first, second = build_iterations(calls, marks)
+        assert [tc.tool_name for tc in first.tool_calls] == ["verifier"]
+        assert [tc.tool_name for tc in second.tool_calls] == ["verifier", "bash"]
+        assert second.duration_ms == 30000
+        assert second.timeline.tool_ms == 2100
+
+    def test_iterations_without_markers(self):
+        calls = [
+            _call("lint", 0, 1000, iter_id="7"),
+            _call("test", 5, 1000, iter_id="7"),
+        ]
+        [iteration] = build_iterations(calls, keep_calls=False)
+        assert iteration.iter_num == 7
+        assert iteration.tool_calls == []
+        assert iteration.duration_ms == 6000
+        assert iteration.timeline.idle_ms == 4000
+
+    def test_iteration_split_across_files(self):
+        head = self._mark(3, 0, None)
+        head.phases = [Phase(name="build", start_ts=T0)]
+        tail = Iteration(
+            iter_num=3, run_id="run_001", end_ts=T0 + timedelta(seconds=90)
+        )
+        tail.phases = [
+            Phase(name="build", end_ts=T0 + timedelta(seconds=80), status="ok")
+        ]
+
+        [iteration] = build_iterations([], [head, tail])
+        assert iteration.duration_ms == 90000
+        [phase] = iteration.phases
+        assert phase.duration_ms == 80000
+        assert phase.status == "ok"
+        # Marks are copied, not modified
+        assert head.end_ts is None
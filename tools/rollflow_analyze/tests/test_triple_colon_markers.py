@@ -151,3 +151,33 @@ Error: Hook failed
             assert call.run_id == "run_001"
         finally:
             log_path.unlink()
+
+    def test_iteration_and_phase_markers(self):
+        """ITER/PHASE markers build Iterations with phase spans (epoch ms ts)."""
+        start = 1769342400000  # 2026-01-25T12:00:00Z
+        log_content = f"""\
+:::ITER_START::: iter=2 run_id=run_001 ts={start}
+:::PHASE_START::: iter=2 phase=plan run_id=run_001 ts={start + 500}
+:::PHASE_END::: iter=2 phase=plan status=fail code=3 run_id=run_001 ts={start + 61500}
+:::ITER_END::: iter=2 run_id=run_001 ts={start + 62000}
+"""
+        with NamedTemporaryFile(mode="w", suffix=".log", delete=False) as f:
+            f.write(log_content)
+            log_path = Path(f.name)
+
+        try:
+            parser = MarkerParser()
+            assert list(parser.parse_file(log_path)) == []
+
+            [iteration] = parser.iterations
+            assert iteration.iter_num == 2
+            assert iteration.run_id == "run_001"
+            assert iteration.phase == "plan"
+            assert iteration.start_ts.isoformat() == "2026-01-25T12:00:00+00:00"
+            assert iteration.duration_ms == 62000
+            [phase] = iteration.phases
+            assert phase.duration_ms == 61000
+            assert phase.status == "fail"
+            assert phase.exit_code == 3
+        finally:
+            log_path.unlink()
@@ -1066,13 +1066,14 @@ log_tool_end() {
 }
 
 # Emit cache hit marker
-# Args: $1 = cache_key, $2 = tool_name
+# Args: $1 = cache_key, $2 = tool_name, $3 = saved_ms (optional, last run's duration)
 log_cache_hit() {
   local cache_key="$1"
   local tool_name="$2"
+  local saved_ms="${3:-0}"
   local ts
   ts="$(date -u +%Y-%m-%dT%H:%M:%SZ)"
-  emit_marker ":::CACHE_HIT::: cache_key=${cache_key} tool=${tool_name} ts=${ts}"
+  emit_marker ":::CACHE_HIT::: cache_key=${cache_key} tool=${tool_name} saved_ms=${saved_ms} ts=${ts}"
 }
 
 # Emit cache miss marker
@@ -1446,7 +1447,7 @@ except Exception:
 " 2>/dev/null) || saved_ms=0
         fi
 
-        log_cache_hit "$tool_key" "$RUNNER"
+        log_cache_hit "$tool_key" "${AGENT_NAME:-$RUNNER}" "$saved_ms"
         CACHE_HITS=$((CACHE_HITS + 1))
         TIME_SAVED_MS=$((TIME_SAVED_MS + saved_ms))
 
@@ -1493,7 +1494,7 @@ except Exception:
 " 2>/dev/null) || saved_ms=0
         fi
 
-        log_cache_hit "$tool_key" "$RUNNER"
+        log_cache_hit "$tool_key" "${AGENT_NAME:-$RUNNER}" "$saved_ms"
         CACHE_HITS=$((CACHE_HITS + 1))
         TIME_SAVED_MS=$((TIME_SAVED_MS + saved_ms))
 
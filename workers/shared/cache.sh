@@ -15,6 +15,11 @@
 #   CACHE_DB      - Path to cache database (default: artifacts/rollflow_cache/cache.sqlite)
 #   CACHE_CONFIG  - Path to cache config YAML (default: artifacts/rollflow_cache/config.yml)
 #   AGENT_NAME    - Agent identifier for cache isolation (required)
+#   CACHE_DAEMON_SOCKET - Unix socket of rollflow_cache_daemon
+#                   (default: artifacts/rollflow_cache/cache.sock)
+#
+# Lookups go to rollflow_cache_daemon when it is running (and socat or
+# nc -U is installed); otherwise each lookup runs python3 + sqlite3.
 #
 # =============================================================================
 
@@ -135,6 +140,28 @@ cache_make_key() {
   echo "${agent,,}|${phase}|${content_hash:0:16}|${git_sha}"
 }
 
+# Send one request line to rollflow_cache_daemon
+# Args: $1 = request (e.g. "PASS <key> <sha> <hours>")
+# Output: The daemon's one-line reply
+# Returns: 0 if the daemon answered, 1 if it is not running or unreachable
+cache_daemon_query() {
+  local request="$1"
+  local socket="${CACHE_DAEMON_SOCKET:-artifacts/rollflow_cache/cache.sock}"
+  local reply=""
+
+  [[ -S "$socket" ]] || return 1
+
+  if command -v socat &>/dev/null; then
+    reply=$(printf '%s\n' "$request" | socat -t 1 - "UNIX-CONNECT:$socket" 2>/dev/null)
+  elif command -v nc &>/dev/null; then
+    reply=$(printf '%s\n' "$request" | nc -U -w 1 "$socket" 2>/dev/null)
+  fi
+
+  # Empty or ERR replies mean the caller should use the direct path
+  [[ -n "$reply" && "$reply" != ERR* ]] || return 1
+  echo "$reply"
+}
+
 # Query cache for a previously passed tool call
 # Args: $1 = cache_key, $2 = git_sha (optional, for staleness check), $3 = tool_name (optional, for non-cacheable check)
 # Returns: 0 if cache hit (key exists in pass_cache and not stale), 1 if cache miss or stale
@@ -164,6 +191,13 @@ lookup_cache_pass() {
     load_cache_config
   fi
 
+  # Ask the daemon first; it applies the same checks without a python3 spawn
+  local reply
+  if reply=$(cache_daemon_query "PASS $cache_key ${current_git_sha:--} $MAX_CACHE_AGE_HOURS"); then
+    [[ "$reply" == "HIT" ]]
+    return $?
+  fi
+
   # Query the pass_cache table for the cache_key
   # Check: 1) key exists, 2) git SHA match (if provided), 3) age < TTL
   if [[ -n "$current_git_sha" ]]; then
@@ -250,7 +284,7 @@ cache_try_load() {
   fi
 
   local saved_ms=0
-  saved_ms=$(python3 -c "
+  saved_ms=$(cache_daemon_query "LOAD $cache_key") || saved_ms=$(python3 -c "
 import sqlite3
 try:
     conn = sqlite3.connect('$cache_db')
@@ -273,6 +307,7 @@ except Exception:
 
 # Store a successful result in cache
 # Note: Actual storage happens via rollflow_analyze parsing log markers
+# (the daemon picks up those writes on its next lookup)
 # This function is a placeholder for future direct storage implementation
 # Args: $1 = cache_key, $2 = tool_name, $3 = duration_ms (unused - reserved for future)
 cache_store() {